@@ -21,15 +21,18 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
-import json
 import argparse
+import logging
 from pathlib import Path
 
 import config
 from builders.items import build_item
+from osrsbox import instrumentation
+from osrsbox import json_codec
 
 
 class Builder:
+    @instrumentation.instrumented("ItemsBuilder.load_data")
     def __init__(self, **kwargs):
         # Set properties to control phases of build
         self.verbose = kwargs["verbose"]
@@ -38,58 +41,59 @@ class Builder:
         self.validate = kwargs["validate"]
 
         # Load the raw cache data that has been processed (this is ground truth)
-        with open(Path(config.DATA_ITEMS_PATH / "items-cache-data.json")) as f:
-            self.all_items_cache_data = json.load(f)
+        with instrumentation.phase("items-cache-data"), open(Path(config.DATA_ITEMS_PATH / "items-cache-data.json")) as f:
+            self.all_items_cache_data = json_codec.load(f)
 
         # Load all item data (from min JSON file)
-        with open(Path(config.DOCS_PATH / "items-complete.json")) as f:
-            self.all_db_items = json.load(f)
+        with instrumentation.phase("items-complete"), open(Path(config.DOCS_PATH / "items-complete.json")) as f:
+            self.all_db_items = json_codec.load(f)
 
         # Load the item wikitext file of page text
-        with open(Path(config.DATA_ITEMS_PATH / "items-wiki-page-text.json")) as f:
-            self.all_wikitext_raw = json.load(f)
+        with instrumentation.phase("items-wiki-page-text"), open(Path(config.DATA_ITEMS_PATH / "items-wiki-page-text.json")) as f:
+            self.all_wikitext_raw = json_codec.load(f)
 
         # Load the item wikitext file of processed data
-        with open(Path(config.DATA_ITEMS_PATH / "items-wiki-page-text-processed.json")) as f:
-            self.all_wikitext_processed = json.load(f)
+        with instrumentation.phase("items-wiki-page-text-processed"), open(Path(config.DATA_ITEMS_PATH / "items-wiki-page-text-processed.json")) as f:
+            self.all_wikitext_processed = json_codec.load(f)
 
         # Load dict of unalchable items
         unalchable_items_path = Path(config.DATA_ITEMS_PATH / "items-unalchable.json")
-        with open(unalchable_items_path) as f:
-            self.unalchable = json.load(f)
+        with instrumentation.phase("items-unalchable"), open(unalchable_items_path) as f:
+            self.unalchable = json_codec.load(f)
 
         # Load buy limit data
         buy_limits_file_path = Path(config.DATA_ITEMS_PATH / "items-buylimits.json")
-        with open(buy_limits_file_path) as f:
-            self.buy_limits = json.load(f)
+        with instrumentation.phase("items-buylimits"), open(buy_limits_file_path) as f:
+            self.buy_limits = json_codec.load(f)
 
         # Load skill requirement data
         skill_requirements_file_path = Path(config.DATA_ITEMS_PATH / "items-skill-requirements.json")
-        with open(skill_requirements_file_path) as f:
-            self.skill_requirements = json.load(f)
+        with instrumentation.phase("items-skill-requirements"), open(skill_requirements_file_path) as f:
+            self.skill_requirements = json_codec.load(f)
 
         # Load stances data
         weapon_stance_file_path = Path(config.DATA_ITEMS_PATH / "weapon-stances.json")
-        with open(weapon_stance_file_path) as f:
-            self.weapon_stances = json.load(f)
+        with instrumentation.phase("weapon-stances"), open(weapon_stance_file_path) as f:
+            self.weapon_stances = json_codec.load(f)
 
         # Load icon data
         icons_file_path = Path(config.DATA_ICONS_PATH / "icons-items-complete.json")
-        with open(icons_file_path) as f:
-            self.icons = json.load(f)
+        with instrumentation.phase("icons-items-complete"), open(icons_file_path) as f:
+            self.icons = json_codec.load(f)
 
         # Load duplicate item data
         duplicates_file_path = Path(config.DATA_ITEMS_PATH / "items-duplicates.json")
-        with open(duplicates_file_path) as f:
-            self.duplicates = json.load(f)
+        with instrumentation.phase("items-duplicates"), open(duplicates_file_path) as f:
+            self.duplicates = json_codec.load(f)
 
         # Load schema data
-        with open(Path(config.DATA_SCHEMAS_PATH / "schema-items.json")) as f:
-            self.schema_data = json.load(f)
+        with instrumentation.phase("schema-items"), open(Path(config.DATA_SCHEMAS_PATH / "schema-items.json")) as f:
+            self.schema_data = json_codec.load(f)
 
         # Initialize a list of known items
         self.known_items = list()
 
+    @instrumentation.instrumented("ItemsBuilder.run")
     def run(self):
         # Start processing every item!
         for item_id in self.all_items_cache_data:
@@ -116,27 +120,34 @@ class Builder:
                                            known_items=self.known_items,
                                            verbose=self.verbose)
 
-            status = builder.preprocessing()
+            with instrumentation.phase("preprocessing"):
+                status = builder.preprocessing()
 
-            if status["status"]:
-                builder.populate_wiki_item()
-            else:
-                builder.populate_non_wiki_item()
+            with instrumentation.phase("populate"):
+                if status["status"]:
+                    builder.populate_wiki_item()
+                else:
+                    builder.populate_non_wiki_item()
 
-            known_item = builder.check_duplicate_item()
+            with instrumentation.phase("duplicates"):
+                known_item = builder.check_duplicate_item()
             if known_item:
                 self.known_items.append(known_item)
             if self.compare:
-                builder.compare_new_vs_old_item()
+                with instrumentation.phase("compare"):
+                    builder.compare_new_vs_old_item()
             if self.export:
-                builder.export_item_to_json()
+                with instrumentation.phase("export"):
+                    builder.export_item_to_json()
             if self.validate:
-                builder.validate_item()
+                with instrumentation.phase("validate"):
+                    builder.validate_item()
 
         # Done processing, rejoice!
         print("Built.")
         exit(0)
 
+    @instrumentation.instrumented("ItemsBuilder.test")
     def test(self):
         # Start processing every item!
         for item_id in self.all_items_cache_data:
@@ -163,17 +174,21 @@ class Builder:
                                            known_items=self.known_items,
                                            verbose=self.verbose)
 
-            status = builder.preprocessing()
+            with instrumentation.phase("preprocessing"):
+                status = builder.preprocessing()
 
-            if status["status"]:
-                builder.populate_wiki_item()
-            else:
-                builder.populate_non_wiki_item()
+            with instrumentation.phase("populate"):
+                if status["status"]:
+                    builder.populate_wiki_item()
+                else:
+                    builder.populate_non_wiki_item()
 
-            known_item = builder.check_duplicate_item()
+            with instrumentation.phase("duplicates"):
+                known_item = builder.check_duplicate_item()
             if known_item:
                 self.known_items.append(known_item)
-            builder.validate_item()
+            with instrumentation.phase("validate"):
+                builder.validate_item()
 
         # Done testing, rejoice!
         print("Tested.")
@@ -202,8 +217,16 @@ if __name__ == "__main__":
                         default=False,
                         required=False,
                         help='A boolean of whether to test the builder process.')
+    parser.add_argument('--timings',
+                        default=False,
+                        required=False,
+                        help='A boolean of whether to log the time and peak memory of each build phase.')
     args = parser.parse_args()
 
+    if args.timings:
+        logging.basicConfig(level=logging.INFO)
+        instrumentation.log_reports(trace_memory=True)
+
     builder = Builder(verbose=args.verbose,
                       compare=args.compare,
                       export=args.export,
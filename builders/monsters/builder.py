@@ -21,15 +21,18 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
-import json
 import argparse
+import logging
 from pathlib import Path
 
 import config
 from builders.monsters import build_monster
+from osrsbox import instrumentation
+from osrsbox import json_codec
 
 
 class Builder:
+    @instrumentation.instrumented("MonstersBuilder.load_data")
     def __init__(self, **kwargs):
         # Set properties to control phases of build
         self.verbose = kwargs["verbose"]
@@ -38,32 +41,33 @@ class Builder:
         self.validate = kwargs["validate"]
 
         # Load the raw cache data that has been processed (this is ground truth)
-        with open(Path(config.DATA_MONSTERS_PATH / "monsters-cache-data.json")) as f:
-            self.all_monster_cache_data = json.load(f)
+        with instrumentation.phase("monsters-cache-data"), open(Path(config.DATA_MONSTERS_PATH / "monsters-cache-data.json")) as f:
+            self.all_monster_cache_data = json_codec.load(f)
 
         # Load all monster data (from min JSON file)
-        with open(Path(config.DOCS_PATH / "monsters-complete.json")) as f:
-            self.all_db_monsters = json.load(f)
+        with instrumentation.phase("monsters-complete"), open(Path(config.DOCS_PATH / "monsters-complete.json")) as f:
+            self.all_db_monsters = json_codec.load(f)
 
         # Load the monster wikitext file of page text
-        with open(Path(config.DATA_MONSTERS_PATH / "monsters-wiki-page-text.json")) as f:
-            self.all_wikitext_raw = json.load(f)
+        with instrumentation.phase("monsters-wiki-page-text"), open(Path(config.DATA_MONSTERS_PATH / "monsters-wiki-page-text.json")) as f:
+            self.all_wikitext_raw = json_codec.load(f)
 
         # Load the monster wikitext file of processed data
-        with open(Path(config.DATA_MONSTERS_PATH / "monsters-wiki-page-text-processed.json")) as f:
-            self.all_wikitext_processed = json.load(f)
+        with instrumentation.phase("monsters-wiki-page-text-processed"), open(Path(config.DATA_MONSTERS_PATH / "monsters-wiki-page-text-processed.json")) as f:
+            self.all_wikitext_processed = json_codec.load(f)
 
         # Load the monster processed monster drops
-        with open(Path(config.DATA_MONSTERS_PATH / "monsters-drops.json")) as f:
-            self.monsters_drops = json.load(f)
+        with instrumentation.phase("monsters-drops"), open(Path(config.DATA_MONSTERS_PATH / "monsters-drops.json")) as f:
+            self.monsters_drops = json_codec.load(f)
 
         # Load schema data
-        with open(Path(config.DATA_SCHEMAS_PATH / "schema-monsters.json")) as f:
-            self.schema_data = json.load(f)
+        with instrumentation.phase("schema-monsters"), open(Path(config.DATA_SCHEMAS_PATH / "schema-monsters.json")) as f:
+            self.schema_data = json_codec.load(f)
 
         # Initialize a list of known monsters
         self.known_monsters = list()
 
+    @instrumentation.instrumented("MonstersBuilder.run")
     def run(self):
         # Start processing every monster!
         for monster_id in self.all_monster_cache_data:
@@ -82,23 +86,31 @@ class Builder:
                                                  known_monsters=self.known_monsters,
                                                  verbose=self.verbose)
 
-            status = builder.preprocessing()
+            with instrumentation.phase("preprocessing"):
+                status = builder.preprocessing()
             if status:
-                builder.populate_monster()
-                known_monster = builder.check_duplicate_monster()
+                with instrumentation.phase("populate"):
+                    builder.populate_monster()
+                with instrumentation.phase("duplicates"):
+                    known_monster = builder.check_duplicate_monster()
                 self.known_monsters.append(known_monster)
-                builder.populate_monster_drops()
+                with instrumentation.phase("populate_drops"):
+                    builder.populate_monster_drops()
                 if self.compare:
-                    builder.compare_new_vs_old_monster()
+                    with instrumentation.phase("compare"):
+                        builder.compare_new_vs_old_monster()
                 if self.export:
-                    builder.export_monster_to_json()
+                    with instrumentation.phase("export"):
+                        builder.export_monster_to_json()
                 if self.validate:
-                    builder.validate_monster()
+                    with instrumentation.phase("validate"):
+                        builder.validate_monster()
 
         # Done processing, rejoice!
         print("Built.")
         exit(0)
 
+    @instrumentation.instrumented("MonstersBuilder.test")
     def test(self):
         # Start processing every monster!
         for monster_id in self.all_monster_cache_data:
@@ -117,13 +129,18 @@ class Builder:
                                                  known_monsters=self.known_monsters,
                                                  verbose=self.verbose)
 
-            status = builder.preprocessing()
+            with instrumentation.phase("preprocessing"):
+                status = builder.preprocessing()
             if status:
-                builder.populate_monster()
-                known_monster = builder.check_duplicate_monster()
+                with instrumentation.phase("populate"):
+                    builder.populate_monster()
+                with instrumentation.phase("duplicates"):
+                    known_monster = builder.check_duplicate_monster()
                 self.known_monsters.append(known_monster)
-                builder.populate_monster_drops()
-                builder.validate_monster()
+                with instrumentation.phase("populate_drops"):
+                    builder.populate_monster_drops()
+                with instrumentation.phase("validate"):
+                    builder.validate_monster()
 
         # Done testing, rejoice!
         print("Tested.")
@@ -152,8 +169,16 @@ if __name__ == "__main__":
                         default=False,
                         required=False,
                         help='A boolean of whether to test the builder process.')
+    parser.add_argument('--timings',
+                        default=False,
+                        required=False,
+                        help='A boolean of whether to log the time and peak memory of each build phase.')
     args = parser.parse_args()
 
+    if args.timings:
+        logging.basicConfig(level=logging.INFO)
+        instrumentation.log_reports(trace_memory=True)
+
     builder = Builder(verbose=args.verbose,
                       compare=args.compare,
                       export=args.export,
@@ -0,0 +1,54 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Add __slots__ to dataclasses, for Python versions before `dataclass(slots=True)`.
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+from dataclasses import fields
+
+
+def add_slots(cls: type) -> type:
+    """Rebuild a dataclass so that instances use __slots__ instead of a __dict__.
+
+    A dataclass field with a default value is stored as a class attribute, which
+    conflicts with a slot of the same name, so the class must be rebuilt after the
+    dataclass decorator has run. Apply this decorator above `@dataclass`. Any
+    names already listed in the class `__slots__` (attributes which are not
+    dataclass fields) are kept. The class must not use zero argument `super()`.
+
+    :param cls: The dataclass to rebuild.
+    :return: A new class, with a slot for each dataclass field.
+    """
+    cls_dict = dict(cls.__dict__)
+    field_names = tuple(field.name for field in fields(cls))
+    extra_names = cls_dict.get("__slots__", ())
+    if isinstance(extra_names, str):
+        extra_names = (extra_names,)
+
+    cls_dict["__slots__"] = field_names + tuple(name for name in extra_names if name not in field_names)
+    for name in field_names + tuple(extra_names):
+        # Remove default values, and the slot descriptors of the original class
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+    return slotted_cls
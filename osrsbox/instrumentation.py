@@ -0,0 +1,263 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Opt-in timing and memory instrumentation of the database load methods and the
+database builders.
+
+Instrumented methods (for example, `AllItems.load_all_items`) time each phase
+of their work, such as reading the file, decoding the JSON, building the
+dataclass objects and sorting. When the method returns, an OperationReport is
+passed to every registered hook:
+
+    from osrsbox import instrumentation
+    instrumentation.log_reports(trace_memory=True)
+    all_db_items = items_api.load()
+
+When no hook is registered, instrumented methods call the method directly, and
+each phase is an empty context manager, so instrumentation costs nothing.
+
+Peak memory is measured using tracemalloc, only when a hook asks for it, as
+tracing memory slows down loading. On Python 3.8 and below, tracemalloc cannot
+reset its peak, so the peak of each phase includes the earlier phases.
+
+The logging and tracemalloc modules are only imported when they are used, so
+importing this module does not slow down importing the API packages.
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+import functools
+import threading
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+if TYPE_CHECKING:
+    import logging
+
+# The registered hooks, and whether each hook wants peak memory measured
+_hooks: List[Tuple[Callable[["OperationReport"], None], bool]] = list()
+_hooks_lock = threading.Lock()
+
+# The stack of running operations in each thread
+_local = threading.local()
+
+
+@dataclass
+class PhaseTiming:
+    """The time spent, and peak memory, in one phase of an operation.
+
+    A phase that runs several times (for example, once for each JSON file in a
+    folder) is reported once, with the total duration and the number of calls.
+    """
+    name: str
+    duration: float = 0.0
+    calls: int = 0
+    peak_memory: Optional[int] = None
+
+
+@dataclass
+class OperationReport:
+    """The phase timings of one call to an instrumented method."""
+    operation: str
+    duration: float = 0.0
+    peak_memory: Optional[int] = None
+    phases: List[PhaseTiming] = field(default_factory=list)
+
+    def phase_durations(self) -> Dict[str, float]:
+        """Get the duration of each phase.
+
+        :return: A dict of phase name to duration, in seconds.
+        """
+        return {phase.name: phase.duration for phase in self.phases}
+
+    def format(self) -> str:
+        """Format the report as one line of text, for logging."""
+        def describe(duration: float, peak_memory: Optional[int]) -> str:
+            if peak_memory is None:
+                return f"{duration:.3f}s"
+            return f"{duration:.3f}s, peak {peak_memory / 1e6:.1f} MB"
+
+        phases = "; ".join(f"{phase.name} {describe(phase.duration, phase.peak_memory)}" for phase in self.phases)
+        return f"{self.operation} {describe(self.duration, self.peak_memory)} ({phases})"
+
+
+class _NullContext:
+    """A context manager that does nothing, used for phases when instrumentation is disabled."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+class _Phase:
+    def __init__(self, operation: "_Operation", timing: PhaseTiming):
+        self._operation = operation
+        self._timing = timing
+        self._start = 0.0
+
+    def __enter__(self):
+        if self._operation.trace_memory:
+            import tracemalloc
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._timing.duration += time.perf_counter() - self._start
+        self._timing.calls += 1
+        if self._operation.trace_memory:
+            import tracemalloc
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            self._timing.peak_memory = max(self._timing.peak_memory or 0, peak_memory)
+        return False
+
+
+class _Operation:
+    def __init__(self, name: str, trace_memory: bool):
+        self.report = OperationReport(name)
+        self.trace_memory = trace_memory
+        self._phases: Dict[str, _Phase] = dict()
+        self._started_tracing = False
+        self._start = 0.0
+
+    def phase(self, name: str) -> _Phase:
+        phase = self._phases.get(name)
+        if phase is None:
+            timing = PhaseTiming(name)
+            self.report.phases.append(timing)
+            phase = self._phases[name] = _Phase(self, timing)
+        return phase
+
+    def __enter__(self):
+        if self.trace_memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.report.duration = time.perf_counter() - self._start
+        if self.trace_memory:
+            import tracemalloc
+            peaks = [tracemalloc.get_traced_memory()[1]]
+            peaks.extend(phase.peak_memory for phase in self.report.phases if phase.peak_memory is not None)
+            self.report.peak_memory = max(peaks)
+            if self._started_tracing:
+                tracemalloc.stop()
+        return False
+
+
+def add_hook(hook: Callable[[OperationReport], None], trace_memory: bool = False) -> None:
+    """Register a function that is called with the report of every instrumented operation.
+
+    :param hook: A function that accepts an :class:`OperationReport`.
+    :param trace_memory: Measure the peak memory of each phase using tracemalloc.
+    """
+    with _hooks_lock:
+        _hooks.append((hook, trace_memory))
+
+
+def remove_hook(hook: Callable[[OperationReport], None]) -> None:
+    """Remove a function registered using :func:`add_hook`.
+
+    :param hook: The registered function.
+    """
+    with _hooks_lock:
+        _hooks[:] = [entry for entry in _hooks if entry[0] != hook]
+
+
+def log_reports(logger: Optional["logging.Logger"] = None, level: Optional[int] = None,
+                trace_memory: bool = False) -> Callable[[OperationReport], None]:
+    """Register a hook that logs the report of every instrumented operation.
+
+    :param logger: The logger to use, defaults to the `osrsbox.instrumentation` logger.
+    :param level: The logging level of the report messages, defaults to INFO.
+    :param trace_memory: Measure the peak memory of each phase using tracemalloc.
+    :return: The registered hook, which can be passed to :func:`remove_hook`.
+    """
+    import logging
+    logger = logger or logging.getLogger(__name__)
+    level = logging.INFO if level is None else level
+
+    def hook(report: OperationReport) -> None:
+        logger.log(level, report.format())
+
+    add_hook(hook, trace_memory=trace_memory)
+    return hook
+
+
+def instrumented(name: str) -> Callable:
+    """Decorate a function or method as an instrumented operation.
+
+    :param name: The operation name used in reports, for example `AllItems.load_all_items`.
+    :return: The decorator.
+    """
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _hooks:
+                return function(*args, **kwargs)
+
+            hooks = list(_hooks)
+            operation = _Operation(name, trace_memory=any(trace_memory for _, trace_memory in hooks))
+            stack = _local.__dict__.setdefault("operations", list())
+            stack.append(operation)
+            try:
+                with operation:
+                    return function(*args, **kwargs)
+            finally:
+                stack.pop()
+                for hook, _ in hooks:
+                    try:
+                        hook(operation.report)
+                    except Exception:
+                        import logging
+                        logging.getLogger(__name__).exception("Instrumentation hook failed")
+        return wrapper
+    return decorator
+
+
+def phase(name: str):
+    """Time a phase of the running instrumented operation.
+
+    Use as a context manager, for example `with instrumentation.phase("decode"):`.
+    Outside an instrumented operation, or when no hook is registered, this does nothing.
+
+    :param name: The phase name.
+    :return: A context manager.
+    """
+    if not _hooks:
+        return _NULL_CONTEXT
+    stack = getattr(_local, "operations", None)
+    if not stack:
+        return _NULL_CONTEXT
+    return stack[-1].phase(name)
@@ -18,12 +18,99 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
-from osrsbox.items_api import all_items
+from __future__ import annotations
 
+import importlib
+from typing import TYPE_CHECKING
 
-def load() -> all_items.AllItems:
+from osrsbox.shared_handles import SharedHandle
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any
+    from typing import Generator
+    from typing import List
+    from typing import Union
+
+    from osrsbox.items_api.all_items import AllItems
+    from osrsbox.items_api.item_properties import ItemProperties
+
+# Submodules are imported the first time they are used (for example, `items_api.all_items`),
+# so importing the items_api package does not load the items database modules
+_SUBMODULES = (
+    "all_items",
+    "gear_optimizer",
+    "item_columns",
+    "item_equipment",
+    "item_icons",
+    "item_properties",
+    "item_snapshot",
+    "item_weapon",
+)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_SUBMODULES))
+
+
+def _load_items(path: str) -> AllItems:
+    from osrsbox.items_api.all_items import AllItems
+    return AllItems(path)
+
+
+def _default_path() -> Path:
+    from osrsbox.items_api.all_items import default_items_path
+    return default_items_path()
+
+
+_shared_items = SharedHandle(_load_items, _default_path)
+
+
+def load(path: Union[Path, str, None] = None) -> AllItems:
     """Load the item database.
 
-    :return all_db_items: An AllItems object containing the entire item database.
+    The database is loaded once, and the same object is returned by later calls
+    for the same path, until the source file changes or `reload()` or
+    `invalidate()` is called. Treat the returned object as read-only, as it is
+    shared by every caller in the process.
+
+    :param path: The items database file or folder, or None for the default database.
+    :return: An AllItems object containing the entire item database.
+    """
+    return _shared_items.get(path)
+
+
+def reload(path: Union[Path, str, None] = None) -> AllItems:
+    """Load the item database again, and replace the shared object returned by `load()`.
+
+    :param path: The items database file or folder, or None for the default database.
+    :return: An AllItems object containing the entire item database.
+    """
+    return _shared_items.reload(path)
+
+
+def invalidate(path: Union[Path, str, None] = None) -> None:
+    """Drop the shared items database, so the next call to `load()` loads it again.
+
+    :param path: The items database file or folder, or None to drop every shared items database.
+    """
+    _shared_items.invalidate(path)
+
+
+def iter_items(path: Union[Path, str, None] = None) -> Generator[ItemProperties, None, None]:
+    """Iterate over the item database one item at a time, without loading the whole database.
+
+    Unlike `load()`, nothing is shared or kept in memory after each item is yielded,
+    so use this for a single pass over every item (for example, exporting to CSV).
+
+    :param path: The items database file or folder, or None for the default database.
+    :return: A generator of ItemProperties objects.
     """
-    return all_items.AllItems()
+    from osrsbox.items_api.all_items import iter_items as _iter_items
+    return _iter_items(path)
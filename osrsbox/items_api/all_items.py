@@ -19,28 +19,161 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
 
-import json
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Union, Generator
-
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union, Generator
+
+from osrsbox import instrumentation
+from osrsbox import json_codec
+from osrsbox.items_api import item_snapshot
+from osrsbox.items_api.item_icons import IconStore
+from osrsbox.items_api.item_icons import LazyIconItemProperties
+from osrsbox.items_api.item_icons import open_icon_store
+from osrsbox.items_api.item_equipment import ItemEquipment
 from osrsbox.items_api.item_properties import ItemProperties
+from osrsbox.items_api.item_weapon import ItemWeapon
+from osrsbox.lazy_records import JsonFileIndex
+from osrsbox.lazy_records import LazyRecordDict
+from osrsbox.lazy_records import LazyRecordList
+from osrsbox.lazy_records import decode_json_file
+from osrsbox.lazy_records import index_json_directory
+from osrsbox.lazy_records import iter_json_records
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from osrsbox.items_api.gear_optimizer import GearOptimizer
+    from osrsbox.query import Query
+    from osrsbox.query import QueryEngine
+    from osrsbox.query import QueryField
+    from osrsbox.shared_database import SharedDatabase
+    from osrsbox.text_search import BKTree
+    from osrsbox.text_search import TrigramIndex
+
+# Linked item IDs are looked up by exact value, so they use a hash index instead of a sorted index
+LINKED_ID_PROPERTIES = ("linked_id_item", "linked_id_noted", "linked_id_placeholder")
+
+# The item properties that can be used as an item value
+ITEM_VALUE_PROPERTIES = ("cost", "lowalch", "highalch")
+
+
+@lru_cache(maxsize=None)
+def default_items_path() -> Path:
+    """Find the default items database file, `items-complete.json`.
+
+    The file is searched for the first time it is needed, instead of when the
+    module is imported.
+
+    :return: The path to the `items-complete.json` file.
+    :raises ValueError: Default item database file not found.
+    """
+    path_to_items_complete_json = Path(__file__).absolute().parent / ".." / ".." / "docs" / "items-complete.json"
+    if not path_to_items_complete_json.is_file():
+        path_to_items_complete_json = Path(__file__).absolute().parent / ".." / "docs" / "items-complete.json"
+        if not path_to_items_complete_json.is_file():
+            raise ValueError("Error: Default item database file not found. Exiting")
+    return path_to_items_complete_json
+
+
+def __getattr__(name: str) -> Any:
+    # The default database path is only found when it is first used
+    if name == "PATH_TO_ITEMS_COMPLETE_JSON":
+        return default_items_path()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def iter_items(input_data_file_or_directory: Union[Path, str, None] = None) -> Generator[ItemProperties, None, None]:
+    """Decode the items database one item at a time, without loading the whole database.
+
+    Use this instead of :class:`AllItems` for a single pass over every item, as only
+    the current item is kept in memory. Items are yielded in the order they are
+    stored: file order for a JSON file, and item ID order for a folder of JSON
+    files or a snapshot file.
+
+    :param input_data_file_or_directory: The osrsbox-db items folder of JSON files, single JSON file,
+        or items database snapshot file. Defaults to the `items-complete.json` file in the package.
+    :return: A generator of ItemProperties objects.
+    :raises ValueError: Valid input not found, or cannot populate an item.
+    """
+    if input_data_file_or_directory is None:
+        input_data_file_or_directory = default_items_path()
+    input_data_file_or_directory = Path(input_data_file_or_directory)
+
+    if input_data_file_or_directory.is_dir():
+        json_files = index_json_directory(input_data_file_or_directory)
+        all_item_json = (decode_json_file(json_file) for json_file in json_files.values())
+    elif input_data_file_or_directory.is_file() and item_snapshot.is_items_snapshot(input_data_file_or_directory):
+        snapshot = item_snapshot.ItemSnapshot(input_data_file_or_directory)
+        all_item_json = (snapshot.decode_json(record_number) for record_number in range(len(snapshot)))
+    elif input_data_file_or_directory.is_file():
+        all_item_json = iter_json_records(input_data_file_or_directory)
+    else:
+        raise ValueError("Error: Valid input not found. Exiting.")
+
+    for item_json in all_item_json:
+        try:
+            item = ItemProperties.from_json(item_json)
+        except TypeError as e:
+            raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting") from e
+        yield item
+
 
-PATH_TO_ITEMS_COMPLETE_JSON = Path(__file__).absolute().parent / ".." / ".." / "docs" / "items-complete.json"
-if not PATH_TO_ITEMS_COMPLETE_JSON.is_file():
-    PATH_TO_ITEMS_COMPLETE_JSON = Path(__file__).absolute().parent / ".." / "docs" / "items-complete.json"
-    if not PATH_TO_ITEMS_COMPLETE_JSON.is_file():
-        raise ValueError("Error: Default item database file not found. Exiting")
+@lru_cache(maxsize=None)
+def _item_query_fields() -> Dict[str, "QueryField"]:
+    """Get the item properties that can be queried, including the equipment and weapon properties of each item."""
+    from osrsbox.query import HASH_INDEX
+    from osrsbox.query import fields_from_dataclass
+
+    query_fields = fields_from_dataclass(ItemProperties)
+    query_fields.update(fields_from_dataclass(ItemEquipment, parent="equipment"))
+    query_fields.update(fields_from_dataclass(ItemWeapon, parent="weapon"))
+    for linked_id_property in LINKED_ID_PROPERTIES:
+        query_fields[linked_id_property].index_kind = HASH_INDEX
+    return query_fields
 
 
 class AllItems:
     """This class handles loading of the osrsbox-db items database.
 
-    :param input_data_file_or_directory: The osrsbox-db items folder of JSON files, or single JSON file.
+    :param input_data_file_or_directory: The osrsbox-db items folder of JSON files, single JSON file,
+        or items database snapshot file. Defaults to the `items-complete.json` file in the package.
+    :param lazy: Decode each item the first time it is accessed, instead of at load time.
+    :param workers: The number of pool workers used to load a folder of JSON files, or None to load serially.
+    :param use_processes: Use a process pool when loading with workers, or False to use a thread pool.
+    :param load_icons: Keep the base64 item icons in memory. When False, each item fetches
+        its icon from `icon_store` when the `icon` property is accessed.
+    :param icon_store: The icon store (or path to the packed icon file, or `items-icons` directory)
+        used when `load_icons` is False. Defaults to the icons next to the data input.
+    :param use_cache: Load the built items from the warm-start cache (see :mod:`osrsbox.warm_cache`)
+        when it matches the JSON data, and save them to the cache otherwise.
+    :param shared_database: Attach to items published by :meth:`publish_shared_database` (a
+        SharedDatabase, or the name of its shared memory block), instead of loading the data input.
     """
-    def __init__(self, input_data_file_or_directory: Path = PATH_TO_ITEMS_COMPLETE_JSON):
+    def __init__(self, input_data_file_or_directory: Optional[Path] = None, lazy: bool = False,
+                 workers: Optional[int] = None, use_processes: bool = True, load_icons: bool = True,
+                 icon_store: Union[IconStore, Path, str, None] = None, use_cache: bool = False,
+                 shared_database: Union["SharedDatabase", str, None] = None):
         self.all_items: List[ItemProperties] = list()
         self.all_items_dict: Dict[int, ItemProperties] = dict()
-        self.load_all_items(input_data_file_or_directory)
+        self.icon_store: Optional[IconStore] = None
+        self.shared_database: Optional["SharedDatabase"] = None
+        self.load_time: float = 0.0
+        self._name_indexes: Dict[str, Dict[str, List[ItemProperties]]] = dict()
+        self._search_index: Optional["TrigramIndex"] = None
+        self._fuzzy_indexes: Dict[str, "BKTree"] = dict()
+        self._equipment_columns = None
+        self._gear_optimizer = None
+        self._item_values: Dict[str, "np.ndarray"] = dict()
+        self._query_engine: Optional["QueryEngine"] = None
+        self._secondary_indexes: Dict[str, Dict[Any, Tuple[int, ...]]] = dict()
+        if shared_database is not None:
+            self.attach_shared_database(shared_database)
+            return
+        if input_data_file_or_directory is None:
+            input_data_file_or_directory = default_items_path()
+        self.load_all_items(input_data_file_or_directory, lazy=lazy, workers=workers, use_processes=use_processes,
+                            load_icons=load_icons, icon_store=icon_store, use_cache=use_cache)
 
     def __iter__(self) -> Generator[ItemProperties, None, None]:
         """Iterate (loop) over each ItemProperties object."""
@@ -81,32 +214,61 @@ class AllItems:
         This function performs a lookup on all items in the database. The property
         that is queried is the item name, or the `wiki_name` if specified in the
         method parameters. The only transformation performed on the item name
-        provided is to convert it to lower case to (slightly) improve lookup recall.
-        This function works on a first-come-first-served basis. The first instance
-        where the name matches is returned.
+        provided is to case fold it (convert it to lower case) to (slightly) improve
+        lookup recall. This function works on a first-come-first-served basis. The
+        first instance (lowest item ID) where the name matches is returned.
 
         :param item_name: The item name to lookup.
         :param use_wiki_name: Whether to use the `wiki_name` instead of `name`.
         :return: The ItemProperties object found from the lookup.
         :raises: ValueError when the item name cannot be found.
         """
+        return self.lookup_all_by_name(item_name, use_wiki_name)[0]
+
+    def lookup_all_by_name(self, item_name: str, use_wiki_name: bool = False) -> List[ItemProperties]:
+        """Lookup a specific item name and get every associated ItemProperties object.
+
+        Many items share a name, for example the noted and placeholder variants
+        of an item. This function returns all of them, sorted by item ID. The
+        lookup uses the same case folded name index as :meth:`lookup_by_item_name`.
+
+        :param item_name: The item name to lookup.
+        :param use_wiki_name: Whether to use the `wiki_name` instead of `name`.
+        :return: A list of ItemProperties objects found from the lookup.
+        :raises: ValueError when the item name cannot be found.
+        """
         # Set the property value
         lookup_property = "name"
         if use_wiki_name:
             lookup_property = "wiki_name"
 
+        try:
+            return list(self._name_index(lookup_property)[item_name.casefold()])
+        except KeyError:
+            raise ValueError("Cannot find the provided item name...")
+
+    def _name_index(self, lookup_property: str) -> Dict[str, List[ItemProperties]]:
+        """Get the case folded name index for a property, building it on first use.
+
+        :param lookup_property: The item property to index, either `name` or `wiki_name`.
+        :return: A dict of case folded name to a list of items, sorted by item ID.
+        """
+        try:
+            return self._name_indexes[lookup_property]
+        except KeyError:
+            pass
+
+        name_index = dict()
         for item in self.all_items:
             # Get the raw property value
             name_value = getattr(item, lookup_property)
             # Check property value for None (only effective for wiki_name)
             if not name_value:
                 continue
+            name_index.setdefault(name_value.casefold(), list()).append(item)
 
-            # Check for an exact name match
-            if name_value.lower() == item_name.lower():
-                return item
-
-        raise ValueError("Cannot find the provided item name...")
+        self._name_indexes[lookup_property] = name_index
+        return name_index
 
     def search_item_names(self, keyword: str) -> List[ItemProperties]:
         """Keyword search items and get the a list of ItemProperties objects.
@@ -114,42 +276,348 @@ class AllItems:
         This function performs a search of all item names in the database. The name
         and wiki_name properties are searched. Results are returned as a list of
         ItemProperties objects. The only transformation performed is converting the
-        search keyword and item name/wiki_name to lower case.
+        search keyword and item name/wiki_name to lower case. The search uses a
+        trigram index of item names that is built on the first search.
 
         :param keyword: The keyword to search for.
         :return: A list of ItemProperties objects found from the keyword search.
-        :raises: ValueError when no keyword matches can be found.
         """
-        item_results = list()
-        for item in self.all_items:
-            if keyword.lower() in item.name.lower():
-                item_results.append(item)
-            elif item.wiki_name:
-                if keyword.lower() in item.wiki_name.lower():
-                    item_results.append(item)
+        if self._search_index is None:
+            from osrsbox.text_search import TrigramIndex
+            self._search_index = TrigramIndex((item.name, item.wiki_name) for item in self.all_items)
+
+        return [self.all_items[position] for position in self._search_index.search(keyword)]
+
+    def fuzzy_search_item_names(self, query: str, limit: int = 10, max_distance: int = 2,
+                                use_wiki_name: bool = False) -> List[ItemProperties]:
+        """Search for the item names closest to a (possibly misspelt) query.
+
+        Item names are ranked by edit distance to the query, closest first, then
+        alphabetically. Every item that shares a name (for example, noted variants)
+        is treated as one match, and the first instance (lowest item ID) is returned.
+        The search uses a BK-tree of case folded item names that is built on the
+        first search.
+
+        :param query: The item name to search for.
+        :param limit: The maximum number of items to return.
+        :param max_distance: The maximum edit distance between the query and an item name.
+        :param use_wiki_name: Whether to use the `wiki_name` instead of `name`.
+        :return: A list of ItemProperties objects, closest match first.
+        """
+        # Set the property value
+        lookup_property = "name"
+        if use_wiki_name:
+            lookup_property = "wiki_name"
+
+        name_index = self._name_index(lookup_property)
+        if lookup_property not in self._fuzzy_indexes:
+            from osrsbox.text_search import BKTree
+            self._fuzzy_indexes[lookup_property] = BKTree(name_index)
+
+        matches = self._fuzzy_indexes[lookup_property].nearest(query.casefold(), limit, max_distance)
+        return [name_index[name][0] for _, name in matches]
+
+    def query(self, **conditions) -> "Query":
+        """Query items using conditions on item, equipment and weapon properties.
+
+        For example, `all_db_items.query(slot="head", members=False, prayer__gt=2).order_by("-prayer").limit(10)`.
+        See :meth:`osrsbox.query.Query.filter` for the condition syntax, and use `explain()`
+        on the returned query to see which index the query uses.
+
+        :return: A Query object, which can be iterated to get the matching ItemProperties objects.
+        """
+        return self._get_query_engine().query(**conditions)
+
+    def _get_query_engine(self) -> "QueryEngine":
+        if self._query_engine is None:
+            from osrsbox.query import QueryEngine
+            self._query_engine = QueryEngine(self.all_items, _item_query_fields())
+        return self._query_engine
+
+    def _secondary_index(self, lookup_property: str) -> Dict[Any, Tuple[int, ...]]:
+        """Get the index of item IDs by property value, building it on first use.
+
+        The index shares the hash index used by the query planner, so building it
+        once serves both the accessors below and :meth:`query`.
+
+        :param lookup_property: The item, equipment or weapon property to index.
+        :return: A dict of property value to a tuple of item IDs, sorted by item ID. Items
+            without a value (None) are not included.
+        """
+        try:
+            return self._secondary_indexes[lookup_property]
+        except KeyError:
+            pass
+
+        all_items = self.all_items
+        hash_index = self._get_query_engine().hash_index(lookup_property)
+        secondary_index = {value: tuple(all_items[position].id for position in positions)
+                           for value, positions in hash_index.items() if value is not None}
+        self._secondary_indexes[lookup_property] = secondary_index
+        return secondary_index
+
+    def equipment_slots(self) -> List[str]:
+        """Get every equipment slot used by an equipable item.
+
+        :return: A list of equipment slot names.
+        """
+        return list(self._secondary_index("slot"))
+
+    def item_ids_by_slot(self, slot: str) -> Tuple[int, ...]:
+        """Get the IDs of every equipable item for an equipment slot.
+
+        :param slot: The equipment slot name, for example `head` or `2h`.
+        :return: A tuple of item IDs, sorted by item ID. Empty if no item uses the slot.
+        """
+        return self._secondary_index("slot").get(slot, ())
+
+    def item_ids_by_weapon_type(self, weapon_type: str) -> Tuple[int, ...]:
+        """Get the IDs of every weapon of a weapon type.
+
+        :param weapon_type: The weapon type, for example `whip` or `bladed_staff`.
+        :return: A tuple of item IDs, sorted by item ID. Empty if no weapon has the type.
+        """
+        return self._secondary_index("weapon_type").get(weapon_type, ())
+
+    def item_ids_by_linked_id(self, linked_id: int, linked_id_property: str = "linked_id_item") -> Tuple[int, ...]:
+        """Get the IDs of every item that links to an item ID.
+
+        For example, the noted and placeholder variants of an item link to the item
+        using `linked_id_item`, and an item links to its noted variant using
+        `linked_id_noted`. So `item_ids_by_linked_id(4152, "linked_id_noted")` returns
+        the unnoted item for the noted item 4152.
+
+        :param linked_id: The linked item ID.
+        :param linked_id_property: One of `linked_id_item`, `linked_id_noted` or `linked_id_placeholder`.
+        :return: A tuple of item IDs, sorted by item ID. Empty if no item links to the ID.
+        :raises: ValueError when the linked ID property is not valid.
+        """
+        if linked_id_property not in LINKED_ID_PROPERTIES:
+            raise ValueError(f"Error: Invalid linked ID property: {linked_id_property}. Exiting.")
+        return self._secondary_index(linked_id_property).get(linked_id, ())
+
+    @property
+    def equipment_columns(self):
+        """A NumPy columnar view of the equipment bonuses of every equipable item.
+
+        The view is built on first access, and requires NumPy to be installed.
+        See :class:`osrsbox.items_api.item_columns.EquipmentColumns`.
+
+        :return: An EquipmentColumns object.
+        """
+        if self._equipment_columns is None:
+            from osrsbox.items_api.item_columns import EquipmentColumns
+            self._equipment_columns = EquipmentColumns(self.all_items)
+        return self._equipment_columns
 
-        return item_results
+    @property
+    def gear_optimizer(self) -> "GearOptimizer":
+        """An optimizer that finds the best gear loadouts from every equipable item.
 
-    def load_all_items(self, input_data_file_or_directory: Union[Path, str]) -> None:
-        """Load the items database via a JSON file, or directory of JSON files.
+        The optimizer is built on first access, and requires NumPy to be installed.
+        See :class:`osrsbox.items_api.gear_optimizer.GearOptimizer`.
+
+        :return: A GearOptimizer object.
+        """
+        if self._gear_optimizer is None:
+            from osrsbox.items_api.gear_optimizer import GearOptimizer
+            self._gear_optimizer = GearOptimizer(self.all_items, self.equipment_columns)
+        return self._gear_optimizer
+
+    def item_values(self, value_property: str = "highalch") -> "np.ndarray":
+        """Get a NumPy array of the value of every item, indexed by item ID.
+
+        Noted and placeholder items without a value use the value of the item
+        they are linked to, and unknown item IDs have a value of 0. The array is
+        built on first use, and requires NumPy to be installed. Do not modify
+        the returned array, it is shared by every caller until the items are
+        loaded again.
+
+        :param value_property: The item property used as the value: `cost`, `lowalch` or `highalch`.
+        :return: A read-only float64 array, with the value of item ID n at index n.
+        :raises ValueError: Invalid value property.
+        """
+        if value_property not in ITEM_VALUE_PROPERTIES:
+            raise ValueError(f"Error: Invalid item value property: {value_property}. Exiting.")
+        try:
+            return self._item_values[value_property]
+        except KeyError:
+            pass
+
+        import numpy as np
+        values = np.zeros(max((item.id for item in self.all_items), default=-1) + 1, dtype=np.float64)
+        linked = list()
+        for item in self.all_items:
+            value = getattr(item, value_property)
+            if value is not None:
+                values[item.id] = value
+            elif item.linked_id_item is not None and item.linked_id_item < len(values):
+                linked.append((item.id, item.linked_id_item))
+        for item_id, linked_id in linked:
+            values[item_id] = values[linked_id]
+
+        values.flags.writeable = False
+        self._item_values[value_property] = values
+        return values
+
+    @instrumentation.instrumented("AllItems.load_all_items")
+    def load_all_items(self, input_data_file_or_directory: Union[Path, str], lazy: bool = False,
+                       workers: Optional[int] = None, use_processes: bool = True, load_icons: bool = True,
+                       icon_store: Union[IconStore, Path, str, None] = None, use_cache: bool = False) -> None:
+        """Load the items database via a JSON file, directory of JSON files, or snapshot file.
+
+        Loading a snapshot file (see :mod:`osrsbox.items_api.item_snapshot`) replaces
+        any items that are already loaded, and each item is only decoded the first
+        time it is accessed.
 
         :param input_data_file_or_directory: The path to the data input.
+        :param lazy: Only index the JSON data, and decode each item the first time it is accessed.
+        :param workers: The number of pool workers used to load a folder of JSON files, or None to load serially.
+        :param use_processes: Use a process pool when loading with workers, or False to use a thread pool.
+        :param load_icons: Keep the base64 item icons in memory, or fetch them from `icon_store` on access.
+        :param icon_store: The icon store (or path to the packed icon file, or `items-icons` directory)
+            used when `load_icons` is False. Defaults to the icons next to the data input.
+        :param use_cache: Use the warm-start cache, when eagerly loading items with icons from JSON.
         :raises ValueError: Valid input not found.
         """
+        start_time = time.perf_counter()
+
         # Check if a str is supplied, if so, convert to Path object
         if isinstance(input_data_file_or_directory, str):
             input_data_file_or_directory = Path(input_data_file_or_directory)
 
+        # Set up the icon store, when icons are not loaded with each item
+        self.icon_store = None
+        if not load_icons:
+            self.icon_store = self._open_icon_store(input_data_file_or_directory, icon_store)
+
+        # Check the warm-start cache, only when the whole database is built from JSON data
+        is_snapshot = (input_data_file_or_directory.is_file()
+                       and item_snapshot.is_items_snapshot(input_data_file_or_directory))
+        path_to_cache_file = None
+        cached_items = None
+        if (use_cache and not lazy and load_icons and not is_snapshot and not len(self.all_items)
+                and input_data_file_or_directory.exists()):
+            from osrsbox import warm_cache
+            with instrumentation.phase("cache_read"):
+                path_to_cache_file = warm_cache.cache_file_path("items", input_data_file_or_directory, ItemProperties)
+                cached_items = warm_cache.read_cache(path_to_cache_file)
+
         # Process the directory of JSON, or a single JSON file
-        if input_data_file_or_directory.is_dir():
+        if cached_items is not None:
+            self.all_items = cached_items
+            self.all_items_dict = {item.id: item for item in cached_items}
+        elif lazy and input_data_file_or_directory.is_dir():
+            self._index_items_from_directory(path_to_directory=input_data_file_or_directory)
+        elif workers and input_data_file_or_directory.is_dir():
+            self._load_items_from_directory_parallel(path_to_directory=input_data_file_or_directory,
+                                                     workers=workers, use_processes=use_processes)
+        elif input_data_file_or_directory.is_dir():
             self._load_items_from_directory(path_to_directory=input_data_file_or_directory)
+        elif is_snapshot:
+            self._load_items_from_snapshot(path_to_snapshot=input_data_file_or_directory)
+        elif lazy and input_data_file_or_directory.is_file():
+            self._index_items_from_file(path_to_json_file=input_data_file_or_directory)
+        elif self.icon_store is not None and input_data_file_or_directory.is_file():
+            self._load_items_from_file_without_icons(path_to_json_file=input_data_file_or_directory)
         elif input_data_file_or_directory.is_file():
             self._load_items_from_file(path_to_json_file=input_data_file_or_directory)
         else:
             raise ValueError("Error: Valid input not found. Exiting.")
 
-        # Sort the list of items
-        self.all_items.sort(key=lambda x: x.id)
+        # Sort the list of items, lazily loaded items are already indexed in item ID order
+        if isinstance(self.all_items, list):
+            with instrumentation.phase("sort"):
+                self.all_items.sort(key=lambda x: x.id)
+
+        # Save the built items, so the next load can skip the JSON data
+        if path_to_cache_file is not None and cached_items is None:
+            with instrumentation.phase("cache_write"):
+                warm_cache.write_cache(path_to_cache_file, self.all_items)
+
+        self._reset_indexes()
+
+        self.load_time = time.perf_counter() - start_time
+
+    def _reset_indexes(self) -> None:
+        """Drop any indexes built from previously loaded items."""
+        self._name_indexes = dict()
+        self._search_index = None
+        self._fuzzy_indexes = dict()
+        self._equipment_columns = None
+        self._gear_optimizer = None
+        self._item_values = dict()
+        self._query_engine = None
+        self._secondary_indexes = dict()
+
+    def publish_shared_database(self, name: Optional[str] = None) -> "SharedDatabase":
+        """Publish the loaded items to shared memory, so other processes can use them without loading the database.
+
+        Other processes attach using `AllItems(shared_database=name)`. The shared memory is
+        removed when this process exits, or when `unlink()` is called on the returned object.
+
+        :param name: The name of the shared memory block, or None for a random name.
+        :return: The shared database, with the shared memory block name in its `name` attribute.
+        """
+        from osrsbox.shared_database import SharedDatabase
+        return SharedDatabase.publish((item.construct_json() for item in self.all_items), name=name)
+
+    @instrumentation.instrumented("AllItems.attach_shared_database")
+    def attach_shared_database(self, shared_database: Union["SharedDatabase", str],
+                               cache_size: Optional[int] = 1024) -> None:
+        """Load the items from a shared database, without copying the database into this process.
+
+        Each item is decoded from the shared buffer when it is accessed. This process
+        only keeps the item ID index and the `cache_size` most recently used items, so
+        its memory use stays close to the size of the index, and other items are decoded
+        again when they are next used. Building a name, search or query index decodes
+        every item, and the index keeps the items it holds.
+
+        :param shared_database: A SharedDatabase (for example, from `SharedDatabase.open_file`),
+            or the name of a shared memory block published by :meth:`publish_shared_database`.
+        :param cache_size: The number of decoded items kept by this process, or None to keep
+            every decoded item, which grows toward a full copy of the database as items are used.
+        :raises ValueError: Not a valid shared database.
+        """
+        start_time = time.perf_counter()
+
+        if isinstance(shared_database, str):
+            from osrsbox.shared_database import SharedDatabase
+            shared_database = SharedDatabase.attach(shared_database)
+
+        self.shared_database = shared_database
+        self.icon_store = None
+        with instrumentation.phase("index"):
+            locations = shared_database.locations()
+        self.all_items_dict = LazyRecordDict(locations,
+                                             lambda record: self._build_item(shared_database.decode_json(record)),
+                                             max_records=cache_size)
+        self.all_items = LazyRecordList(self.all_items_dict)
+        self._reset_indexes()
+
+        self.load_time = time.perf_counter() - start_time
+
+    @staticmethod
+    def _open_icon_store(input_data_file_or_directory: Path,
+                         icon_store: Union[IconStore, Path, str, None]) -> IconStore:
+        """Open the icon store used when items are loaded without icons.
+
+        The default icon store is the packed icon file (`items-icons.bin`) next to
+        the data input, or the `items-icons` directory if there is no packed file.
+
+        :param input_data_file_or_directory: The path to the data input.
+        :param icon_store: An icon store, a path to an icon store, or None for the default.
+        :return: The icon store.
+        """
+        if isinstance(icon_store, IconStore):
+            return icon_store
+        if icon_store is not None:
+            return open_icon_store(icon_store)
+
+        path_to_docs = input_data_file_or_directory.absolute().parent
+        if (path_to_docs / "items-icons.bin").is_file():
+            return open_icon_store(path_to_docs / "items-icons.bin")
+        return open_icon_store(path_to_docs / "items-icons")
 
     def _load_items_from_directory(self, path_to_directory: Path) -> None:
         """Load item database from a directory of JSON files (`items-json`).
@@ -167,34 +635,121 @@ class AllItems:
 
         # Loop through every item in JSON file
         for json_file in json_files:
-            with open(json_file) as input_json_file:
-                temp = json.load(input_json_file)
+            with instrumentation.phase("read_decode"):
+                with open(json_file) as input_json_file:
+                    temp = json_codec.load(input_json_file)
 
-            self._load_item(temp)
+            with instrumentation.phase("build"):
+                self._load_item(temp)
+
+    def _load_items_from_directory_parallel(self, path_to_directory: Path, workers: int, use_processes: bool) -> None:
+        """Load item database from a directory of JSON files (`items-json`) using a pool of workers.
+
+        The JSON files are decoded in chunks by a process (or thread) pool, in item ID
+        order, and each chunk is built as soon as it is decoded, while the pool decodes
+        the next chunks. The result is the same as :meth:`_load_items_from_directory`.
+
+        :param path_to_directory: The path to the `items-json` directory.
+        :param workers: The number of pool workers.
+        :param use_processes: Use a process pool, or False to use a thread pool.
+        """
+        from osrsbox.parallel_loading import load_json_directory
+        for chunk in load_json_directory(path_to_directory, workers=workers, use_processes=use_processes):
+            with instrumentation.phase("build"):
+                for item_json in chunk:
+                    self._load_item(item_json)
 
     def _load_items_from_file(self, path_to_json_file: Path) -> None:
         """Load item database from a single JSON file (`items-complete.json`).
 
         :param path_to_json_file: The path to the `items-complete.json` file.
         """
-        with open(path_to_json_file) as input_json_file:
-            temp = json.load(input_json_file)
+        with instrumentation.phase("read"):
+            with open(path_to_json_file, "rb") as input_json_file:
+                data = input_json_file.read()
 
-        for entry in temp:
-            self._load_item(temp[entry])
+        with instrumentation.phase("decode"):
+            temp = json_codec.loads(data)
+        del data
 
-    def _load_item(self, item_json: Dict) -> None:
-        """Convert the `item_json` into a :class:`ItemProperties` and store it.
+        with instrumentation.phase("build"):
+            for entry in temp:
+                self._load_item(temp[entry])
+
+    def _load_items_from_file_without_icons(self, path_to_json_file: Path) -> None:
+        """Load item database from a single JSON file (`items-complete.json`), without the item icons.
+
+        The file is scanned once, to find the icon of each item in the file bytes, and
+        to decode each item without its icon. The icons are fetched from the icon store.
+
+        :param path_to_json_file: The path to the `items-complete.json` file.
+        """
+        items_json = list()
+
+        # Items are decoded while the file is indexed, so indexing and decoding are timed together
+        with instrumentation.phase("index_decode"):
+            json_index = JsonFileIndex(path_to_json_file, record_callback=items_json.append, skip_key="icon")
+        json_index.close()
+
+        with instrumentation.phase("build"):
+            for item_json in items_json:
+                self._load_item(item_json)
+
+    def _load_items_from_snapshot(self, path_to_snapshot: Path) -> None:
+        """Load item database from a binary snapshot file (`items-complete.bin`).
+
+        :param path_to_snapshot: The path to the snapshot file.
+        """
+        with instrumentation.phase("index"):
+            snapshot = item_snapshot.ItemSnapshot(path_to_snapshot)
+        # Skip decoding the icons when they are fetched from an icon store
+        exclude = ("icon",) if self.icon_store is not None else ()
+        self.all_items_dict = LazyRecordDict(snapshot.locations(),
+                                             lambda record: self._build_item(snapshot.decode_json(record, exclude)))
+        self.all_items = LazyRecordList(self.all_items_dict)
+
+    def _index_items_from_directory(self, path_to_directory: Path) -> None:
+        """Index item database JSON files by item ID, and decode each item on first access.
+
+        :param path_to_directory: The path to the `items-json` directory.
+        """
+        with instrumentation.phase("index"):
+            json_files = index_json_directory(path_to_directory)
+        self.all_items_dict = LazyRecordDict(json_files, lambda json_file: self._build_item(decode_json_file(json_file)))
+        self.all_items = LazyRecordList(self.all_items_dict)
+
+    def _index_items_from_file(self, path_to_json_file: Path) -> None:
+        """Index the byte offset of each item in a single JSON file, and decode each item on first access.
+
+        :param path_to_json_file: The path to the `items-complete.json` file.
+        """
+        with instrumentation.phase("index"):
+            json_index = JsonFileIndex(path_to_json_file)
+        self.all_items_dict = LazyRecordDict(json_index.locations, lambda location: self._build_item(json_index.decode_json(location)))
+        self.all_items = LazyRecordList(self.all_items_dict)
+
+    def _build_item(self, item_json: Dict) -> ItemProperties:
+        """Convert the `item_json` into a :class:`ItemProperties`.
 
         :param item_json: A dict from an open and loaded JSON file.
         :raises ValueError: Cannot populate item.
         """
-        # Load the item using the ItemProperties class
         try:
-            item_def = ItemProperties.from_json(item_json)
+            if self.icon_store is not None:
+                return LazyIconItemProperties.from_icon_store(item_json, self.icon_store)
+            return ItemProperties.from_json(item_json)
         except TypeError as e:
             raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting") from e
 
+    def _load_item(self, item_json: Dict) -> None:
+        """Convert the `item_json` into a :class:`ItemProperties` and store it.
+
+        :param item_json: A dict from an open and loaded JSON file.
+        :raises ValueError: Cannot populate item.
+        """
+        # Load the item using the ItemProperties class
+        item_def = self._build_item(item_json)
+
         # Add item to list
         self.all_items.append(item_def)
         self.all_items_dict[item_def.id] = item_def
@@ -0,0 +1,274 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Find the best gear loadouts (one item per equipment slot) for a weighted sum of
+equipment bonuses, under membership and skill level constraints.
+
+Each slot is first pruned to its k-skyline: when searching for k loadouts, an
+item is dropped when k other items in the same slot are at least as good in
+every weighted (and constrained) bonus. The loadouts are then found using a branch and bound search over the
+slots, which is bounded by the best remaining score of each slot. A loadout
+either has a two-handed weapon and no shield, or a weapon and a shield.
+
+This module requires NumPy, which is an optional dependency of the osrsbox
+package (install using: pip install osrsbox[numpy]).
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+import heapq
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+
+from osrsbox.items_api.item_columns import BONUS_COLUMNS
+from osrsbox.items_api.item_columns import SLOTS
+from osrsbox.items_api.item_columns import EquipmentColumns
+from osrsbox.items_api.item_properties import ItemProperties
+
+# The number of rows checked against the skyline at once
+PARETO_CHUNK_SIZE = 32
+
+# One candidate for a slot: score, item ID (None for an empty slot), constrained bonuses, and whether it is two-handed
+_Candidate = Tuple[float, Optional[int], Tuple[int, ...], bool]
+
+
+@dataclass
+class Loadout:
+    """One gear loadout found by :class:`GearOptimizer`.
+
+    The `items` dict maps each filled slot to an item ID, a two-handed weapon is
+    stored under the `2h` slot. The `bonuses` dict holds the total of every
+    equipment bonus in the loadout.
+    """
+    score: float
+    items: Dict[str, int] = field(default_factory=dict)
+    bonuses: Dict[str, int] = field(default_factory=dict)
+
+
+class GearOptimizer:
+    """Find the best gear loadouts from the equipable items.
+
+    The equipment bonuses come from an :class:`EquipmentColumns` view, and the
+    skill requirements are stored as a matrix of required levels, so every
+    constraint is checked using NumPy.
+
+    :param items: The items to choose from, items without equipment are skipped.
+    :param columns: The EquipmentColumns view of the same items, or None to build it.
+    """
+    def __init__(self, items: Iterable[ItemProperties], columns: Optional[EquipmentColumns] = None):
+        equipable = [item for item in items if item.equipment is not None]
+        self.columns = columns if columns is not None else EquipmentColumns(equipable)
+
+        # The required level of each skill, with one row per item in the columns view (0 when not required)
+        requirements = {item.id: item.equipment.requirements or {} for item in equipable}
+        self.skills = sorted({skill for required in requirements.values() for skill in required})
+        self.requirements = np.zeros((len(self.columns), len(self.skills)), dtype=np.int16)
+        for row, item_id in enumerate(self.columns.ids):
+            for skill, level in requirements[int(item_id)].items():
+                self.requirements[row, self.skills.index(skill)] = level
+
+    def usable(self, members: Optional[bool] = None, skills: Optional[Dict[str, int]] = None,
+               exclude: Iterable[int] = ()) -> np.ndarray:
+        """Build a boolean row mask of the items that can be equipped.
+
+        :param members: False to only use free-to-play items, True or None to use every item.
+        :param skills: A dict of skill name to level. Skills missing from the dict are level 1.
+            None ignores the skill requirements.
+        :param exclude: Item IDs that cannot be used.
+        :return: A bool array with one value per row of the columns view.
+        """
+        selected = np.ones(len(self.columns), dtype=bool)
+        if members is False:
+            selected &= ~self.columns["members"]
+        if skills is not None:
+            levels = np.array([skills.get(skill, 1) for skill in self.skills], dtype=np.int16)
+            selected &= (self.requirements <= levels).all(axis=1)
+        exclude = list(exclude)
+        if exclude:
+            selected &= ~np.isin(self.columns.ids, exclude)
+        return selected
+
+    def best_loadouts(self, weights: Dict[str, float], k: int = 1, members: Optional[bool] = None,
+                      skills: Optional[Dict[str, int]] = None, minimums: Optional[Dict[str, int]] = None,
+                      slots: Optional[Iterable[str]] = None, exclude: Iterable[int] = ()) -> List[Loadout]:
+        """Find the k loadouts with the highest weighted sum of equipment bonuses.
+
+        For example, `optimizer.best_loadouts({"attack_slash": 1, "melee_strength": 2}, k=3,
+        members=False)` finds the three best free-to-play slash loadouts.
+
+        Each slot only uses items that are worse in every weighted and constrained
+        bonus than fewer than k other items of the slot, as every loadout using such
+        an item is beaten by k other loadouts. A slot is left empty when no item
+        improves the loadout.
+
+        :param weights: A dict of bonus name to weight. Negative weights prefer lower bonuses.
+        :param k: The number of loadouts to return.
+        :param members: False to only use free-to-play items, True or None to use every item.
+        :param skills: A dict of skill name to level, used to check the item requirements.
+            Skills missing from the dict are level 1. None ignores the skill requirements.
+        :param minimums: The minimum total of a bonus in every loadout, keyed by bonus name.
+        :param slots: The slots to fill, defaults to every slot.
+        :param exclude: Item IDs that cannot be used.
+        :return: A list of loadouts, highest score first.
+        :raises ValueError: Unknown bonus or slot name.
+        """
+        minimums = dict(minimums or {})
+        for bonus in list(weights) + list(minimums):
+            if bonus not in BONUS_COLUMNS:
+                raise ValueError(f"Error: Unknown equipment bonus: {bonus}. Exiting.")
+        slots = list(SLOTS) if slots is None else list(slots)
+        for slot in slots:
+            if slot not in SLOTS:
+                raise ValueError(f"Error: Unknown equipment slot: {slot}. Exiting.")
+        if k < 1:
+            return list()
+
+        usable = self.usable(members=members, skills=skills, exclude=exclude)
+        score = self.columns.score({bonus: weight for bonus, weight in weights.items() if weight})
+
+        # Compare items on every weighted bonus (in the direction of its weight) and every constrained bonus
+        criteria = [self.columns[bonus] * np.sign(weight) for bonus, weight in weights.items() if weight]
+        criteria.extend(self.columns[bonus] for bonus in minimums)
+        criteria = np.column_stack(criteria).astype(np.float64) if criteria else np.zeros((len(self.columns), 0))
+        constrained = np.column_stack([self.columns[bonus] for bonus in minimums]).astype(np.int64) \
+            if minimums else np.zeros((len(self.columns), 0), dtype=np.int64)
+
+        candidates: Dict[str, List[_Candidate]] = dict()
+        for slot in slots:
+            rows = np.flatnonzero(usable & (self.columns["slot"] == SLOTS.index(slot)))
+            front = _skyline(rows, score, criteria, k)
+            candidates[slot] = [(float(score[row]), int(self.columns.ids[row]), tuple(constrained[row].tolist()), slot == "2h")
+                                for row in front]
+
+        found = _search(candidates, slots, minimums, k)
+        return [self._loadout(total, chosen) for total, chosen in found]
+
+    def _loadout(self, score: float, chosen: Dict[str, int]) -> Loadout:
+        """Build a Loadout, and total its equipment bonuses."""
+        rows = np.searchsorted(self.columns.ids, list(chosen.values()))
+        bonuses = {bonus: int(self.columns[bonus][rows].sum()) for bonus in BONUS_COLUMNS}
+        return Loadout(score=score, items=chosen, bonuses=bonuses)
+
+
+def _skyline(rows: np.ndarray, score: np.ndarray, criteria: np.ndarray, k: int) -> List[int]:
+    """Find the rows that are dominated by fewer than k other rows (the k-skyline).
+
+    A row that is dominated by k rows is not used by any of the k best loadouts,
+    as swapping it for each of those rows gives k loadouts that are at least as
+    good. Rows are visited from the highest score, so a row can only be dominated
+    by a row that was visited before it, and of rows with equal criteria the lowest
+    item ID is visited first. Only rows that are kept are counted, as the rows
+    dominating a dropped row also dominate every row it dominates. An empty slot is
+    preferred to an item that adds nothing.
+
+    :param rows: The candidate rows of one slot, in item ID order.
+    :param score: The score of every row.
+    :param criteria: The criteria of every row, higher is better.
+    :param k: The number of loadouts that are searched for.
+    :return: The rows of the k-skyline, highest score first.
+    """
+    # Rows without a positive criterion are dominated by the empty slot
+    rows_criteria = criteria[rows]
+    keep = (rows_criteria > 0).any(axis=1)
+    rows, rows_criteria = rows[keep], rows_criteria[keep]
+    order = np.lexsort((-rows_criteria.sum(axis=1), -score[rows]))
+    rows, rows_criteria = rows[order], rows_criteria[order]
+
+    # Rows are checked against the skyline found so far in chunks, then one at a time
+    front = np.zeros((len(rows), criteria.shape[1]))
+    size = 0
+    found = list()
+    for start in range(0, len(rows), PARETO_CHUNK_SIZE):
+        chunk_criteria = rows_criteria[start:start + PARETO_CHUNK_SIZE]
+        dominated = (front[None, :size] >= chunk_criteria[:, None]).all(axis=2).sum(axis=1) >= k
+        for offset in np.flatnonzero(~dominated):
+            row_criteria = chunk_criteria[offset]
+            if (front[:size] >= row_criteria).all(axis=1).sum() >= k:
+                continue
+            front[size] = row_criteria
+            size += 1
+            found.append(int(rows[start + offset]))
+    return found
+
+
+def _search(candidates: Dict[str, List[_Candidate]], slots: List[str], minimums: Dict[str, int],
+            k: int) -> List[Tuple[float, Dict[str, int]]]:
+    """Branch and bound search for the k loadouts with the highest score.
+
+    The weapon and two-handed weapon slots are searched as one slot, followed by
+    the shield slot (which is left empty after a two-handed weapon). Every slot can
+    also be left empty.
+
+    :return: A list of (score, dict of slot to item ID), highest score first.
+    """
+    empty = (0.0, None, (0,) * len(minimums), False)
+    levels: List[List[Tuple[str, _Candidate]]] = list()
+    hands = [(slot, candidate) for slot in ("weapon", "2h") if slot in slots for candidate in candidates[slot]]
+    if "weapon" in slots or "2h" in slots:
+        levels.append(sorted(hands, key=lambda entry: -entry[1][0]) + [("weapon", empty)])
+    for slot in slots:
+        if slot not in ("weapon", "2h"):
+            levels.append([(slot, candidate) for candidate in candidates[slot]] + [(slot, empty)])
+
+    # The best score, and the highest constrained bonuses, of the remaining levels
+    best_remaining = [0.0] * (len(levels) + 1)
+    most_remaining = [(0,) * len(minimums)] * (len(levels) + 1)
+    for level in range(len(levels) - 1, -1, -1):
+        best_remaining[level] = best_remaining[level + 1] + max(candidate[0] for _, candidate in levels[level])
+        most_remaining[level] = tuple(total + max(candidate[2][column] for _, candidate in levels[level])
+                                      for column, total in enumerate(most_remaining[level + 1]))
+    required = tuple(minimums.values())
+
+    found: List[Tuple[float, int, Dict[str, int]]] = list()
+    chosen: Dict[str, int] = dict()
+    counter = 0
+
+    def visit(level: int, total: float, bonuses: Tuple[int, ...], two_handed: bool) -> None:
+        nonlocal counter
+        if len(found) >= k and total + best_remaining[level] <= found[0][0]:
+            return
+        if any(bonus + most < minimum for bonus, most, minimum in zip(bonuses, most_remaining[level], required)):
+            return
+        if level == len(levels):
+            counter += 1
+            # Ties are kept in the order they are found, which is the highest score per slot first
+            entry = (total, -counter, dict(chosen))
+            if len(found) < k:
+                heapq.heappush(found, entry)
+            else:
+                heapq.heapreplace(found, entry)
+            return
+
+        for slot, (score, item_id, item_bonuses, is_two_handed) in levels[level]:
+            if two_handed and slot == "shield" and item_id is not None:
+                continue
+            if item_id is not None:
+                chosen[slot] = item_id
+            visit(level + 1, total + score, tuple(map(sum, zip(bonuses, item_bonuses))),
+                  two_handed or is_two_handed)
+            chosen.pop(slot, None)
+
+    visit(0, 0.0, (0,) * len(minimums), False)
+    return [(total, loadout) for total, _, loadout in sorted(found, reverse=True)]
@@ -0,0 +1,193 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+A NumPy columnar view of the equipment bonuses of every equipable item.
+
+This module requires NumPy, which is an optional dependency of the osrsbox
+package (install using: pip install osrsbox[numpy]).
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Union
+
+import numpy as np
+
+from osrsbox.items_api.item_properties import ItemProperties
+
+# The ItemEquipment bonus properties, stored as int16 columns
+BONUS_COLUMNS = (
+    "attack_stab",
+    "attack_slash",
+    "attack_crush",
+    "attack_magic",
+    "attack_ranged",
+    "defence_stab",
+    "defence_slash",
+    "defence_crush",
+    "defence_magic",
+    "defence_ranged",
+    "melee_strength",
+    "ranged_strength",
+    "magic_damage",
+    "prayer",
+)
+
+# The equipment slots, the slot column stores the index of the slot name in this tuple
+SLOTS = ("head", "cape", "neck", "ammo", "weapon", "body", "shield", "legs", "hands", "feet", "ring", "2h")
+
+
+def slot_index(slot: str) -> int:
+    """Get the index of an equipment slot name in :data:`SLOTS`.
+
+    :param slot: The equipment slot name.
+    :return: The slot index.
+    :raises ValueError: Unknown equipment slot.
+    """
+    try:
+        return SLOTS.index(slot)
+    except ValueError:
+        raise ValueError(f"Error: Unknown equipment slot: {slot}. Exiting.") from None
+
+
+class EquipmentColumns:
+    """Columnar arrays of equipment properties, with one row per equipable item.
+
+    Each bonus is stored as an int16 array, and can be accessed by name using
+    `columns["prayer"]`. The `slot` column stores an index into :data:`SLOTS`, the
+    `attack_speed` column is 0 for items that are not weapons, and the `members`
+    column is a bool array. Rows are in item ID order. The query helpers return
+    NumPy arrays of item IDs.
+
+    :param items: The items to include, items without equipment are skipped.
+    """
+    def __init__(self, items: Iterable[ItemProperties]):
+        equipable = [item for item in items if item.equipment is not None]
+
+        self.ids = np.array([item.id for item in equipable], dtype=np.int32)
+        self.columns: Dict[str, np.ndarray] = dict()
+        for bonus in BONUS_COLUMNS:
+            self.columns[bonus] = np.array([getattr(item.equipment, bonus) for item in equipable], dtype=np.int16)
+        self.columns["slot"] = np.array([slot_index(item.equipment.slot) for item in equipable], dtype=np.int16)
+        self.columns["attack_speed"] = np.array([item.weapon.attack_speed if item.weapon else 0 for item in equipable],
+                                                dtype=np.int16)
+        self.columns["members"] = np.array([bool(item.members) for item in equipable], dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def mask(self, slot: Union[str, Iterable[str], None] = None, members: Optional[bool] = None,
+             **minimums: int) -> np.ndarray:
+        """Build a boolean row mask from equipment slot, membership and minimum column values.
+
+        For example, `columns.mask(slot="head", members=False, prayer=2)` selects free-to-play
+        head slot items with a prayer bonus of 2 or more.
+
+        :param slot: An equipment slot name, or several slot names.
+        :param members: True for members items only, False for free-to-play items only.
+        :param minimums: The minimum value of a column, keyed by column name.
+        :return: A bool array with one value per row.
+        """
+        selected = np.ones(len(self.ids), dtype=bool)
+        if slot is not None:
+            slots = [slot] if isinstance(slot, str) else list(slot)
+            selected &= np.isin(self.columns["slot"], [slot_index(name) for name in slots])
+        if members is not None:
+            selected &= self.columns["members"] == members
+        for column, minimum in minimums.items():
+            selected &= self.columns[column] >= minimum
+        return selected
+
+    def filter(self, mask: Optional[np.ndarray] = None, **conditions) -> np.ndarray:
+        """Get the item IDs of every row matching a mask, or the conditions accepted by :meth:`mask`.
+
+        :param mask: A boolean row mask.
+        :param conditions: Conditions passed to :meth:`mask`, when no mask is supplied.
+        :return: An array of item IDs, in item ID order.
+        """
+        if mask is None:
+            mask = self.mask(**conditions)
+        return self.ids[mask]
+
+    def score(self, weights: Union[str, Dict[str, float]]) -> np.ndarray:
+        """Calculate the weighted sum of columns for every row.
+
+        :param weights: A dict of column name to weight, or one column name (a weight of 1).
+        :return: An array with one score per row.
+        """
+        if isinstance(weights, str):
+            return self.columns[weights]
+        score = np.zeros(len(self.ids), dtype=np.float64)
+        for column, weight in weights.items():
+            score += weight * self.columns[column]
+        return score
+
+    def sort(self, weights: Union[str, Dict[str, float]], descending: bool = True,
+             mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Sort item IDs by a column, or weighted sum of columns. Ties are kept in item ID order.
+
+        :param weights: A column name, or dict of column name to weight.
+        :param descending: Sort from the highest to lowest score.
+        :param mask: A boolean row mask, to only sort some rows.
+        :return: An array of sorted item IDs.
+        """
+        rows = np.arange(len(self.ids)) if mask is None else np.flatnonzero(mask)
+        score = self.score(weights)[rows]
+        order = np.argsort(-score if descending else score, kind="stable")
+        return self.ids[rows[order]]
+
+    def top_k(self, weights: Union[str, Dict[str, float]], k: int, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Get the k item IDs with the highest column value, or weighted sum of columns.
+
+        :param weights: A column name, or dict of column name to weight.
+        :param k: The number of item IDs to return.
+        :param mask: A boolean row mask, to only consider some rows.
+        :return: An array of item IDs, highest score first. Ties are kept in item ID order.
+        """
+        rows = np.arange(len(self.ids)) if mask is None else np.flatnonzero(mask)
+        score = -self.score(weights)[rows]
+        if k < len(rows):
+            # Keep every row tied with the k-th score, so ties are resolved by item ID below
+            threshold = np.partition(score, k - 1)[k - 1]
+            keep = np.flatnonzero(score <= threshold)
+            rows, score = rows[keep], score[keep]
+        order = np.argsort(score, kind="stable")[:k]
+        return self.ids[rows[order]]
+
+    def slot_names(self, item_ids: Iterable[int]) -> List[str]:
+        """Get the equipment slot names for item IDs in this view.
+
+        :param item_ids: The item IDs.
+        :return: A list of slot names.
+        :raises KeyError: An item ID is not in this view.
+        """
+        item_ids = np.asarray(list(item_ids), dtype=np.int64)
+        rows = np.searchsorted(self.ids, item_ids)
+        # searchsorted gives the row where a missing ID would be inserted, so check the IDs match
+        found = rows < len(self.ids)
+        found[found] = self.ids[rows[found]] == item_ids[found]
+        if not found.all():
+            raise KeyError(f"Cannot find equipment for the provided item ID: {item_ids[~found][0]}")
+        return [SLOTS[index] for index in self.columns["slot"][rows]]
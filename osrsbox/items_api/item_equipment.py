@@ -23,7 +23,10 @@ from dataclasses import dataclass
 from typing import Dict
 from typing import Optional
 
+from osrsbox.dataclass_slots import add_slots
 
+
+@add_slots
 @dataclass
 class ItemEquipment:
     """This class defines the properties for an equipable OSRS item.
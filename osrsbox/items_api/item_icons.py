@@ -0,0 +1,203 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Icon stores that keep item icons out of loaded ItemProperties objects.
+
+Every item JSON entry embeds a base64 encoded PNG icon, which is most of the
+size of the items database. When the items database is loaded without icons,
+each ItemProperties object fetches its icon from an icon store when the `icon`
+property is accessed. Two icon stores are supported: the `items-icons` folder
+of PNG files, or a single packed icon file with an offset index.
+
+Packed icon file layout:
+
+    header   PACK_HEADER struct (magic, version, icon count)
+    index    PACK_ENTRY struct (item ID, offset, length) per icon, sorted by item ID
+    data     the PNG files, offsets are relative to the start of this section
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+import base64
+import mmap
+import struct
+from abc import ABC
+from abc import abstractmethod
+from dataclasses import fields
+from pathlib import Path
+from typing import Optional
+from typing import Union
+
+from osrsbox.items_api.item_properties import ItemProperties
+
+PACK_MAGIC = b"OSRSBXP\x00"
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct("<8sHI")
+PACK_ENTRY = struct.Struct("<iQI")
+
+
+class IconStore(ABC):
+    """Base class for a store of item icons, looked up by item ID."""
+    def icon(self, item_id: int) -> Optional[str]:
+        """Get the base64 encoded PNG icon for an item.
+
+        :param item_id: The item ID.
+        :return: The base64 encoded icon, or None if the store has no icon for the item.
+        """
+        png = self.icon_png(item_id)
+        if png is None:
+            return None
+        return base64.b64encode(png).decode("ascii")
+
+    @abstractmethod
+    def icon_png(self, item_id: int) -> Optional[bytes]:
+        """Get the PNG icon for an item.
+
+        :param item_id: The item ID.
+        :return: The PNG file contents, or None if the store has no icon for the item.
+        """
+
+
+class DirectoryIconStore(IconStore):
+    """An icon store that reads the `items-icons` folder of PNG files (named by item ID).
+
+    :param path_to_directory: The path to the `items-icons` directory.
+    """
+    def __init__(self, path_to_directory: Union[Path, str]):
+        self.path_to_directory = Path(path_to_directory)
+
+    def icon_png(self, item_id: int) -> Optional[bytes]:
+        try:
+            with open(self.path_to_directory / f"{item_id}.png", "rb") as icon_file:
+                return icon_file.read()
+        except FileNotFoundError:
+            return None
+
+
+class PackedIconStore(IconStore):
+    """An icon store that reads a packed icon file, written by :func:`write_packed_icons`, using mmap.
+
+    :param path_to_packed_file: The path to the packed icon file.
+    :raises ValueError: The file is not a packed icon file.
+    """
+    def __init__(self, path_to_packed_file: Union[Path, str]):
+        with open(path_to_packed_file, "rb") as input_file:
+            self._buffer = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count = PACK_HEADER.unpack_from(self._buffer, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError("Error: Unsupported packed icon file. Exiting.")
+
+        index_end = PACK_HEADER.size + count * PACK_ENTRY.size
+        self._data_offset = index_end
+        self._index = {item_id: (offset, length) for item_id, offset, length
+                       in PACK_ENTRY.iter_unpack(self._buffer[PACK_HEADER.size:index_end])}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def icon_png(self, item_id: int) -> Optional[bytes]:
+        try:
+            offset, length = self._index[item_id]
+        except KeyError:
+            return None
+        start = self._data_offset + offset
+        return self._buffer[start:start + length]
+
+    def close(self) -> None:
+        """Close the memory map of the packed icon file."""
+        self._buffer.close()
+
+
+def open_icon_store(path_to_icons: Union[Path, str]) -> IconStore:
+    """Open an icon store from a packed icon file, or a directory of PNG files.
+
+    :param path_to_icons: The path to the packed icon file, or `items-icons` directory.
+    :return: The icon store.
+    """
+    path_to_icons = Path(path_to_icons)
+    if path_to_icons.is_file():
+        return PackedIconStore(path_to_icons)
+    return DirectoryIconStore(path_to_icons)
+
+
+def write_packed_icons(path_to_icons_directory: Union[Path, str], path_to_packed_file: Union[Path, str]) -> None:
+    """Pack the `items-icons` folder of PNG files into a single packed icon file.
+
+    :param path_to_icons_directory: The path to the `items-icons` directory.
+    :param path_to_packed_file: The path to save the packed icon file to.
+    """
+    icon_files = sorted(Path(path_to_icons_directory).glob("*.png"), key=lambda x: int(x.stem))
+
+    index = bytearray()
+    data = bytearray()
+    for icon_file in icon_files:
+        with open(icon_file, "rb") as f:
+            png = f.read()
+        index += PACK_ENTRY.pack(int(icon_file.stem), len(data), len(png))
+        data += png
+
+    with open(path_to_packed_file, "wb") as out_file:
+        out_file.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(icon_files)))
+        out_file.write(index)
+        out_file.write(data)
+
+
+# The slot descriptor that stores the icon value of an ItemProperties object
+_ICON_SLOT = ItemProperties.__dict__["icon"]
+
+
+class LazyIconItemProperties(ItemProperties):
+    """An ItemProperties object which fetches the `icon` property from an icon store.
+
+    The icon is read from the icon store on every access and is not kept, so the
+    loaded item does not hold the icon in memory. If the item was created with an
+    icon value, that value is used instead. It is equal to an ItemProperties object
+    with the same properties.
+    """
+    __slots__ = ("icon_store",)
+
+    @property
+    def icon(self) -> Optional[str]:
+        icon = _ICON_SLOT.__get__(self)
+        if icon is None and getattr(self, "icon_store", None) is not None:
+            icon = self.icon_store.icon(self.id)
+        return icon
+
+    @icon.setter
+    def icon(self, value: Optional[str]):
+        _ICON_SLOT.__set__(self, value)
+
+    def __eq__(self, other: object) -> bool:
+        # The dataclass __eq__ only compares objects of the same class, so compare every field instead
+        if not isinstance(other, ItemProperties):
+            return NotImplemented
+        return (tuple(getattr(self, field.name) for field in fields(ItemProperties))
+                == tuple(getattr(other, field.name) for field in fields(ItemProperties)))
+
+    @classmethod
+    def from_icon_store(cls, item_json: dict, icon_store: IconStore) -> "LazyIconItemProperties":
+        """Construct an ItemProperties object without an icon, which uses an icon store for the icon.
+
+        :param item_json: A dict from an open and loaded JSON file, which is not changed.
+        :param icon_store: The icon store to fetch the icon from.
+        :return: The ItemProperties object.
+        """
+        item_def = cls.from_json({**item_json, "icon": None})
+        item_def.icon_store = icon_store
+        return item_def
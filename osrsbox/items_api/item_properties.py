@@ -18,17 +18,19 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
-import json
 from pathlib import Path
 from dataclasses import asdict
 from dataclasses import dataclass
 from typing import Dict
 from typing import Optional
 
+from osrsbox import json_codec
+from osrsbox.dataclass_slots import add_slots
 from osrsbox.items_api.item_equipment import ItemEquipment
 from osrsbox.items_api.item_weapon import ItemWeapon
 
 
+@add_slots
 @dataclass
 class ItemProperties:
     """This class defines the object structure and properties for an OSRS item.
@@ -104,6 +106,6 @@ class ItemProperties:
         out_file_path = Path(export_path / out_file_name)
         with open(out_file_path, "w") as out_file:
             if pretty:
-                json.dump(json_out, out_file, indent=4)
+                json_codec.dump(json_out, out_file, indent=4)
             else:
-                json.dump(json_out, out_file)
+                json_codec.dump(json_out, out_file)
@@ -0,0 +1,272 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Compact binary snapshot format for the items database.
+
+A snapshot is generated from `items-complete.json` and stores one fixed-width
+record per item, sorted by item ID. Every top-level ItemProperties field is
+stored as a one byte type tag, and an eight byte value. Strings are stored in
+a de-duplicated string table, and nested objects (equipment, weapon) and icons
+are stored in a blob table. The file is opened using mmap, and each record is
+only decoded when it is accessed.
+
+File layout:
+
+    header        HEADER struct (magic, version, counts, section offsets)
+    field names   UTF-8 JSON list of the ItemProperties field names
+    ids           int32 item ID for each record, in record order
+    records       record_count * record_size bytes
+    strings       UTF-8 string table
+    blobs         blob table (compact JSON, or raw PNG bytes)
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+import base64
+import json
+import mmap
+import struct
+from array import array
+from dataclasses import fields
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+
+from osrsbox import json_codec
+from osrsbox.items_api.item_properties import ItemProperties
+
+SNAPSHOT_MAGIC = b"OSRSBXI\x00"
+SNAPSHOT_VERSION = 1
+
+# magic, version, field count, record count, record size, then section offsets
+HEADER = struct.Struct("<8sHHIIQQQQQ")
+
+# Type tags for each field value
+TAG_NONE = 0
+TAG_FALSE = 1
+TAG_TRUE = 2
+TAG_INT = 3
+TAG_FLOAT = 4
+TAG_STRING = 5
+TAG_JSON = 6
+TAG_BASE64 = 7
+
+INT64 = struct.Struct("<q")
+FLOAT64 = struct.Struct("<d")
+REFERENCE = struct.Struct("<II")
+
+# Fields stored as raw bytes in the blob table, and encoded as base64 when decoded
+BASE64_FIELDS = ("icon",)
+
+
+def is_items_snapshot(path_to_file: Path) -> bool:
+    """Check if a file is an items database snapshot.
+
+    :param path_to_file: The path to the file to check.
+    :return: True if the file starts with the snapshot magic bytes.
+    """
+    with open(path_to_file, "rb") as input_file:
+        return input_file.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+
+
+def _field_names() -> List[str]:
+    return [field.name for field in fields(ItemProperties)]
+
+
+class _Table:
+    """An append-only byte table that de-duplicates identical entries."""
+    def __init__(self):
+        self.data = bytearray()
+        self.known: Dict[bytes, int] = dict()
+
+    def add(self, value: bytes) -> bytes:
+        offset = self.known.get(value)
+        if offset is None:
+            offset = len(self.data)
+            self.data += value
+            self.known[value] = offset
+        return REFERENCE.pack(offset, len(value))
+
+
+def write_items_snapshot(path_to_json_file: Union[Path, str], path_to_snapshot: Union[Path, str]) -> None:
+    """Generate an items database snapshot from the `items-complete.json` file.
+
+    :param path_to_json_file: The path to the `items-complete.json` file.
+    :param path_to_snapshot: The path to save the snapshot to.
+    :raises ValueError: An item property cannot be stored in the snapshot.
+    """
+    with open(path_to_json_file) as input_json_file:
+        all_items = json_codec.load(input_json_file)
+
+    field_names = _field_names()
+    cell_tags = struct.Struct(f"<{len(field_names)}B")
+    record_size = cell_tags.size + 8 * len(field_names)
+
+    strings = _Table()
+    blobs = _Table()
+    ids = array("i")
+    records = bytearray()
+
+    for item in sorted(all_items.values(), key=lambda x: x["id"]):
+        tags = list()
+        values = list()
+        for field_name in field_names:
+            value = item.get(field_name)
+            if value is None:
+                tags.append(TAG_NONE)
+                values.append(bytes(8))
+            elif value is True or value is False:
+                tags.append(TAG_TRUE if value else TAG_FALSE)
+                values.append(bytes(8))
+            elif isinstance(value, int):
+                tags.append(TAG_INT)
+                values.append(INT64.pack(value))
+            elif isinstance(value, float):
+                tags.append(TAG_FLOAT)
+                values.append(FLOAT64.pack(value))
+            elif isinstance(value, str) and field_name in BASE64_FIELDS:
+                raw = base64.b64decode(value)
+                if base64.b64encode(raw).decode() != value:
+                    raise ValueError(f"Error: Non-canonical base64 value for item {item['id']} {field_name}. Exiting.")
+                tags.append(TAG_BASE64)
+                values.append(blobs.add(raw))
+            elif isinstance(value, str):
+                tags.append(TAG_STRING)
+                values.append(strings.add(value.encode("utf-8")))
+            elif isinstance(value, (dict, list)):
+                tags.append(TAG_JSON)
+                values.append(blobs.add(json.dumps(value, separators=(",", ":")).encode("utf-8")))
+            else:
+                raise ValueError(f"Error: Cannot store item {item['id']} {field_name} in snapshot. Exiting.")
+
+        ids.append(item["id"])
+        records += cell_tags.pack(*tags)
+        records += b"".join(values)
+
+    names = json.dumps(field_names).encode("utf-8")
+    names_offset = HEADER.size
+    ids_offset = names_offset + len(names)
+    records_offset = ids_offset + len(ids) * ids.itemsize
+    strings_offset = records_offset + len(records)
+    blobs_offset = strings_offset + len(strings.data)
+
+    header = HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(field_names), len(ids), record_size,
+                         names_offset, ids_offset, records_offset, strings_offset, blobs_offset)
+
+    with open(path_to_snapshot, "wb") as out_file:
+        out_file.write(header)
+        out_file.write(names)
+        out_file.write(ids.tobytes())
+        out_file.write(records)
+        out_file.write(strings.data)
+        out_file.write(blobs.data)
+
+
+class ItemSnapshot:
+    """Read-only access to an items database snapshot using mmap.
+
+    :param path_to_snapshot: The path to the snapshot file.
+    :raises ValueError: The file is not a valid snapshot for this version of ItemProperties.
+    """
+    def __init__(self, path_to_snapshot: Union[Path, str]):
+        with open(path_to_snapshot, "rb") as input_file:
+            self._buffer = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, field_count, record_count, record_size, names_offset,
+         ids_offset, records_offset, strings_offset, blobs_offset) = HEADER.unpack_from(self._buffer, 0)
+
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("Error: Unsupported items snapshot file. Exiting.")
+
+        self.field_names = json.loads(self._buffer[names_offset:ids_offset].decode("utf-8"))
+        if self.field_names != _field_names():
+            raise ValueError("Error: Items snapshot does not match ItemProperties, regenerate the snapshot. Exiting.")
+
+        self._cell_tags = struct.Struct(f"<{field_count}B")
+        self._record_size = record_size
+        self._records_offset = records_offset
+        self._strings_offset = strings_offset
+        self._blobs_offset = blobs_offset
+
+        self.ids = array("i")
+        self.ids.frombytes(self._buffer[ids_offset:ids_offset + record_count * self.ids.itemsize])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def locations(self) -> Dict[int, int]:
+        """Get the record number for each item ID, in item ID order.
+
+        :return: A dict of item ID to record number.
+        """
+        return dict(zip(self.ids, range(len(self.ids))))
+
+    def decode_json(self, record_number: int, exclude: Tuple[str, ...] = ()) -> Dict:
+        """Decode one record into the same dict that is stored in `items-complete.json`.
+
+        :param record_number: The record number (not the item ID).
+        :param exclude: Names of properties to skip decoding, these are set to None.
+        :return: A dictionary of item properties.
+        """
+        buffer = self._buffer
+        position = self._records_offset + record_number * self._record_size
+        tags = self._cell_tags.unpack_from(buffer, position)
+        position += self._cell_tags.size
+
+        item_json = dict()
+        for field_name, tag in zip(self.field_names, tags):
+            if tag == TAG_NONE or field_name in exclude:
+                value = None
+            elif tag == TAG_FALSE:
+                value = False
+            elif tag == TAG_TRUE:
+                value = True
+            elif tag == TAG_INT:
+                value = INT64.unpack_from(buffer, position)[0]
+            elif tag == TAG_FLOAT:
+                value = FLOAT64.unpack_from(buffer, position)[0]
+            else:
+                offset, length = REFERENCE.unpack_from(buffer, position)
+                if tag == TAG_STRING:
+                    start = self._strings_offset + offset
+                    value = buffer[start:start + length].decode("utf-8")
+                else:
+                    start = self._blobs_offset + offset
+                    value = buffer[start:start + length]
+                    if tag == TAG_JSON:
+                        value = json_codec.loads(value)
+                    else:
+                        value = base64.b64encode(value).decode("ascii")
+            item_json[field_name] = value
+            position += 8
+
+        return item_json
+
+    def decode(self, record_number: int) -> ItemProperties:
+        """Decode one record into an :class:`ItemProperties` object.
+
+        :param record_number: The record number (not the item ID).
+        :return: The ItemProperties object for the record.
+        """
+        return ItemProperties.from_json(self.decode_json(record_number))
+
+    def close(self) -> None:
+        """Close the memory map of the snapshot file."""
+        self._buffer.close()
@@ -22,7 +22,10 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 from dataclasses import dataclass, asdict
 from typing import List, Dict
 
+from osrsbox.dataclass_slots import add_slots
 
+
+@add_slots
 @dataclass
 class ItemWeapon:
     """This class defines the properties for an equipable OSRS item that is a weapon.
@@ -30,12 +30,9 @@ from osrsbox import items_api
 
 
 if __name__ == "__main__":
-    # Load all items
-    all_db_items = items_api.load()
-
-    # Loop through all items and export to CSV file
+    # Loop through all items and export to CSV file, one item at a time
     with open('items.csv', mode="w", newline="") as items_out_fi:
         items_writer = csv.writer(items_out_fi, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
         items_writer.writerow(["ID", "NAME", "HIGHALCH"])
-        for item in all_db_items:
+        for item in items_api.iter_items():
             items_writer.writerow([item.id, item.name, item.highalch])
@@ -0,0 +1,201 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+The JSON codec used to read and write the osrsbox-db JSON files.
+
+Decoding uses the fastest installed JSON library (orjson, pysimdjson or ujson),
+and falls back to the standard library json module when none is installed. Set
+the `OSRSBOX_JSON_BACKEND` environment variable to `orjson`, `simdjson`, `ujson`
+or `json` to choose a backend.
+
+A backend is only used when it decodes floats exactly like the standard library
+json module (see :func:`decodes_floats_exactly`), as the builders decode the
+JSON files and write the decoded values back out. A backend that fails the check
+is skipped when the backend is chosen automatically.
+
+Encoding always uses the standard library json module, so the generated files
+are byte-identical whichever backend is installed (the other libraries format
+floats, spacing and non-ASCII characters differently). The whole document is
+encoded in one call to `json.dumps`, which uses the C encoder for compact output,
+instead of `json.dump`, which always uses the slower pure Python encoder.
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+import importlib
+import json
+import os
+from typing import IO
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Union
+
+# The decoding backends, fastest first
+BACKENDS = ("orjson", "simdjson", "ujson", "json")
+
+# Floats that a backend must decode to the same values as the json module (shortest
+# round trip, rounding boundaries, subnormal, largest and negative zero)
+FLOAT_CHECK_DOCUMENT = ("[0.1, 0.30000000000000004, 1e-07, 123456.789, 2.2250738585072014e-308, "
+                        "5e-324, 1.7976931348623157e+308, 9007199254740993.0, -0.0]")
+
+_backend_name: Optional[str] = None
+_backend_loads: Optional[Callable[[Union[str, bytes]], Any]] = None
+
+
+def _import_backend(name: str) -> Callable[[Union[str, bytes]], Any]:
+    """Import a backend, and get its decode function.
+
+    :param name: The backend name, one of :data:`BACKENDS`.
+    :return: The decode function of the backend.
+    :raises ImportError: The backend is not installed.
+    """
+    if name == "json":
+        return json.loads
+    return importlib.import_module(name).loads
+
+
+def decodes_floats_exactly(backend_loads: Callable[[str], Any]) -> bool:
+    """Check that a decode function gives the same floats as the standard library json module.
+
+    :param backend_loads: The decode function of a backend.
+    :return: True if every float in :data:`FLOAT_CHECK_DOCUMENT` decodes to the same value.
+    """
+    try:
+        decoded = backend_loads(FLOAT_CHECK_DOCUMENT)
+    except ValueError:
+        return False
+    return json.dumps(decoded) == json.dumps(json.loads(FLOAT_CHECK_DOCUMENT))
+
+
+def available_backends() -> List[str]:
+    """Get the names of the installed decoding backends.
+
+    :return: A list of backend names, fastest first.
+    """
+    installed = list()
+    for name in BACKENDS:
+        try:
+            _import_backend(name)
+        except ImportError:
+            continue
+        installed.append(name)
+    return installed
+
+
+def set_backend(name: Optional[str] = None) -> str:
+    """Choose the decoding backend.
+
+    :param name: The backend name, or None for the `OSRSBOX_JSON_BACKEND` environment
+        variable, or the fastest installed backend that decodes floats exactly.
+    :return: The name of the chosen backend.
+    :raises ValueError: Unknown or uninstalled backend, or the backend does not decode floats exactly.
+    """
+    global _backend_name, _backend_loads
+
+    if name is None:
+        name = os.environ.get("OSRSBOX_JSON_BACKEND")
+
+    if name is None:
+        # Try each backend in order, only importing backends until one can be used
+        for name in BACKENDS:
+            try:
+                backend_loads = _import_backend(name)
+            except ImportError:
+                continue
+            if name == "json" or decodes_floats_exactly(backend_loads):
+                break
+    else:
+        if name not in BACKENDS:
+            raise ValueError(f"Error: Unknown JSON backend: {name}. Exiting.")
+        try:
+            backend_loads = _import_backend(name)
+        except ImportError as e:
+            raise ValueError(f"Error: JSON backend is not installed: {name}. Exiting.") from e
+        if name != "json" and not decodes_floats_exactly(backend_loads):
+            raise ValueError(f"Error: JSON backend does not decode floats exactly: {name}. Exiting.")
+
+    _backend_loads = backend_loads
+    _backend_name = name
+    return name
+
+
+def backend() -> str:
+    """Get the name of the decoding backend, choosing it on first use.
+
+    :return: The backend name.
+    """
+    if _backend_name is None:
+        set_backend()
+    return _backend_name
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """Decode a JSON document.
+
+    Documents that the backend rejects, but the standard library accepts (for
+    example, `NaN`, or integers larger than 64 bits), are decoded by the standard
+    library, so every backend gives the same result.
+
+    :param data: The JSON document.
+    :return: The decoded object.
+    :raises ValueError: Invalid JSON document.
+    """
+    if _backend_loads is None:
+        set_backend()
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    if _backend_name == "json":
+        return json.loads(data)
+    try:
+        return _backend_loads(data)
+    except ValueError:
+        return json.loads(data)
+
+
+def load(input_file: IO) -> Any:
+    """Decode a JSON document from a file opened in text or binary mode.
+
+    :param input_file: The open JSON file.
+    :return: The decoded object.
+    :raises ValueError: Invalid JSON document.
+    """
+    return loads(input_file.read())
+
+
+def dumps(obj: Any, indent: Optional[int] = None) -> str:
+    """Encode an object as a JSON document, using the standard library json module.
+
+    :param obj: The object to encode.
+    :param indent: The indent level for pretty output, or None for compact output.
+    :return: The JSON document.
+    """
+    return json.dumps(obj, indent=indent)
+
+
+def dump(obj: Any, out_file: IO[str], indent: Optional[int] = None) -> None:
+    """Encode an object as a JSON document, and write it to a text file.
+
+    The output is byte-identical to `json.dump(obj, out_file, indent=indent)`.
+
+    :param obj: The object to encode.
+    :param out_file: The text file to write to.
+    :param indent: The indent level for pretty output, or None for compact output.
+    """
+    out_file.write(json.dumps(obj, indent=indent))
@@ -0,0 +1,467 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Containers that decode database records the first time they are accessed,
+and a streaming decoder for the records of a complete JSON file.
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+import bisect
+import json
+import mmap
+import re
+from collections import OrderedDict
+from collections.abc import Mapping
+from collections.abc import Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Generator
+from typing import List
+from typing import Optional
+from typing import Pattern
+from typing import Tuple
+from typing import Union
+
+from osrsbox import json_codec
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# The number of characters read at a time when streaming a complete JSON file
+STREAM_CHUNK_SIZE = 1 << 16
+
+# The number of bytes scanned at a time when indexing a complete JSON file
+INDEX_CHUNK_SIZE = 1 << 20
+
+# Every bracket is translated to "{", so the next bracket can be found using bytes.find
+_BRACKETS_TO_BRACE = bytes.maketrans(b"}[]", b"{{{")
+_OPENING_BRACKETS = frozenset(b"{[")
+_BACKSLASH = ord("\\")
+_QUOTE = ord('"')
+_BYTES_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_OBJECT_START = re.compile(rb"[ \t\n\r]*\{")
+_RECORD_KEY = re.compile(rb'[ \t\n\r]*,?[ \t\n\r]*"(-?[0-9]+)"[ \t\n\r]*:[ \t\n\r]*')
+_JSON_SCALAR = re.compile(rb"[^,}\] \t\n\r]*")
+
+
+class LazyRecordDict(Mapping):
+    """A read-only mapping of ID number to record, where records are decoded on demand.
+
+    The mapping only stores where each record is located (for example, a record
+    number in a binary snapshot) until the record is requested. The first lookup
+    decodes the record using the supplied decoder function, and the decoded
+    object is kept so that later lookups return the same object.
+
+    When `max_records` is set, only that many decoded records are kept, and the
+    least recently used record is dropped to make room. A dropped record is
+    decoded again (as a new, equal object) when it is next requested.
+
+    :param locations: A dict of ID number to record location, in ID order.
+    :param decode: A function that converts a record location to a record object.
+    :param max_records: The number of decoded records to keep, or None to keep every record.
+    """
+    def __init__(self, locations: Dict[int, Any], decode: Callable[[Any], Any], max_records: Optional[int] = None):
+        self._locations = locations
+        self._decode = decode
+        self._max_records = max_records
+        self._records: Dict[int, Any] = dict() if max_records is None else OrderedDict()
+
+    def __getitem__(self, id_number: int) -> Any:
+        try:
+            record = self._records[id_number]
+        except KeyError:
+            pass
+        else:
+            if self._max_records is not None:
+                self._records.move_to_end(id_number)
+            return record
+
+        # Raises KeyError when the ID number is not in the database
+        record = self._decode(self._locations[id_number])
+        self._records[id_number] = record
+        if self._max_records is not None and len(self._records) > self._max_records:
+            self._records.popitem(last=False)
+        return record
+
+    def __contains__(self, id_number: object) -> bool:
+        return id_number in self._locations
+
+    def __iter__(self) -> Generator[int, None, None]:
+        for id_number in self._locations:
+            yield id_number
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    @property
+    def decoded_count(self) -> int:
+        """The number of decoded records that are kept."""
+        return len(self._records)
+
+
+class LazyRecordList(Sequence):
+    """A read-only list view, in ID order, over a :class:`LazyRecordDict`.
+
+    :param records: The lazy mapping of ID number to record.
+    """
+    def __init__(self, records: LazyRecordDict):
+        self._records = records
+        self._id_numbers = list(records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._records[id_number] for id_number in self._id_numbers[index]]
+        return self._records[self._id_numbers[index]]
+
+    def __iter__(self) -> Generator[Any, None, None]:
+        for id_number in self._id_numbers:
+            yield self._records[id_number]
+
+    def __len__(self) -> int:
+        return len(self._id_numbers)
+
+
+def _string_state(chunk: bytes, start: int, end: int, in_string: bool, escaped: bool) -> Tuple[bool, bool]:
+    """Find whether the bytes `chunk[start:end]` end inside a JSON string, and after an escape character.
+
+    :return: A tuple of (in string, escaped).
+    """
+    for character in chunk[start:end]:
+        if escaped:
+            escaped = False
+        elif character == _BACKSLASH:
+            escaped = in_string
+        elif character == _QUOTE:
+            in_string = not in_string
+    return in_string, escaped
+
+
+@lru_cache(maxsize=None)
+def _key_pattern(key: str) -> Pattern:
+    """Compile the pattern of an object key, followed by the colon before its value."""
+    return re.compile(rb'"' + re.escape(key.encode()) + rb'"[ \t\n\r]*:[ \t\n\r]*')
+
+
+def _is_escaped(data: bytes, position: int) -> bool:
+    """Check if the character at a position is escaped, which is when it follows an odd number of backslashes."""
+    backslashes = 0
+    while data[position - backslashes - 1] == _BACKSLASH:
+        backslashes += 1
+    return backslashes % 2 == 1
+
+
+def _value_span(record: bytes, key: str, nested: Dict[int, int]) -> Optional[Tuple[int, int]]:
+    """Find the start and end byte offset of the value of a key of a JSON object, without decoding the object.
+
+    Only keys of the object itself are matched, not keys of its nested objects.
+
+    :param record: The bytes of a JSON object.
+    :param key: The key to find.
+    :param nested: The start and end byte offset of every object and array value of the object.
+    :return: The start and end byte offset of the value, or None if the object does not have the key.
+    :raises ValueError: The value is not valid JSON.
+    """
+    nested_starts = list(nested)
+    # A quote cannot appear unescaped inside a JSON string, so every match is a key (or a string value)
+    for match in _key_pattern(key).finditer(record):
+        # The key is inside a nested value when the last value starting before it ends after it
+        index = bisect.bisect(nested_starts, match.start())
+        if index and nested[nested_starts[index - 1]] > match.start():
+            continue
+
+        start = match.end()
+        if record[start:start + 1] in (b"{", b"["):
+            if start in nested:
+                return start, nested[start]
+        elif record[start:start + 1] == b'"':
+            position = record.find(b'"', start + 1)
+            while position != -1 and _is_escaped(record, position):
+                position = record.find(b'"', position + 1)
+            if position != -1:
+                return start, position + 1
+        else:
+            return start, _JSON_SCALAR.match(record, start).end()
+        raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting")
+    return None
+
+
+def _without_value(data: bytes, span: Optional[Tuple[int, int]]) -> bytes:
+    """Replace the value at a span of a JSON object with null, or return the object unchanged when the span is None."""
+    if span is None:
+        return data
+    start, end = span
+    return b"".join((data[:start], b"null", data[end:]))
+
+
+def _decode_records(records: List[bytes], record_callback: Optional[Callable[[Dict], None]]) -> None:
+    """Decode records as one JSON array, pass each record to the record callback, and clear the records."""
+    if records:
+        for record in json_codec.loads(b"[" + b",".join(records) + b"]"):
+            record_callback(record)
+        records.clear()
+
+
+class JsonFileIndex:
+    """A byte offset index of the records in a complete JSON file (for example, `items-complete.json`).
+
+    The complete JSON files are a single object which maps an ID number to a record
+    (a JSON object). The file bytes are scanned once to find where each record starts
+    and ends, without decoding the records, then each record can be decoded on its
+    own using :meth:`decode_json`. The file contents are read through mmap, so only
+    the index is kept in memory.
+
+    :param path_to_json_file: The path to the complete JSON file.
+    :param record_callback: A function called with each decoded record while the file is
+        scanned, in file order, so the file can be indexed and loaded in one pass.
+    :param skip_key: A record key whose value is not decoded for `record_callback` (it is
+        None instead). The byte offsets of the skipped values are kept in
+        :attr:`skipped_locations`, so each value can be decoded on its own later.
+    :raises ValueError: The file is not a JSON object of records.
+    """
+    def __init__(self, path_to_json_file: Union[Path, str], record_callback: Optional[Callable[[Dict], None]] = None,
+                 skip_key: Optional[str] = None):
+        with open(path_to_json_file, "rb") as input_file:
+            self._buffer = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.skipped_locations: Dict[int, Tuple[int, int]] = dict()
+        try:
+            self.locations = self._index_records(record_callback, skip_key)
+        except (IndexError, json.JSONDecodeError) as e:
+            raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting") from e
+
+    def _index_records(self, record_callback: Optional[Callable[[Dict], None]] = None,
+                       skip_key: Optional[str] = None) -> Dict[int, Tuple[int, int]]:
+        """Find the start and end byte offset of every record, sorted by ID number.
+
+        The file is scanned in chunks of :data:`INDEX_CHUNK_SIZE` bytes, tracking the
+        bracket depth to find where each record ends. Brackets are found using
+        `bytes.find`, and the quotes between two brackets are counted to know whether
+        a bracket is inside a string. Only the bytes between two brackets that contain
+        a backslash are checked one at a time, to skip escaped quotes. A record is only
+        decoded when there is a record callback, and the value of `skip_key` is found
+        in the record bytes, so it is never decoded. The records of each chunk are
+        decoded together, as one JSON array, which is faster than decoding each record.
+        """
+        match = _OBJECT_START.match(self._buffer)
+        if match is None:
+            raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting")
+
+        locations = dict()
+        depth = 1
+        in_string = escaped = False
+        record_start = previous_end = match.end()
+        # The offsets of the objects and arrays of the current record, relative to the record
+        nested: Dict[int, int] = dict()
+        nested_start = 0
+        # The records to decode for the record callback, at the end of the chunk
+        records: List[bytes] = list()
+        for offset in range(match.end(), len(self._buffer), INDEX_CHUNK_SIZE):
+            chunk = self._buffer[offset:offset + INDEX_CHUNK_SIZE]
+            brackets = chunk.translate(_BRACKETS_TO_BRACE)
+            next_backslash = chunk.find(b"\\")
+            previous = 0
+            position = brackets.find(b"{")
+            while position != -1:
+                if escaped or -1 < next_backslash < position:
+                    in_string, escaped = _string_state(chunk, previous, position, in_string, escaped)
+                    next_backslash = chunk.find(b"\\", position)
+                elif chunk.count(b'"', previous, position) % 2:
+                    in_string = not in_string
+                previous = position
+
+                if not in_string:
+                    if chunk[position] in _OPENING_BRACKETS:
+                        depth += 1
+                        if depth == 2:
+                            record_start = offset + position
+                            nested = dict()
+                        elif depth == 3:
+                            nested_start = offset + position - record_start
+                    else:
+                        depth -= 1
+                        if depth == 2:
+                            nested[nested_start] = offset + position + 1 - record_start
+                        elif depth == 0:
+                            # Only whitespace can come between the last record and the end of the object
+                            if _BYTES_WHITESPACE.fullmatch(self._buffer[previous_end:offset + position]) is None:
+                                raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting")
+                            _decode_records(records, record_callback)
+                            self.skipped_locations = dict(sorted(self.skipped_locations.items()))
+                            return dict(sorted(locations.items()))
+                        elif depth == 1:
+                            # Only whitespace, a comma and the record key can come between two records
+                            key = _RECORD_KEY.fullmatch(self._buffer[previous_end:record_start])
+                            if key is None:
+                                raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting")
+                            previous_end = offset + position + 1
+                            id_number = int(key.group(1))
+                            locations[id_number] = (record_start, previous_end)
+                            if skip_key is not None:
+                                record = self._buffer[record_start:previous_end]
+                                span = _value_span(record, skip_key, nested)
+                                if span is not None:
+                                    self.skipped_locations[id_number] = (record_start + span[0], record_start + span[1])
+                                if record_callback is not None:
+                                    records.append(_without_value(record, span))
+                            elif record_callback is not None:
+                                records.append(self._buffer[record_start:previous_end])
+
+                position = brackets.find(b"{", position + 1)
+
+            # The rest of the chunk, after the last bracket
+            if escaped or next_backslash != -1:
+                in_string, escaped = _string_state(chunk, previous, len(chunk), in_string, escaped)
+            elif chunk.count(b'"', previous) % 2:
+                in_string = not in_string
+            _decode_records(records, record_callback)
+
+        raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting")
+
+    def decode_json(self, location: Tuple[int, int]) -> Any:
+        """Decode the record stored at a location from :attr:`locations`, or a value from :attr:`skipped_locations`.
+
+        :param location: The start and end byte offset of the record.
+        :return: The decoded record.
+        """
+        start, end = location
+        return json_codec.loads(self._buffer[start:end])
+
+    def close(self) -> None:
+        """Close the memory map of the JSON file."""
+        self._buffer.close()
+
+
+def index_json_directory(path_to_directory: Path) -> Dict[int, Path]:
+    """Index a directory of JSON files named by ID number (for example, `items-json`).
+
+    :param path_to_directory: The path to the directory of JSON files.
+    :return: A dict of ID number to JSON file, sorted by ID number.
+    :raises ValueError: No JSON files found, or a file is not named by ID number.
+    """
+    json_files = dict()
+    for json_file in path_to_directory.glob("*.json"):
+        try:
+            json_files[int(json_file.stem)] = json_file
+        except ValueError as e:
+            raise ValueError(f"Error: JSON file not named by ID number: {json_file.name}. Exiting.") from e
+
+    if not json_files:
+        raise ValueError("Error: No files found in directory, check the supplied path. Exiting.")
+
+    return dict(sorted(json_files.items()))
+
+
+def decode_json_file(path_to_json_file: Path) -> Dict:
+    """Decode one JSON file from a directory indexed by :func:`index_json_directory`.
+
+    :param path_to_json_file: The path to the JSON file.
+    :return: The decoded record.
+    """
+    with open(path_to_json_file) as input_json_file:
+        return json_codec.load(input_json_file)
+
+
+class _JsonTextStream:
+    """A text buffer over a file, which is read in chunks as values are decoded from it.
+
+    Consumed text is dropped from the start of the buffer, so the buffer only
+    holds the value being decoded and at most one extra chunk.
+    """
+    def __init__(self, input_file, chunk_size: int):
+        self._input_file = input_file
+        self._chunk_size = chunk_size
+        self.text = ""
+        self.index = 0
+        self.eof = False
+
+    def _read(self) -> None:
+        if self.index > self._chunk_size:
+            self.text = self.text[self.index:]
+            self.index = 0
+        # Read at least as much as is buffered, so a large value is only decoded a few times
+        chunk = self._input_file.read(max(self._chunk_size, len(self.text) - self.index))
+        if not chunk:
+            self.eof = True
+        self.text += chunk
+
+    def next_character(self) -> str:
+        """Skip whitespace, and get the next character without consuming it."""
+        while True:
+            self.index = _WHITESPACE.match(self.text, self.index).end()
+            if self.index < len(self.text):
+                return self.text[self.index]
+            if self.eof:
+                raise IndexError("Unexpected end of JSON data")
+            self._read()
+
+    def decode(self, decode: Callable[[str, int], Tuple[Any, int]]) -> Any:
+        """Decode the value at the current position, reading more text until the value is complete.
+
+        :param decode: A function that decodes the value starting at an index, and returns the value and end index.
+        :return: The decoded value.
+        """
+        while True:
+            try:
+                value, end = decode(self.text, self.index)
+                # A value that ends with the buffer may be cut short, for example a number
+                if end < len(self.text) or self.eof:
+                    self.index = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._read()
+
+
+def iter_json_records(path_to_json_file: Union[Path, str],
+                      chunk_size: int = STREAM_CHUNK_SIZE) -> Generator[Dict, None, None]:
+    """Decode the records of a complete JSON file (for example, `items-complete.json`) one at a time.
+
+    The file is read in chunks, and each record is yielded as soon as it is decoded,
+    so memory use is bounded by the largest record instead of the file size.
+    Records are yielded in file order.
+
+    :param path_to_json_file: The path to the complete JSON file.
+    :param chunk_size: The number of characters read from the file at a time.
+    :return: A generator of decoded records.
+    :raises ValueError: The file is not a JSON object of records.
+    """
+    decoder = json.JSONDecoder()
+    with open(path_to_json_file, encoding="utf-8") as input_file:
+        stream = _JsonTextStream(input_file, chunk_size)
+        try:
+            if stream.next_character() != "{":
+                raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting")
+            stream.index += 1
+
+            while stream.next_character() != "}":
+                if stream.text[stream.index] != "\"":
+                    raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting")
+                stream.decode(lambda text, index: json.decoder.scanstring(text, index + 1))
+                if stream.next_character() != ":":
+                    raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting")
+                stream.index += 1
+                stream.next_character()
+                yield stream.decode(decoder.raw_decode)
+                if stream.next_character() == ",":
+                    stream.index += 1
+        except (IndexError, json.JSONDecodeError) as e:
+            raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting") from e
@@ -18,12 +18,97 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
-from osrsbox.monsters_api import all_monsters
+from __future__ import annotations
 
+import importlib
+from typing import TYPE_CHECKING
 
-def load() -> all_monsters.AllMonsters:
+from osrsbox.shared_handles import SharedHandle
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any
+    from typing import Generator
+    from typing import List
+    from typing import Union
+
+    from osrsbox.monsters_api.all_monsters import AllMonsters
+    from osrsbox.monsters_api.monster_properties import MonsterProperties
+
+# Submodules are imported the first time they are used (for example, `monsters_api.all_monsters`),
+# so importing the monsters_api package does not load the monsters database modules
+_SUBMODULES = (
+    "all_monsters",
+    "drop_columns",
+    "drop_simulator",
+    "drop_store",
+    "monster_drop",
+    "monster_properties",
+)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_SUBMODULES))
+
+
+def _load_monsters(path: str) -> AllMonsters:
+    from osrsbox.monsters_api.all_monsters import AllMonsters
+    return AllMonsters(path)
+
+
+def _default_path() -> Path:
+    from osrsbox.monsters_api.all_monsters import default_monsters_path
+    return default_monsters_path()
+
+
+_shared_monsters = SharedHandle(_load_monsters, _default_path)
+
+
+def load(path: Union[Path, str, None] = None) -> AllMonsters:
     """Load the osrsbox monster database.
 
+    The database is loaded once, and the same object is returned by later calls
+    for the same path, until the source file changes or `reload()` or
+    `invalidate()` is called. Treat the returned object as read-only, as it is
+    shared by every caller in the process.
+
+    :param path: The monsters database file or folder, or None for the default database.
+    :return: An AllMonsters object containing the entire monster database.
+    """
+    return _shared_monsters.get(path)
+
+
+def reload(path: Union[Path, str, None] = None) -> AllMonsters:
+    """Load the osrsbox monster database again, and replace the shared object returned by `load()`.
+
+    :param path: The monsters database file or folder, or None for the default database.
     :return: An AllMonsters object containing the entire monster database.
     """
-    return all_monsters.AllMonsters()
+    return _shared_monsters.reload(path)
+
+
+def invalidate(path: Union[Path, str, None] = None) -> None:
+    """Drop the shared monsters database, so the next call to `load()` loads it again.
+
+    :param path: The monsters database file or folder, or None to drop every shared monsters database.
+    """
+    _shared_monsters.invalidate(path)
+
+
+def iter_monsters(path: Union[Path, str, None] = None) -> Generator[MonsterProperties, None, None]:
+    """Iterate over the monster database one monster at a time, without loading the whole database.
+
+    Unlike `load()`, nothing is shared or kept in memory after each monster is yielded,
+    so use this for a single pass over every monster (for example, exporting to CSV).
+
+    :param path: The monsters database file or folder, or None for the default database.
+    :return: A generator of MonsterProperties objects.
+    """
+    from osrsbox.monsters_api.all_monsters import iter_monsters as _iter_monsters
+    return _iter_monsters(path)
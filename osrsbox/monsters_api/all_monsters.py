@@ -18,31 +18,144 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
-import json
+import time
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Tuple
 from typing import Union
 from typing import Generator
+from typing import Mapping
 
+from osrsbox import instrumentation
+from osrsbox import json_codec
+from osrsbox.monsters_api.drop_store import DirectoryDropStore
+from osrsbox.monsters_api.drop_store import DropStore
+from osrsbox.monsters_api.drop_store import FileDropStore
+from osrsbox.monsters_api.drop_store import LazyDropMonsterProperties
+from osrsbox.monsters_api.monster_drop import MonsterDrop
 from osrsbox.monsters_api.monster_properties import MonsterProperties
+from osrsbox.lazy_records import JsonFileIndex
+from osrsbox.lazy_records import LazyRecordDict
+from osrsbox.lazy_records import LazyRecordList
+from osrsbox.lazy_records import decode_json_file
+from osrsbox.lazy_records import index_json_directory
+from osrsbox.lazy_records import iter_json_records
 
-PATH_TO_MONSTERS_COMPLETE = Path(__file__).absolute().parent / ".." / ".." / "docs" / "monsters-complete.json"
-if not PATH_TO_MONSTERS_COMPLETE.is_file():
-    PATH_TO_MONSTERS_COMPLETE = Path(__file__).absolute().parent / ".." / "docs" / "monsters-complete.json"
-    if not PATH_TO_MONSTERS_COMPLETE.is_file():
-        raise ValueError("Error: Default monsters database file not found. Exiting")
+if TYPE_CHECKING:
+    import numpy as np
+
+    from osrsbox.items_api.all_items import AllItems
+    from osrsbox.monsters_api.drop_columns import DropColumns
+    from osrsbox.monsters_api.drop_simulator import DropSimulator
+    from osrsbox.query import Query
+    from osrsbox.query import QueryEngine
+    from osrsbox.shared_database import SharedDatabase
+    from osrsbox.text_search import BKTree
+
+# The number of item value arrays with a cached expected value per kill
+EXPECTED_VALUE_CACHE_SIZE = 8
+
+
+@lru_cache(maxsize=None)
+def default_monsters_path() -> Path:
+    """Find the default monsters database file, `monsters-complete.json`.
+
+    The file is searched for the first time it is needed, instead of when the
+    module is imported.
+
+    :return: The path to the `monsters-complete.json` file.
+    :raises ValueError: Default monsters database file not found.
+    """
+    path_to_monsters_complete = Path(__file__).absolute().parent / ".." / ".." / "docs" / "monsters-complete.json"
+    if not path_to_monsters_complete.is_file():
+        path_to_monsters_complete = Path(__file__).absolute().parent / ".." / "docs" / "monsters-complete.json"
+        if not path_to_monsters_complete.is_file():
+            raise ValueError("Error: Default monsters database file not found. Exiting")
+    return path_to_monsters_complete
+
+
+def __getattr__(name: str) -> Any:
+    # The default database path is only found when it is first used
+    if name == "PATH_TO_MONSTERS_COMPLETE":
+        return default_monsters_path()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def iter_monsters(input_data_file_or_directory: Union[Path, str, None] = None) -> Generator[MonsterProperties, None, None]:
+    """Decode the monsters database one monster at a time, without loading the whole database.
+
+    Use this instead of :class:`AllMonsters` for a single pass over every monster,
+    as only the current monster (and its drops) is kept in memory. Monsters are
+    yielded in file order for a JSON file, and monster ID order for a folder of
+    JSON files.
+
+    :param input_data_file_or_directory: The osrsbox-db monsters folder of JSON files, or single JSON file.
+        Defaults to the `monsters-complete.json` file in the package.
+    :return: A generator of MonsterProperties objects.
+    :raises ValueError: Valid input not found, or cannot populate a monster.
+    """
+    if input_data_file_or_directory is None:
+        input_data_file_or_directory = default_monsters_path()
+    input_data_file_or_directory = Path(input_data_file_or_directory)
+
+    if input_data_file_or_directory.is_dir():
+        json_files = index_json_directory(input_data_file_or_directory)
+        all_monster_json = (decode_json_file(json_file) for json_file in json_files.values())
+    elif input_data_file_or_directory.is_file():
+        all_monster_json = iter_json_records(input_data_file_or_directory)
+    else:
+        raise ValueError("Error: Valid input not found. Exiting.")
+
+    for monster_json in all_monster_json:
+        try:
+            monster = MonsterProperties.from_json(monster_json)
+        except TypeError as e:
+            raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting") from e
+        yield monster
 
 
 class AllMonsters:
     """This class handles loading of the osrsbox-db monsters database.
 
     :param input_data_file_or_directory: The osrsbox-db monsters folder of JSON files, or single JSON file.
+        Defaults to the `monsters-complete.json` file in the package.
+    :param lazy: Decode each monster the first time it is accessed, instead of at load time.
+    :param workers: The number of pool workers used to load a folder of JSON files, or None to load serially.
+    :param use_processes: Use a process pool when loading with workers, or False to use a thread pool.
+    :param use_cache: Load the built monsters from the warm-start cache (see :mod:`osrsbox.warm_cache`)
+        when it matches the JSON data, and save them to the cache otherwise.
+    :param lazy_drops: Build each monster without its drops, and decode the drops from `drop_store`
+        the first time the `drops` property is accessed.
+    :param shared_database: Attach to monsters published by :meth:`publish_shared_database` (a
+        SharedDatabase, or the name of its shared memory block), instead of loading the data input.
     """
-    def __init__(self, input_data_file_or_directory: Path = PATH_TO_MONSTERS_COMPLETE):
+    def __init__(self, input_data_file_or_directory: Optional[Path] = None, lazy: bool = False,
+                 workers: Optional[int] = None, use_processes: bool = True, use_cache: bool = False,
+                 shared_database: Union["SharedDatabase", str, None] = None, lazy_drops: bool = False):
         self.all_monsters: List[MonsterProperties] = list()
         self.all_monsters_dict: Dict[int, MonsterProperties] = dict()
-        self.load_all_monsters(input_data_file_or_directory)
+        self.drop_store: Optional[DropStore] = None
+        self.shared_database: Optional["SharedDatabase"] = None
+        self.load_time: float = 0.0
+        self._name_indexes: Dict[str, Dict[str, List[MonsterProperties]]] = dict()
+        self._fuzzy_indexes: Dict[str, "BKTree"] = dict()
+        self._query_engine: Optional["QueryEngine"] = None
+        self._drop_indexes: Dict[str, Dict[Any, Tuple[Tuple[int, MonsterDrop], ...]]] = dict()
+        self._drop_columns: Optional["DropColumns"] = None
+        self._drop_simulator: Optional["DropSimulator"] = None
+        self._expected_values: Dict[int, Tuple["np.ndarray", Dict[int, float]]] = dict()
+        if shared_database is not None:
+            self.attach_shared_database(shared_database)
+            return
+        if input_data_file_or_directory is None:
+            input_data_file_or_directory = default_monsters_path()
+        self.load_all_monsters(input_data_file_or_directory, lazy=lazy, workers=workers, use_processes=use_processes,
+                               use_cache=use_cache, lazy_drops=lazy_drops)
 
     def __iter__(self) -> Generator[MonsterProperties, None, None]:
         """Iterate (loop) over each MonsterProperties object."""
@@ -64,33 +177,342 @@ class AllMonsters:
         """
         return len(self.all_monsters)
 
-    def load_all_monsters(self, input_data_file_or_directory: Union[Path, str]) -> None:
+    def fuzzy_search_monster_names(self, query: str, limit: int = 10, max_distance: int = 2,
+                                   use_wiki_name: bool = False) -> List[MonsterProperties]:
+        """Search for the monster names closest to a (possibly misspelt) query.
+
+        Monster names are ranked by edit distance to the query, closest first, then
+        alphabetically. Every monster that shares a name (for example, different
+        combat levels) is treated as one match, and the first instance (lowest
+        monster ID) is returned. The search uses a BK-tree of case folded monster
+        names that is built on the first search.
+
+        :param query: The monster name to search for.
+        :param limit: The maximum number of monsters to return.
+        :param max_distance: The maximum edit distance between the query and a monster name.
+        :param use_wiki_name: Whether to use the `wiki_name` instead of `name`.
+        :return: A list of MonsterProperties objects, closest match first.
+        """
+        # Set the property value
+        lookup_property = "name"
+        if use_wiki_name:
+            lookup_property = "wiki_name"
+
+        name_index = self._name_index(lookup_property)
+        if lookup_property not in self._fuzzy_indexes:
+            from osrsbox.text_search import BKTree
+            self._fuzzy_indexes[lookup_property] = BKTree(name_index)
+
+        matches = self._fuzzy_indexes[lookup_property].nearest(query.casefold(), limit, max_distance)
+        return [name_index[name][0] for _, name in matches]
+
+    def query(self, **conditions) -> "Query":
+        """Query monsters using conditions on monster properties.
+
+        For example, `all_db_monsters.query(slayer_monster=True, combat_level__lte=50).order_by("-slayer_xp")`.
+        See :meth:`osrsbox.query.Query.filter` for the condition syntax, and use `explain()`
+        on the returned query to see which index the query uses.
+
+        :return: A Query object, which can be iterated to get the matching MonsterProperties objects.
+        """
+        if self._query_engine is None:
+            from osrsbox.query import QueryEngine
+            from osrsbox.query import fields_from_dataclass
+            self._query_engine = QueryEngine(self.all_monsters, fields_from_dataclass(MonsterProperties))
+        return self._query_engine.query(**conditions)
+
+    def lookup_drops_by_item_id(self, item_id_number: int, rarest_first: bool = False) -> List[Tuple[int, MonsterDrop]]:
+        """Find every monster that drops an item.
+
+        The drops are looked up in an index of every drop by item ID, which is built
+        on first use (this decodes every monster, when monsters are loaded lazily).
+
+        :param item_id_number: The item ID number of the drop.
+        :param rarest_first: Sort the drops from the rarest, instead of the most common.
+        :return: A list of (monster ID, MonsterDrop) pairs, sorted by drop rarity then monster ID.
+        """
+        return self._sorted_drops(self._drop_index("id").get(item_id_number, ()), rarest_first)
+
+    def lookup_drops_by_item_name(self, item_name: str, rarest_first: bool = False) -> List[Tuple[int, MonsterDrop]]:
+        """Find every monster that drops an item, using the case insensitive item name.
+
+        :param item_name: The item name of the drop, for example `Prayer potion(4)`.
+        :param rarest_first: Sort the drops from the rarest, instead of the most common.
+        :return: A list of (monster ID, MonsterDrop) pairs, sorted by drop rarity then monster ID.
+        """
+        return self._sorted_drops(self._drop_index("name").get(item_name.casefold(), ()), rarest_first)
+
+    @staticmethod
+    def _sorted_drops(drops: Tuple[Tuple[int, MonsterDrop], ...], rarest_first: bool) -> List[Tuple[int, MonsterDrop]]:
+        """Copy drops from the drop index, which are stored from the most common."""
+        if not rarest_first:
+            return list(drops)
+        return sorted(drops, key=lambda entry: (entry[1].probability or 0.0, entry[0]))
+
+    @property
+    def drop_columns(self) -> "DropColumns":
+        """A NumPy columnar view of the drops of every monster.
+
+        The view is built on first access, and requires NumPy to be installed.
+        See :class:`osrsbox.monsters_api.drop_columns.DropColumns`.
+
+        :return: A DropColumns object.
+        """
+        if self._drop_columns is None:
+            from osrsbox.monsters_api.drop_columns import DropColumns
+            self._drop_columns = DropColumns(self.all_monsters)
+        return self._drop_columns
+
+    @property
+    def drop_simulator(self) -> "DropSimulator":
+        """A Monte Carlo simulator of monster kills, which compiles each drop table on first use.
+
+        Requires NumPy to be installed. See :class:`osrsbox.monsters_api.drop_simulator.DropSimulator`.
+
+        :return: A DropSimulator object.
+        """
+        if self._drop_simulator is None:
+            from osrsbox.monsters_api.drop_simulator import DropSimulator
+            self._drop_simulator = DropSimulator(self.all_monsters_dict)
+        return self._drop_simulator
+
+    def expected_value_per_kill(self, item_values: Union["AllItems", Mapping[int, float], "np.ndarray"],
+                                value_property: str = "highalch") -> Dict[int, float]:
+        """Calculate the expected value of the drops of one kill, for every monster with drops.
+
+        Every monster is calculated in one NumPy pass over :attr:`drop_columns`. The
+        item values can come from the items database (for example, the `highalch`
+        value), a dict of item ID to price (for example, from a local price file),
+        or an array indexed by item ID. Noted drops are valued as the unnoted item,
+        and drops with a quantity range use the mean quantity.
+
+        The result for an items database, or an array, is cached until the monsters
+        or items are loaded again, so do not modify an array after passing it.
+
+        :param item_values: An AllItems object, a dict of item ID to value, or an array of values indexed by item ID.
+        :param value_property: The item property used as the value, when `item_values` is an AllItems object.
+        :return: A dict of monster ID to expected value per kill, monsters without drops are not included.
+        """
+        import numpy as np
+        if isinstance(item_values, Mapping):
+            # A dict is converted on every call, so its result is not cached
+            values = np.zeros(max(item_values, default=-1) + 1, dtype=np.float64)
+            values[list(item_values)] = list(item_values.values())
+            return self._expected_value_per_kill(values)
+
+        if hasattr(item_values, "item_values"):
+            item_values = item_values.item_values(value_property)
+
+        # Cache by array identity, AllItems returns the same array until the items are loaded again
+        cached = self._expected_values.get(id(item_values))
+        if cached is not None and cached[0] is item_values:
+            return cached[1]
+        result = self._expected_value_per_kill(np.asarray(item_values, dtype=np.float64))
+        if len(self._expected_values) >= EXPECTED_VALUE_CACHE_SIZE:
+            del self._expected_values[next(iter(self._expected_values))]
+        self._expected_values[id(item_values)] = (item_values, result)
+        return result
+
+    def _expected_value_per_kill(self, item_values: "np.ndarray") -> Dict[int, float]:
+        """Calculate the expected value per kill of every monster with drops, from an array of item values."""
+        drop_columns = self.drop_columns
+        expected_values = drop_columns.expected_values(item_values)
+        return dict(zip(drop_columns.monster_ids.tolist(), expected_values.tolist()))
+
+    def _drop_index(self, lookup_property: str) -> Dict[Any, Tuple[Tuple[int, MonsterDrop], ...]]:
+        """Get the drop index by item ID (`id`) or case folded item name (`name`), building both on first use.
+
+        Each entry is sorted from the most common drop, then by monster ID. Drops
+        without a valid rarity are sorted as the rarest.
+
+        :param lookup_property: The drop property to index, either `id` or `name`.
+        :return: A dict of item ID or name to a tuple of (monster ID, MonsterDrop) pairs.
+        """
+        try:
+            return self._drop_indexes[lookup_property]
+        except KeyError:
+            pass
+
+        # Sort every drop once (monsters are in ID order, and the sort is stable),
+        # then grouping the sorted drops keeps each entry in order
+        entries = [(monster.id, drop) for monster in self.all_monsters for drop in monster.drops or ()]
+        entries.sort(key=lambda entry: -(entry[1].probability or 0.0))
+
+        drops_by_id = dict()
+        drops_by_name = dict()
+        for entry in entries:
+            drop = entry[1]
+            drops_by_id.setdefault(drop.id, list()).append(entry)
+            if drop.name:
+                drops_by_name.setdefault(drop.name.casefold(), list()).append(entry)
+
+        self._drop_indexes["id"] = {item_id: tuple(drops) for item_id, drops in drops_by_id.items()}
+        self._drop_indexes["name"] = {item_name: tuple(drops) for item_name, drops in drops_by_name.items()}
+        return self._drop_indexes[lookup_property]
+
+    def _name_index(self, lookup_property: str) -> Dict[str, List[MonsterProperties]]:
+        """Get the case folded name index for a property, building it on first use.
+
+        :param lookup_property: The monster property to index, either `name` or `wiki_name`.
+        :return: A dict of case folded name to a list of monsters, sorted by monster ID.
+        """
+        try:
+            return self._name_indexes[lookup_property]
+        except KeyError:
+            pass
+
+        name_index = dict()
+        for monster in self.all_monsters:
+            name_value = getattr(monster, lookup_property)
+            if not name_value:
+                continue
+            name_index.setdefault(name_value.casefold(), list()).append(monster)
+
+        self._name_indexes[lookup_property] = name_index
+        return name_index
+
+    @instrumentation.instrumented("AllMonsters.load_all_monsters")
+    def load_all_monsters(self, input_data_file_or_directory: Union[Path, str], lazy: bool = False,
+                          workers: Optional[int] = None, use_processes: bool = True, use_cache: bool = False,
+                          lazy_drops: bool = False) -> None:
         """Load the monsters database via a JSON file, or directory of JSON files.
 
+        When `lazy_drops` is set, the drops of each monster are decoded from the data
+        input the first time they are accessed, so the data input must not be changed
+        or removed while the monsters are in use. Building the drop index, drop columns
+        or a drop table decodes the drops of every monster it uses.
+
         :param input_data_file_or_directory: The path to the data input.
+        :param lazy: Only index the JSON data, and decode each monster the first time it is accessed.
+        :param workers: The number of pool workers used to load a folder of JSON files, or None to load serially.
+        :param use_processes: Use a process pool when loading with workers, or False to use a thread pool.
+        :param use_cache: Use the warm-start cache, when eagerly loading monsters with drops from JSON.
+        :param lazy_drops: Build each monster without its drops, and decode the drops on first access.
         :raises ValueError: Valid input not found.
         """
+        start_time = time.perf_counter()
+
         # Check if a str is supplied, if so, convert to Path object
         if isinstance(input_data_file_or_directory, str):
             input_data_file_or_directory = Path(input_data_file_or_directory)
 
+        # Drops are only fetched from a drop store when the drops are decoded on first access
+        self.drop_store = None
+
+        # Check the warm-start cache, only when the whole database is built from JSON data
+        path_to_cache_file = None
+        cached_monsters = None
+        if (use_cache and not lazy and not lazy_drops and not len(self.all_monsters)
+                and input_data_file_or_directory.exists()):
+            from osrsbox import warm_cache
+            with instrumentation.phase("cache_read"):
+                path_to_cache_file = warm_cache.cache_file_path("monsters", input_data_file_or_directory,
+                                                                MonsterProperties)
+                cached_monsters = warm_cache.read_cache(path_to_cache_file)
+
         # Process the directory of JSON, or a single JSON file
-        if input_data_file_or_directory.is_dir():
-            self._load_monsters_from_directory(path_to_directory=input_data_file_or_directory)
+        if cached_monsters is not None:
+            self.all_monsters = cached_monsters
+            self.all_monsters_dict = {monster.id: monster for monster in cached_monsters}
+        elif lazy and input_data_file_or_directory.is_dir():
+            self._index_monsters_from_directory(path_to_directory=input_data_file_or_directory, lazy_drops=lazy_drops)
+        elif workers and input_data_file_or_directory.is_dir():
+            self._load_monsters_from_directory_parallel(path_to_directory=input_data_file_or_directory,
+                                                        workers=workers, use_processes=use_processes,
+                                                        lazy_drops=lazy_drops)
+        elif input_data_file_or_directory.is_dir():
+            self._load_monsters_from_directory(path_to_directory=input_data_file_or_directory, lazy_drops=lazy_drops)
+        elif lazy and input_data_file_or_directory.is_file():
+            self._index_monsters_from_file(path_to_json_file=input_data_file_or_directory, lazy_drops=lazy_drops)
+        elif lazy_drops and input_data_file_or_directory.is_file():
+            self._load_monsters_from_file_without_drops(path_to_json_file=input_data_file_or_directory)
         elif input_data_file_or_directory.is_file():
             self._load_monsters_from_file(path_to_json_file=input_data_file_or_directory)
         else:
             raise ValueError("Error: Valid input not found. Exiting.")
 
-        # Sort the list of monsters
-        self.all_monsters.sort(key=lambda x: x.id)
+        # Sort the list of monsters, lazily loaded monsters are already indexed in monster ID order
+        if isinstance(self.all_monsters, list):
+            with instrumentation.phase("sort"):
+                self.all_monsters.sort(key=lambda x: x.id)
+
+        # Save the built monsters, so the next load can skip the JSON data
+        if path_to_cache_file is not None and cached_monsters is None:
+            with instrumentation.phase("cache_write"):
+                warm_cache.write_cache(path_to_cache_file, self.all_monsters)
+
+        self._reset_indexes()
 
-    def _load_monsters_from_directory(self, path_to_directory: Path) -> None:
+        self.load_time = time.perf_counter() - start_time
+
+    def _reset_indexes(self) -> None:
+        """Drop any indexes built from previously loaded monsters."""
+        self._name_indexes = dict()
+        self._fuzzy_indexes = dict()
+        self._query_engine = None
+        self._drop_indexes = dict()
+        self._drop_columns = None
+        self._drop_simulator = None
+        self._expected_values = dict()
+
+    def publish_shared_database(self, name: Optional[str] = None) -> "SharedDatabase":
+        """Publish the loaded monsters to shared memory, so other processes can use them without loading the database.
+
+        Other processes attach using `AllMonsters(shared_database=name)`. The shared memory is
+        removed when this process exits, or when `unlink()` is called on the returned object.
+
+        :param name: The name of the shared memory block, or None for a random name.
+        :return: The shared database, with the shared memory block name in its `name` attribute.
+        """
+        from osrsbox.shared_database import SharedDatabase
+        return SharedDatabase.publish((monster.construct_json() for monster in self.all_monsters), name=name)
+
+    @instrumentation.instrumented("AllMonsters.attach_shared_database")
+    def attach_shared_database(self, shared_database: Union["SharedDatabase", str],
+                               cache_size: Optional[int] = 1024) -> None:
+        """Load the monsters from a shared database, without copying the database into this process.
+
+        Each monster is decoded from the shared buffer when it is accessed. This process
+        only keeps the monster ID index and the `cache_size` most recently used monsters,
+        so its memory use stays close to the size of the index, and other monsters are
+        decoded again when they are next used. Building a name or query index decodes
+        every monster, and the index keeps the monsters it holds.
+
+        :param shared_database: A SharedDatabase (for example, from `SharedDatabase.open_file`),
+            or the name of a shared memory block published by :meth:`publish_shared_database`.
+        :param cache_size: The number of decoded monsters kept by this process, or None to keep
+            every decoded monster, which grows toward a full copy of the database as monsters are used.
+        :raises ValueError: Not a valid shared database.
+        """
+        start_time = time.perf_counter()
+
+        if isinstance(shared_database, str):
+            from osrsbox.shared_database import SharedDatabase
+            shared_database = SharedDatabase.attach(shared_database)
+
+        self.shared_database = shared_database
+        self.drop_store = None
+        with instrumentation.phase("index"):
+            locations = shared_database.locations()
+        self.all_monsters_dict = LazyRecordDict(locations,
+                                                lambda record: self._build_monster(shared_database.decode_json(record)),
+                                                max_records=cache_size)
+        self.all_monsters = LazyRecordList(self.all_monsters_dict)
+        self._reset_indexes()
+
+        self.load_time = time.perf_counter() - start_time
+
+    def _load_monsters_from_directory(self, path_to_directory: Path, lazy_drops: bool = False) -> None:
         """Load monster database from a directory of JSON files (`monsters-json`).
 
         :param path_to_directory: The path to the `monsters-json` directory.
+        :param lazy_drops: Build each monster without its drops, and decode the drops on first access.
         :raises ValueError: No JSON files found in supplied directory.
         """
+        if lazy_drops:
+            with instrumentation.phase("index"):
+                self.drop_store = DirectoryDropStore(index_json_directory(path_to_directory))
+
         # Fetch all .json files in provided dir
         json_files = list(path_to_directory.glob("*.json"))
 
@@ -101,34 +523,120 @@ class AllMonsters:
 
         # Loop through every monster in JSON file
         for json_file in json_files:
-            with open(json_file) as input_json_file:
-                temp = json.load(input_json_file)
+            with instrumentation.phase("read_decode"):
+                with open(json_file) as input_json_file:
+                    temp = json_codec.load(input_json_file)
+
+            with instrumentation.phase("build"):
+                self._load_monster(temp)
 
-            self._load_monster(temp)
+    def _load_monsters_from_directory_parallel(self, path_to_directory: Path, workers: int, use_processes: bool,
+                                               lazy_drops: bool = False) -> None:
+        """Load monster database from a directory of JSON files (`monsters-json`) using a pool of workers.
+
+        The JSON files are decoded in chunks by a process (or thread) pool, in monster ID
+        order, and each chunk is built as soon as it is decoded, while the pool decodes
+        the next chunks. The result is the same as :meth:`_load_monsters_from_directory`.
+
+        :param path_to_directory: The path to the `monsters-json` directory.
+        :param workers: The number of pool workers.
+        :param use_processes: Use a process pool, or False to use a thread pool.
+        :param lazy_drops: Build each monster without its drops, and decode the drops on first access.
+        """
+        from osrsbox.parallel_loading import load_json_directory
+        if lazy_drops:
+            with instrumentation.phase("index"):
+                self.drop_store = DirectoryDropStore(index_json_directory(path_to_directory))
+        for chunk in load_json_directory(path_to_directory, workers=workers, use_processes=use_processes):
+            with instrumentation.phase("build"):
+                for monster_json in chunk:
+                    self._load_monster(monster_json)
 
     def _load_monsters_from_file(self, path_to_json_file: Path) -> None:
         """Load monster database from a single JSON file (`monster-complete.json`).
 
         :param path_to_json_file: The path to the `monster-complete.json` file.
         """
-        with open(path_to_json_file) as input_json_file:
-            temp = json.load(input_json_file)
+        with instrumentation.phase("read"):
+            with open(path_to_json_file, "rb") as input_json_file:
+                data = input_json_file.read()
 
-        for entry in temp:
-            self._load_monster(temp[entry])
+        with instrumentation.phase("decode"):
+            temp = json_codec.loads(data)
+        del data
 
-    def _load_monster(self, monster_json: Dict) -> None:
-        """Convert the `monster_json` into a :class:`MonsterProperties` and store it.
+        with instrumentation.phase("build"):
+            for entry in temp:
+                self._load_monster(temp[entry])
+
+    def _load_monsters_from_file_without_drops(self, path_to_json_file: Path) -> None:
+        """Load monster database from a single JSON file (`monster-complete.json`), without the monster drops.
+
+        The file is scanned once, to index the byte offset of each monster and of its
+        drops, and to decode each monster without its drops. The drops of a monster are
+        only decoded, from the byte offset index, when they are first accessed.
+
+        :param path_to_json_file: The path to the `monster-complete.json` file.
+        """
+        monsters_json = list()
+
+        # Monsters are decoded while the file is indexed, so indexing and decoding are timed together
+        with instrumentation.phase("index_decode"):
+            json_index = JsonFileIndex(path_to_json_file, record_callback=monsters_json.append, skip_key="drops")
+        self.drop_store = FileDropStore(json_index)
+
+        with instrumentation.phase("build"):
+            for monster_json in monsters_json:
+                self._load_monster(monster_json)
+
+    def _index_monsters_from_directory(self, path_to_directory: Path, lazy_drops: bool = False) -> None:
+        """Index monster database JSON files by monster ID, and decode each monster on first access.
+
+        :param path_to_directory: The path to the `monsters-json` directory.
+        :param lazy_drops: Decode the drops of each monster when they are first accessed, not with the monster.
+        """
+        with instrumentation.phase("index"):
+            json_files = index_json_directory(path_to_directory)
+        if lazy_drops:
+            self.drop_store = DirectoryDropStore(json_files)
+        self.all_monsters_dict = LazyRecordDict(json_files, lambda json_file: self._build_monster(decode_json_file(json_file)))
+        self.all_monsters = LazyRecordList(self.all_monsters_dict)
+
+    def _index_monsters_from_file(self, path_to_json_file: Path, lazy_drops: bool = False) -> None:
+        """Index the byte offset of each monster in a single JSON file, and decode each monster on first access.
+
+        :param path_to_json_file: The path to the `monsters-complete.json` file.
+        :param lazy_drops: Decode the drops of each monster when they are first accessed, not with the monster.
+        """
+        with instrumentation.phase("index"):
+            json_index = JsonFileIndex(path_to_json_file)
+        if lazy_drops:
+            self.drop_store = FileDropStore(json_index)
+        self.all_monsters_dict = LazyRecordDict(json_index.locations, lambda location: self._build_monster(json_index.decode_json(location)))
+        self.all_monsters = LazyRecordList(self.all_monsters_dict)
+
+    def _build_monster(self, monster_json: Dict) -> MonsterProperties:
+        """Convert the `monster_json` into a :class:`MonsterProperties`.
 
         :param monster_json: A dict from an open and loaded JSON file.
         :raises ValueError: Cannot populate monster.
         """
-        # Load the monster using the MonsterProperties class
         try:
-            monster_def = MonsterProperties.from_json(monster_json)
+            if self.drop_store is not None:
+                return LazyDropMonsterProperties.from_drop_store(monster_json, self.drop_store)
+            return MonsterProperties.from_json(monster_json)
         except TypeError as e:
             raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting") from e
 
+    def _load_monster(self, monster_json: Dict) -> None:
+        """Convert the `monster_json` into a :class:`MonsterProperties` and store it.
+
+        :param monster_json: A dict from an open and loaded JSON file.
+        :raises ValueError: Cannot populate monster.
+        """
+        # Load the monster using the MonsterProperties class
+        monster_def = self._build_monster(monster_json)
+
         # Add monsters to list
         self.all_monsters.append(monster_def)
         self.all_monsters_dict[monster_def.id] = monster_def
@@ -0,0 +1,138 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+A NumPy columnar view of the drops of every monster that has drops.
+
+This module requires NumPy, which is an optional dependency of the osrsbox
+package (install using: pip install osrsbox[numpy]).
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+from typing import Dict
+from typing import Iterable
+
+import numpy as np
+
+from osrsbox.monsters_api.monster_drop import MonsterDrop
+from osrsbox.monsters_api.monster_properties import MonsterProperties
+
+
+def _mean_quantity(drop: MonsterDrop) -> float:
+    """Get the mean quantity of a drop, from its list of possible quantities or its quantity range."""
+    if drop.quantities:
+        return sum(drop.quantities) / len(drop.quantities)
+    return ((drop.quantity_min or 0) + (drop.quantity_max or 0)) / 2
+
+
+class DropColumns:
+    """Flat columnar arrays of monster drops, with one row per drop.
+
+    The drops of each monster are stored in consecutive rows, in monster ID order,
+    and `offsets[n]:offsets[n + 1]` are the rows of the monster `monster_ids[n]`.
+    Each column can be accessed by name using `columns["probability"]`:
+
+    - `id`: int32 item ID of the drop
+    - `monster_row`: int32 index of the monster in `monster_ids`
+    - `probability`: float64 drop rarity (NaN when the rarity is invalid)
+    - `quantity_min` and `quantity_max`: int32 quantity range (0 when the quantity is invalid)
+    - `quantity_mean`: float64 mean quantity, of the range or of the list of possible quantities
+    - `noted`: bool, whether the drop is noted
+    - `rolls`: int16 number of times the drop is rolled for each kill
+
+    :param monsters: The monsters to include, monsters without drops are skipped.
+    """
+    def __init__(self, monsters: Iterable[MonsterProperties]):
+        with_drops = [monster for monster in monsters if monster.drops]
+        drops = [drop for monster in with_drops for drop in monster.drops]
+        counts = np.array([len(monster.drops) for monster in with_drops], dtype=np.int64)
+
+        self.monster_ids = np.array([monster.id for monster in with_drops], dtype=np.int32)
+        self.offsets = np.zeros(len(with_drops) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+
+        nan = float("nan")
+        self.columns: Dict[str, np.ndarray] = dict()
+        self.columns["id"] = np.array([drop.id for drop in drops], dtype=np.int32)
+        self.columns["monster_row"] = np.repeat(np.arange(len(with_drops), dtype=np.int32), counts)
+        self.columns["probability"] = np.array([nan if drop.probability is None else drop.probability for drop in drops],
+                                               dtype=np.float64)
+        self.columns["quantity_min"] = np.array([drop.quantity_min or 0 for drop in drops], dtype=np.int32)
+        self.columns["quantity_max"] = np.array([drop.quantity_max or 0 for drop in drops], dtype=np.int32)
+        self.columns["quantity_mean"] = np.array([_mean_quantity(drop) for drop in drops], dtype=np.float64)
+        self.columns["noted"] = np.array([bool(drop.noted) for drop in drops], dtype=bool)
+        self.columns["rolls"] = np.array([drop.rolls or 1 for drop in drops], dtype=np.int16)
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def monster_row(self, monster_id: int) -> int:
+        """Get the index of a monster in `monster_ids`.
+
+        :param monster_id: The monster ID number.
+        :return: The monster index.
+        :raises KeyError: The monster has no drops.
+        """
+        row = int(np.searchsorted(self.monster_ids, monster_id))
+        if row == len(self.monster_ids) or self.monster_ids[row] != monster_id:
+            raise KeyError(f"Cannot find drops for the provided monster ID: {monster_id}")
+        return row
+
+    def monster_drops(self, monster_id: int) -> Dict[str, np.ndarray]:
+        """Get the drop columns of one monster.
+
+        :param monster_id: The monster ID number.
+        :return: A dict of column name to an array (a view, do not modify it), in the monster drop order.
+        :raises KeyError: The monster has no drops.
+        """
+        row = self.monster_row(monster_id)
+        start, end = self.offsets[row], self.offsets[row + 1]
+        return {column: values[start:end] for column, values in self.columns.items()}
+
+    def expected_values(self, item_values: np.ndarray) -> np.ndarray:
+        """Calculate the expected value of the drops of one kill of every monster.
+
+        The value of each drop is its probability, times its rolls, times its mean
+        quantity, times the item value. Drops of items outside the value array, or
+        with an invalid rarity, have no value.
+
+        :param item_values: The value of every item, indexed by item ID (see `AllItems.item_values`).
+        :return: An array of the expected value of a kill, for each monster in `monster_ids`.
+        """
+        item_ids = self.columns["id"]
+        if not len(item_values):
+            return np.zeros(len(self.monster_ids), dtype=np.float64)
+        known = (item_ids >= 0) & (item_ids < len(item_values))
+        drop_values = np.where(known, item_values[np.where(known, item_ids, 0)], 0.0)
+        drop_values = drop_values * np.nan_to_num(self.columns["probability"]) * self.columns["rolls"] \
+            * self.columns["quantity_mean"]
+        return np.bincount(self.columns["monster_row"], weights=drop_values, minlength=len(self.monster_ids))
+
+    def rarest(self, n: int) -> np.ndarray:
+        """Get the rows of the n rarest drops, rarest first. Ties are kept in row order.
+
+        :param n: The number of rows to return.
+        :return: An array of row numbers, use the `id` and `monster_row` columns to find the drop.
+        """
+        probability = self.columns["probability"]
+        rows = np.flatnonzero(~np.isnan(probability))
+        order = np.argsort(probability[rows], kind="stable")[:n]
+        return rows[order]
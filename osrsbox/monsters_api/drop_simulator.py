@@ -0,0 +1,232 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+A Monte Carlo simulator of monster kills, which samples the loot of many kills
+at once using NumPy.
+
+Each monster drop table is compiled once into arrays of drop probability,
+rolls and quantity. A batch of kills is then sampled without looping over the
+kills: the number of times each drop is received is binomial (one trial for
+each roll of each kill), and the quantities of the received drops are sampled
+in bounded chunks. Results are reproducible when a seed is given.
+
+The database stores the rarity of each drop, but not which drops share a drop
+table, so every drop is sampled independently. The expected amount of each item
+is exact, but drops from the same table are not mutually exclusive in the
+simulation, so sample variance is approximate for those items.
+
+This module requires NumPy, which is an optional dependency of the osrsbox
+package (install using: pip install osrsbox[numpy]).
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+
+from osrsbox.monsters_api.monster_drop import MonsterDrop
+from osrsbox.monsters_api.monster_properties import MonsterProperties
+
+# The largest number of quantity values sampled at once, to bound memory use
+SAMPLE_CHUNK_SIZE = 1 << 20
+
+
+class DropTable:
+    """The drop table of one monster, compiled into NumPy arrays.
+
+    Each drop is one row. Drops of the same item share a column of
+    :attr:`item_ids`, which is sorted by item ID.
+
+    :param drops: The drops of the monster.
+    """
+    def __init__(self, drops: Iterable[MonsterDrop]):
+        drops = [drop for drop in drops if drop.probability and drop.quantity_min is not None]
+
+        self.item_ids, self.item_columns = np.unique(np.array([drop.id for drop in drops], dtype=np.int32),
+                                                     return_inverse=True)
+        self.probability = np.clip(np.array([drop.probability for drop in drops], dtype=np.float64), 0.0, 1.0)
+        self.rolls = np.array([drop.rolls or 1 for drop in drops], dtype=np.int64)
+        self.quantity_min = np.array([drop.quantity_min for drop in drops], dtype=np.int64)
+        self.quantity_max = np.array([drop.quantity_max for drop in drops], dtype=np.int64)
+
+        # Drops with a list of possible quantities, each is equally likely
+        self.quantity_choices: Dict[int, np.ndarray] = {
+            row: np.array(drop.quantities, dtype=np.int64)
+            for row, drop in enumerate(drops) if drop.quantities is not None and len(drop.quantities) > 1}
+
+    def __len__(self) -> int:
+        return len(self.probability)
+
+    def expected_quantities(self) -> np.ndarray:
+        """Calculate the expected quantity of each item from one kill.
+
+        :return: An array of the expected quantity of each item in :attr:`item_ids`.
+        """
+        mean_quantity = (self.quantity_min + self.quantity_max) / 2
+        for row, choices in self.quantity_choices.items():
+            mean_quantity[row] = choices.mean()
+        expected = np.zeros(len(self.item_ids), dtype=np.float64)
+        np.add.at(expected, self.item_columns, self.probability * self.rolls * mean_quantity)
+        return expected
+
+
+class SimulationResult:
+    """The loot of a batch of simulated kills, repeated for a number of trials.
+
+    :attr:`totals` holds the total quantity of each item received in each
+    trial, and :attr:`drop_counts` holds the number of times each item was
+    dropped. Both have one row per trial and one column per item in :attr:`item_ids`.
+    """
+    def __init__(self, monster_id: int, kills: int, item_ids: np.ndarray, totals: np.ndarray, drop_counts: np.ndarray):
+        self.monster_id = monster_id
+        self.kills = kills
+        self.item_ids = item_ids
+        self.totals = totals
+        self.drop_counts = drop_counts
+
+    @property
+    def trials(self) -> int:
+        return self.totals.shape[0]
+
+    def _column(self, item_id: int) -> Optional[int]:
+        column = int(np.searchsorted(self.item_ids, item_id))
+        if column == len(self.item_ids) or self.item_ids[column] != item_id:
+            return None
+        return column
+
+    def item_totals(self, item_id: int) -> np.ndarray:
+        """Get the total quantity of an item received in each trial.
+
+        :param item_id: The item ID number.
+        :return: An array with one total per trial (zeros if the monster does not drop the item).
+        """
+        column = self._column(item_id)
+        if column is None:
+            return np.zeros(self.trials, dtype=np.int64)
+        return self.totals[:, column]
+
+    def distribution(self, item_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the distribution of the total quantity of an item received in a trial.
+
+        :param item_id: The item ID number.
+        :return: The distinct totals (sorted), and the number of trials with each total.
+        """
+        return np.unique(self.item_totals(item_id), return_counts=True)
+
+    def mean(self) -> Dict[int, float]:
+        """Get the mean total quantity of each item, over every trial.
+
+        :return: A dict of item ID to mean total quantity.
+        """
+        return dict(zip(self.item_ids.tolist(), self.totals.mean(axis=0).tolist()))
+
+
+class DropSimulator:
+    """Simulate monster kills, compiling the drop table of each monster the first time it is simulated.
+
+    :param monsters: The monsters to simulate, as a dict of monster ID to MonsterProperties.
+    """
+    def __init__(self, monsters: Dict[int, MonsterProperties]):
+        self.monsters = monsters
+        self._drop_tables: Dict[int, DropTable] = dict()
+
+    def drop_table(self, monster_id: int) -> DropTable:
+        """Get the compiled drop table of a monster.
+
+        :param monster_id: The monster ID number.
+        :return: The DropTable of the monster.
+        :raises KeyError: Unknown monster ID.
+        """
+        try:
+            return self._drop_tables[monster_id]
+        except KeyError:
+            pass
+        drop_table = DropTable(self.monsters[monster_id].drops or ())
+        self._drop_tables[monster_id] = drop_table
+        return drop_table
+
+    def simulate(self, monster_id: int, kills: int, trials: int = 1, seed: Optional[int] = None) -> SimulationResult:
+        """Simulate killing a monster a number of times, repeated for a number of trials.
+
+        For example, `simulator.simulate(2, kills=1000, trials=10000, seed=1)` samples
+        the loot of 10,000 trials of 1,000 kills each, so `result.distribution(item_id)`
+        shows how many of an item a player might receive from 1,000 kills.
+
+        :param monster_id: The monster ID number.
+        :param kills: The number of kills in each trial.
+        :param trials: The number of trials.
+        :param seed: The seed of the NumPy random generator, or None for a random seed.
+        :return: A SimulationResult.
+        :raises ValueError: A negative number of kills, or fewer than one trial.
+        :raises KeyError: Unknown monster ID.
+        """
+        if kills < 0 or trials < 1:
+            raise ValueError("Error: Kills must be zero or more, and trials must be one or more. Exiting.")
+        drop_table = self.drop_table(monster_id)
+        rng = np.random.default_rng(seed)
+
+        # The number of times each drop is received in each trial
+        successes = rng.binomial(kills * drop_table.rolls, drop_table.probability, size=(trials, len(drop_table)))
+
+        # Drops with a fixed quantity are not sampled
+        quantities = successes * drop_table.quantity_min
+        for row in np.flatnonzero(drop_table.quantity_max > drop_table.quantity_min):
+            row = int(row)
+            if row in drop_table.quantity_choices:
+                choices = drop_table.quantity_choices[row]
+                quantities[:, row] = _sum_samples(successes[:, row], lambda size: choices[rng.integers(0, len(choices), size)])
+            else:
+                low, high = drop_table.quantity_min[row], drop_table.quantity_max[row]
+                quantities[:, row] = _sum_samples(successes[:, row], lambda size: rng.integers(low, high + 1, size))
+
+        # Add up the drops of the same item
+        totals = np.zeros((len(drop_table.item_ids), trials), dtype=np.int64)
+        drop_counts = np.zeros((len(drop_table.item_ids), trials), dtype=np.int64)
+        np.add.at(totals, drop_table.item_columns, quantities.T)
+        np.add.at(drop_counts, drop_table.item_columns, successes.T)
+        return SimulationResult(monster_id, kills, drop_table.item_ids, totals.T, drop_counts.T)
+
+
+def _sum_samples(counts: np.ndarray, sample: Callable[[int], np.ndarray]) -> np.ndarray:
+    """Add up `counts[n]` samples for each n, sampling at most :data:`SAMPLE_CHUNK_SIZE` values at once.
+
+    The samples of every count are drawn as one stream, and the running total of
+    the stream is read at the end of each count.
+
+    :param counts: The number of samples to add up, for each output value.
+    :param sample: A function that draws an array of a number of samples.
+    :return: An array with the sum of the samples for each count.
+    """
+    ends = np.cumsum(counts)
+    end_totals = np.zeros(len(counts), dtype=np.int64)
+    total_samples = int(ends[-1]) if len(ends) else 0
+    total = 0
+    for start in range(0, total_samples, SAMPLE_CHUNK_SIZE):
+        stop = min(start + SAMPLE_CHUNK_SIZE, total_samples)
+        running = np.cumsum(sample(stop - start), dtype=np.int64) + total
+        total = int(running[-1])
+        # Read the running total at the end of every count that ends in this chunk (a count of
+        # zero ends with the count before it, and counts that end before any sample stay zero)
+        ending = (ends > start) & (ends <= stop)
+        end_totals[ending] = running[ends[ending] - start - 1]
+    return np.diff(end_totals, prepend=0)
@@ -0,0 +1,145 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Stores of monster drops, which decode the drops of a monster from the JSON
+data the first time they are used.
+
+Drops make up most of the monsters database, so monsters loaded with
+`AllMonsters(lazy_drops=True)` are built without their drops, and each
+monster fetches its drops from a drop store when the `drops` property is
+first accessed.
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+from abc import ABC
+from abc import abstractmethod
+from dataclasses import fields
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from osrsbox.lazy_records import JsonFileIndex
+from osrsbox.lazy_records import decode_json_file
+from osrsbox.monsters_api.monster_drop import MonsterDrop
+from osrsbox.monsters_api.monster_properties import MonsterProperties
+
+
+class DropStore(ABC):
+    """Base class for a store of monster drops, looked up by monster ID."""
+    def drops(self, monster_id: int) -> List[MonsterDrop]:
+        """Get the drops of a monster.
+
+        :param monster_id: The monster ID.
+        :return: A list of MonsterDrop objects, empty if the store has no drops for the monster.
+        """
+        return [MonsterDrop(**drop) for drop in self.drops_json(monster_id) or ()]
+
+    @abstractmethod
+    def drops_json(self, monster_id: int) -> Optional[List[Dict]]:
+        """Get the JSON drops of a monster.
+
+        :param monster_id: The monster ID.
+        :return: A list of drop dicts, or None if the store has no drops for the monster.
+        """
+
+
+class DirectoryDropStore(DropStore):
+    """A drop store that reads the `monsters-json` folder of JSON files (named by monster ID).
+
+    :param json_files: A dict of monster ID to JSON file, from `index_json_directory`.
+    """
+    def __init__(self, json_files: Dict[int, Path]):
+        self.json_files = json_files
+
+    def drops_json(self, monster_id: int) -> Optional[List[Dict]]:
+        try:
+            json_file = self.json_files[monster_id]
+        except KeyError:
+            return None
+        return decode_json_file(json_file).get("drops")
+
+
+class FileDropStore(DropStore):
+    """A drop store that reads the `monsters-complete.json` file, using the byte offset of each monster.
+
+    Only the offset index is kept in memory, the file is read through mmap. When the
+    index was built with the `drops` skip key, it holds the offset of the drops of each
+    monster, and only the drops are decoded. Otherwise, the whole monster record is
+    decoded to get its drops.
+
+    :param json_index: The byte offset index of the monsters JSON file.
+    """
+    def __init__(self, json_index: JsonFileIndex):
+        self.json_index = json_index
+
+    def drops_json(self, monster_id: int) -> Optional[List[Dict]]:
+        location = self.json_index.skipped_locations.get(monster_id)
+        if location is not None:
+            return self.json_index.decode_json(location)
+        try:
+            location = self.json_index.locations[monster_id]
+        except KeyError:
+            return None
+        return self.json_index.decode_json(location).get("drops")
+
+
+# The slot descriptor that stores the drops value of a MonsterProperties object
+_DROPS_SLOT = MonsterProperties.__dict__["drops"]
+
+
+class LazyDropMonsterProperties(MonsterProperties):
+    """A MonsterProperties object which decodes the `drops` property from a drop store on first access.
+
+    The decoded drops are kept, so later accesses do not read the drop store. If
+    the monster was created with a drops value, that value is used instead. It is
+    equal to a MonsterProperties object with the same properties.
+    """
+    __slots__ = ("drop_store",)
+
+    @property
+    def drops(self) -> Optional[List[MonsterDrop]]:
+        drops = _DROPS_SLOT.__get__(self)
+        if drops is None and getattr(self, "drop_store", None) is not None:
+            drops = self.drop_store.drops(self.id)
+            _DROPS_SLOT.__set__(self, drops)
+        return drops
+
+    @drops.setter
+    def drops(self, value: Optional[List[MonsterDrop]]):
+        _DROPS_SLOT.__set__(self, value)
+
+    def __eq__(self, other: object) -> bool:
+        # The dataclass __eq__ only compares objects of the same class, so compare every field instead
+        if not isinstance(other, MonsterProperties):
+            return NotImplemented
+        return (tuple(getattr(self, field.name) for field in fields(MonsterProperties))
+                == tuple(getattr(other, field.name) for field in fields(MonsterProperties)))
+
+    @classmethod
+    def from_drop_store(cls, monster_json: dict, drop_store: DropStore) -> "LazyDropMonsterProperties":
+        """Construct a MonsterProperties object without drops, which uses a drop store for the drops.
+
+        :param monster_json: A dict from an open and loaded JSON file, which is not changed.
+        :param drop_store: The drop store to fetch the drops from.
+        :return: The MonsterProperties object.
+        """
+        monster_def = cls(**{**monster_json, "drops": None})
+        monster_def.drop_store = drop_store
+        return monster_def
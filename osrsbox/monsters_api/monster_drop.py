@@ -19,9 +19,91 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
 from dataclasses import dataclass, asdict
+from fractions import Fraction
 from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import Union
 
+from osrsbox.dataclass_slots import add_slots
 
+# The largest denominator of a rarity fraction built from a float rarity
+MAX_RARITY_DENOMINATOR = 10 ** 8
+
+
+def parse_rarity(rarity: Union[float, int, str, None]) -> Optional[float]:
+    """Convert a drop rarity into a probability, without using `eval`.
+
+    Rarities are stored as a float in the database, but can also be written as
+    a fraction (for example, `1/128`), a number, or `Always`.
+
+    :param rarity: The drop rarity.
+    :return: The probability of the drop, or None if the rarity is missing or invalid.
+    """
+    if rarity is None or isinstance(rarity, bool):
+        return None
+    if isinstance(rarity, (int, float)):
+        return float(rarity)
+    rarity = rarity.strip().replace(",", "")
+    if rarity.casefold() == "always":
+        return 1.0
+    try:
+        if "/" in rarity:
+            numerator, denominator = rarity.split("/", 1)
+            return float(numerator) / float(denominator)
+        return float(rarity)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def parse_rarity_fraction(rarity: Union[float, int, str, None]) -> Optional[Fraction]:
+    """Convert a drop rarity into an exact fraction.
+
+    Rarities stored as a float are converted to the closest fraction with a
+    denominator of at most :data:`MAX_RARITY_DENOMINATOR`, so `0.04` is `1/25`.
+
+    :param rarity: The drop rarity.
+    :return: The probability of the drop as a Fraction, or None if the rarity is missing or invalid.
+    """
+    if isinstance(rarity, str) and "/" in rarity:
+        try:
+            return Fraction(rarity.strip().replace(",", "").replace(" ", ""))
+        except (ValueError, ZeroDivisionError):
+            return None
+    probability = parse_rarity(rarity)
+    if probability is None:
+        return None
+    return Fraction(probability).limit_denominator(MAX_RARITY_DENOMINATOR)
+
+
+def parse_quantity(quantity: Union[int, str, None]) -> Tuple[Optional[int], Optional[int], Optional[Tuple[int, ...]]]:
+    """Convert a drop quantity into numbers.
+
+    Quantities are a number (`5`), a range (`1-10`) or a list of possible
+    quantities (`5,10`).
+
+    :param quantity: The drop quantity.
+    :return: The minimum and maximum quantity, and the possible quantities (None for a range).
+        Every value is None if the quantity is missing or invalid.
+    """
+    if quantity is None:
+        return None, None, None
+    if isinstance(quantity, int):
+        return quantity, quantity, (quantity,)
+    if quantity.isdigit():
+        quantity = int(quantity)
+        return quantity, quantity, (quantity,)
+    try:
+        if "," in quantity:
+            quantities = tuple(sorted(int(value) for value in quantity.split(",")))
+            return quantities[0], quantities[-1], quantities
+        minimum, maximum = quantity.split("-", 1)
+        return int(minimum), int(maximum), None
+    except ValueError:
+        return None, None, None
+
+
+@add_slots
 @dataclass
 class MonsterDrop:
     """This class defines the drops of an OSRS monster.
@@ -29,7 +111,14 @@ class MonsterDrop:
     The MonsterDrop class is the object that retains all drop properties related
     to items dropped by a specific monster. This includes item properties (id,
     name) and drop properties (quantity, rarity, and drop requirements).
+
+    The rarity and quantity are parsed when the drop is created: `probability` is
+    the rarity as a float, `quantity_min` and `quantity_max` are the quantity
+    range, and `quantities` is the tuple of possible quantities (None for a range).
+    These are not dataclass fields, so they are not exported.
     """
+    __slots__ = ("probability", "quantity_min", "quantity_max", "quantities")
+
     id: int = None
     name: str = None
     members: str = None
@@ -38,6 +127,20 @@ class MonsterDrop:
     rarity: str = None
     rolls: int = None
 
+    def __post_init__(self):
+        # Rarities are floats in the database, so only other types need parsing
+        rarity = self.rarity
+        self.probability = rarity if type(rarity) is float else parse_rarity(rarity)
+        self.quantity_min, self.quantity_max, self.quantities = parse_quantity(self.quantity)
+
+    @property
+    def rarity_fraction(self) -> Optional[Fraction]:
+        """The rarity as an exact fraction, which is built on each access.
+
+        :return: The probability of the drop as a Fraction, or None if the rarity is missing or invalid.
+        """
+        return parse_rarity_fraction(self.rarity)
+
     def construct_json(self) -> Dict:
         """Construct dictionary/JSON of drop entry in a list for exporting or printing.
 
@@ -19,16 +19,18 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
 
-import json
 from typing import Dict
 from typing import List
 from pathlib import Path
 from dataclasses import asdict
 from dataclasses import dataclass
 
+from osrsbox import json_codec
+from osrsbox.dataclass_slots import add_slots
 from osrsbox.monsters_api.monster_drop import MonsterDrop
 
 
+@add_slots
 @dataclass
 class MonsterProperties:
     """This class defines the object structure and properties for an OSRS monster.
@@ -112,6 +114,6 @@ class MonsterProperties:
         out_file_path = Path(export_path / out_file_name)
         with open(out_file_path, "w", newline="\n") as out_file:
             if pretty:
-                json.dump(json_out, out_file, indent=4)
+                json_codec.dump(json_out, out_file, indent=4)
             else:
-                json.dump(json_out, out_file)
+                json_codec.dump(json_out, out_file)
@@ -36,17 +36,17 @@ if __name__ == "__main__":
     rarest_drop_rate_float = 1.0
     rarest_drop_rate_fraction = None
 
-    # Loop through all monsters in the database and print the monster name for each monster
+    # Loop through all monsters in the database, using the parsed drop probability
     for monster in all_db_monsters:
         if monster.drops:
             for drop in monster.drops:
-                if not drop.rarity:
+                if drop.probability is None:
                     continue
-                drop_rate = eval(drop.rarity)
+                drop_rate = drop.probability
                 rarest_drop[drop_rate].append(monster)
                 if drop_rate < rarest_drop_rate_float:
                     rarest_drop_rate_float = drop_rate
-                    rarest_drop_rate_fraction = drop.rarity
+                    rarest_drop_rate_fraction = drop.rarity_fraction
 
     print("%f" % rarest_drop_rate_float)
     print(rarest_drop_rate_fraction)
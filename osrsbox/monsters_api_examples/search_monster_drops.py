@@ -30,13 +30,12 @@ if __name__ == "__main__":
     # Load all monsters
     all_db_monsters = monsters_api.load()
 
-    item_search_keyword = "prayer potion"
+    item_names = ["Prayer potion(1)", "Prayer potion(2)", "Prayer potion(3)", "Prayer potion(4)"]
 
-    # Loop through all monsters in the database and search for items by name
+    # Look up the monsters that drop each item name, using the drop index
     print("The following monsters drop prayer potions!!!")
-    print(f"{'ID':<10} {'Name':<25} {'Wiki Name':<25}")
-    for monster in all_db_monsters:
-        if monster.drops:
-            for drop in monster.drops:
-                if item_search_keyword in drop.name.lower():
-                    print(f"{monster.id:<10} {monster.name:<25} {monster.wiki_name:<25}")
+    print(f"{'ID':<10} {'Name':<25} {'Wiki Name':<25} {'Drop':<20} {'Rarity':<10}")
+    for item_name in item_names:
+        for monster_id, drop in all_db_monsters.lookup_drops_by_item_name(item_name):
+            monster = all_db_monsters[monster_id]
+            print(f"{monster.id:<10} {monster.name:<25} {monster.wiki_name:<25} {drop.name:<20} {drop.rarity:<10.4f}")
@@ -0,0 +1,122 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Parallel loading of directories of JSON files (for example, `items-json`).
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from osrsbox import instrumentation
+from osrsbox import json_codec
+
+# The number of JSON files loaded by each task submitted to the pool
+CHUNK_SIZE = 500
+
+# The number of chunks submitted to the pool ahead of the chunk being built, per worker
+CHUNKS_AHEAD = 2
+
+
+def _load_json_files(json_files: List[str]) -> List[Dict]:
+    """Load a chunk of JSON files, this runs in a pool worker.
+
+    :param json_files: The paths to the JSON files.
+    :return: The decoded JSON files, in the same order.
+    """
+    loaded = list()
+    for json_file in json_files:
+        with open(json_file) as input_json_file:
+            loaded.append(json_codec.load(input_json_file))
+    return loaded
+
+
+def _file_order(json_file: str) -> Tuple[int, int, str]:
+    """Sort key of a JSON file, files named by ID number are sorted by ID number first.
+
+    :param json_file: The path to the JSON file.
+    :return: The sort key.
+    """
+    stem = os.path.basename(json_file)[:-len(".json")]
+    try:
+        return 0, int(stem), ""
+    except ValueError:
+        return 1, 0, stem
+
+
+def load_json_directory(path_to_directory: Path, workers: int, use_processes: bool = True,
+                        chunk_size: int = CHUNK_SIZE) -> Iterator[List[Dict]]:
+    """Load every JSON file in a directory using a process or thread pool.
+
+    The files are sorted by name (ID number), split into chunks, and each chunk is
+    yielded as soon as it is decoded, in order. Only a few chunks per worker are
+    decoded ahead of the chunk being used, so the caller builds each chunk while
+    the pool decodes the next ones, and the whole directory is never held in memory.
+
+    Decoding JSON holds the GIL, so a thread pool only helps when reading the
+    files is slow (for example, on a network file system). A process pool decodes
+    in parallel, at the cost of sending each decoded chunk back to the caller.
+
+    :param path_to_directory: The path to the directory of JSON files.
+    :param workers: The number of pool workers.
+    :param use_processes: Use a process pool, or False to use a thread pool.
+    :param chunk_size: The number of JSON files loaded by each task.
+    :return: An iterator of lists of decoded JSON files, in file name (ID number) order.
+    :raises ValueError: No JSON files found in supplied directory.
+    """
+    with os.scandir(path_to_directory) as entries:
+        json_files = [entry.path for entry in entries if entry.name.endswith(".json") and entry.is_file()]
+
+    if not json_files:
+        raise ValueError("Error: No files found in directory, check the supplied path. Exiting.")
+
+    json_files.sort(key=_file_order)
+    return _iter_chunks(json_files, workers, use_processes, chunk_size)
+
+
+def _iter_chunks(json_files: List[str], workers: int, use_processes: bool, chunk_size: int) -> Iterator[List[Dict]]:
+    """Decode chunks of JSON files in a pool, and yield them in order.
+
+    :param json_files: The paths to the JSON files, in order.
+    :param workers: The number of pool workers.
+    :param use_processes: Use a process pool, or False to use a thread pool.
+    :param chunk_size: The number of JSON files loaded by each task.
+    :return: An iterator of lists of decoded JSON files.
+    """
+    chunks = (json_files[i:i + chunk_size] for i in range(0, len(json_files), chunk_size))
+
+    pool_executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with pool_executor(max_workers=workers) as executor:
+        pending = deque(executor.submit(_load_json_files, chunk) for chunk in islice(chunks, workers * CHUNKS_AHEAD))
+        while pending:
+            # Time spent waiting for the pool, the decoding itself runs in the workers
+            with instrumentation.phase("read_decode_wait"):
+                loaded = pending.popleft().result()
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(executor.submit(_load_json_files, chunk))
+            yield loaded
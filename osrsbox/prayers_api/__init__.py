@@ -18,12 +18,78 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
-from osrsbox.prayers_api import all_prayers
+from __future__ import annotations
 
+import importlib
+from typing import TYPE_CHECKING
 
-def load() -> all_prayers.AllPrayers:
+from osrsbox.shared_handles import SharedHandle
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any
+    from typing import List
+    from typing import Union
+
+    from osrsbox.prayers_api.all_prayers import AllPrayers
+
+# Submodules are imported the first time they are used (for example, `prayers_api.all_prayers`),
+# so importing the prayers_api package does not load the prayers database modules
+_SUBMODULES = (
+    "all_prayers",
+    "prayer_properties",
+)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_SUBMODULES))
+
+
+def _load_prayers(path: str) -> AllPrayers:
+    from osrsbox.prayers_api.all_prayers import AllPrayers
+    return AllPrayers(path)
+
+
+def _default_path() -> Path:
+    from osrsbox.prayers_api.all_prayers import default_prayers_path
+    return default_prayers_path()
+
+
+_shared_prayers = SharedHandle(_load_prayers, _default_path)
+
+
+def load(path: Union[Path, str, None] = None) -> AllPrayers:
     """Load the prayers database.
 
-    :return all_prayers: An AllPrayers object containing the entire prayer database.
+    The database is loaded once, and the same object is returned by later calls
+    for the same path, until the source file changes or `reload()` or
+    `invalidate()` is called. Treat the returned object as read-only, as it is
+    shared by every caller in the process.
+
+    :param path: The prayers database file or folder, or None for the default database.
+    :return: An AllPrayers object containing the entire prayer database.
+    """
+    return _shared_prayers.get(path)
+
+
+def reload(path: Union[Path, str, None] = None) -> AllPrayers:
+    """Load the prayers database again, and replace the shared object returned by `load()`.
+
+    :param path: The prayers database file or folder, or None for the default database.
+    :return: An AllPrayers object containing the entire prayer database.
+    """
+    return _shared_prayers.reload(path)
+
+
+def invalidate(path: Union[Path, str, None] = None) -> None:
+    """Drop the shared prayers database, so the next call to `load()` loads it again.
+
+    :param path: The prayers database file or folder, or None to drop every shared prayers database.
     """
-    return all_prayers.AllPrayers()
+    _shared_prayers.invalidate(path)
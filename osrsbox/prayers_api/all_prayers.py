@@ -18,28 +18,61 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
-import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Union, Generator
+from typing import Any, Dict, List, Optional, Union, Generator
 
+from osrsbox import instrumentation
+from osrsbox import json_codec
 from osrsbox.prayers_api.prayer_properties import PrayerProperties
+from osrsbox.lazy_records import JsonFileIndex
+from osrsbox.lazy_records import LazyRecordDict
+from osrsbox.lazy_records import LazyRecordList
+from osrsbox.lazy_records import decode_json_file
+from osrsbox.lazy_records import index_json_directory
 
-PATH_TO_PRAYERS_COMPLETE_JSON = Path(__file__).absolute().parent / ".." / ".." / "docs" / "prayers-complete.json"
-if not PATH_TO_PRAYERS_COMPLETE_JSON.is_file():
-    PATH_TO_PRAYERS_COMPLETE_JSON = Path(__file__).absolute().parent / ".." / "docs" / "prayers-complete.json"
-    if not PATH_TO_PRAYERS_COMPLETE_JSON.is_file():
-        raise ValueError("Error: Default prayer database file not found. Exiting")
+
+@lru_cache(maxsize=None)
+def default_prayers_path() -> Path:
+    """Find the default prayers database file, `prayers-complete.json`.
+
+    The file is searched for the first time it is needed, instead of when the
+    module is imported.
+
+    :return: The path to the `prayers-complete.json` file.
+    :raises ValueError: Default prayer database file not found.
+    """
+    path_to_prayers_complete_json = Path(__file__).absolute().parent / ".." / ".." / "docs" / "prayers-complete.json"
+    if not path_to_prayers_complete_json.is_file():
+        path_to_prayers_complete_json = Path(__file__).absolute().parent / ".." / "docs" / "prayers-complete.json"
+        if not path_to_prayers_complete_json.is_file():
+            raise ValueError("Error: Default prayer database file not found. Exiting")
+    return path_to_prayers_complete_json
+
+
+def __getattr__(name: str) -> Any:
+    # The default database path is only found when it is first used
+    if name == "PATH_TO_PRAYERS_COMPLETE_JSON":
+        return default_prayers_path()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class AllPrayers:
     """This class handles loading of the osrsbox-db prayers database.
 
     :param input_data_file_or_directory: The osrsbox-db prayers folder of JSON files, or single JSON file.
+        Defaults to the `prayers-complete.json` file in the package.
+    :param lazy: Decode each prayer the first time it is accessed, instead of at load time.
+    :param use_cache: Load the built prayers from the warm-start cache (see :mod:`osrsbox.warm_cache`)
+        when it matches the JSON data, and save them to the cache otherwise.
     """
-    def __init__(self, input_data_file_or_directory: Path = PATH_TO_PRAYERS_COMPLETE_JSON):
+    def __init__(self, input_data_file_or_directory: Optional[Path] = None, lazy: bool = False,
+                 use_cache: bool = False):
         self.all_prayers: List[PrayerProperties] = list()
         self.all_prayers_dict: Dict[int, PrayerProperties] = dict()
-        self.load_all_prayers(input_data_file_or_directory)
+        if input_data_file_or_directory is None:
+            input_data_file_or_directory = default_prayers_path()
+        self.load_all_prayers(input_data_file_or_directory, lazy=lazy, use_cache=use_cache)
 
     def __iter__(self) -> Generator[PrayerProperties, None, None]:
         """Iterate (loop) over each PrayerProperties object."""
@@ -74,26 +107,53 @@ class AllPrayers:
             raise KeyError("Cannot find the provided prayer ID number...")
         return prayer_properties
 
-    def load_all_prayers(self, input_data_file_or_directory: Union[Path, str]) -> None:
+    @instrumentation.instrumented("AllPrayers.load_all_prayers")
+    def load_all_prayers(self, input_data_file_or_directory: Union[Path, str], lazy: bool = False,
+                         use_cache: bool = False) -> None:
         """Load the prayers database via a JSON file, or directory of JSON files.
 
         :param input_data_file_or_directory: The path to the data input.
+        :param lazy: Only index the JSON data, and decode each prayer the first time it is accessed.
+        :param use_cache: Use the warm-start cache, when eagerly loading prayers from JSON.
         :raises ValueError: Valid input not found.
         """
         # Check if a str is supplied, if so, convert to Path object
         if isinstance(input_data_file_or_directory, str):
             input_data_file_or_directory = Path(input_data_file_or_directory)
 
+        # Check the warm-start cache, only when the whole database is built from JSON data
+        path_to_cache_file = None
+        cached_prayers = None
+        if use_cache and not lazy and not len(self.all_prayers) and input_data_file_or_directory.exists():
+            from osrsbox import warm_cache
+            with instrumentation.phase("cache_read"):
+                path_to_cache_file = warm_cache.cache_file_path("prayers", input_data_file_or_directory, PrayerProperties)
+                cached_prayers = warm_cache.read_cache(path_to_cache_file)
+
         # Process the directory of JSON, or a single JSON file
-        if input_data_file_or_directory.is_dir():
+        if cached_prayers is not None:
+            self.all_prayers = cached_prayers
+            self.all_prayers_dict = {prayer.id: prayer for prayer in cached_prayers}
+        elif lazy and input_data_file_or_directory.is_dir():
+            self._index_prayers_from_directory(path_to_directory=input_data_file_or_directory)
+        elif input_data_file_or_directory.is_dir():
             self._load_prayers_from_directory(path_to_directory=input_data_file_or_directory)
+        elif lazy and input_data_file_or_directory.is_file():
+            self._index_prayers_from_file(path_to_json_file=input_data_file_or_directory)
         elif input_data_file_or_directory.is_file():
             self._load_prayers_from_file(path_to_json_file=input_data_file_or_directory)
         else:
             raise ValueError("Error: Valid input not found. Exiting.")
 
-        # Sort the list of prayers
-        self.all_prayers.sort(key=lambda x: x.id)
+        # Sort the list of prayers, lazily loaded prayers are already indexed in prayer ID order
+        if isinstance(self.all_prayers, list):
+            with instrumentation.phase("sort"):
+                self.all_prayers.sort(key=lambda x: x.id)
+
+        # Save the built prayers, so the next load can skip the JSON data
+        if path_to_cache_file is not None and cached_prayers is None:
+            with instrumentation.phase("cache_write"):
+                warm_cache.write_cache(path_to_cache_file, self.all_prayers)
 
     def _load_prayers_from_directory(self, path_to_directory: Path) -> None:
         """Load prayer database from a directory of JSON files (`prayers-json`).
@@ -111,34 +171,70 @@ class AllPrayers:
 
         # Loop through every prayer in JSON file
         for json_file in json_files:
-            with open(json_file) as input_json_file:
-                temp = json.load(input_json_file)
+            with instrumentation.phase("read_decode"):
+                with open(json_file) as input_json_file:
+                    temp = json_codec.load(input_json_file)
 
-            self._load_prayer(temp)
+            with instrumentation.phase("build"):
+                self._load_prayer(temp)
 
     def _load_prayers_from_file(self, path_to_json_file: Path) -> None:
         """Load prayer database from a single JSON file (`prayers-complete.json`).
 
         :param path_to_json_file: The path to the `prayers-complete.json` file.
         """
-        with open(path_to_json_file) as input_json_file:
-            temp = json.load(input_json_file)
+        with instrumentation.phase("read"):
+            with open(path_to_json_file, "rb") as input_json_file:
+                data = input_json_file.read()
 
-        for entry in temp:
-            self._load_prayer(temp[entry])
+        with instrumentation.phase("decode"):
+            temp = json_codec.loads(data)
+        del data
 
-    def _load_prayer(self, prayer_json: Dict) -> None:
-        """Convert the `prayer_json` into a :class:`PrayerProperties` and store it.
+        with instrumentation.phase("build"):
+            for entry in temp:
+                self._load_prayer(temp[entry])
+
+    def _index_prayers_from_directory(self, path_to_directory: Path) -> None:
+        """Index prayer database JSON files by prayer ID, and decode each prayer on first access.
+
+        :param path_to_directory: The path to the `prayers-json` directory.
+        """
+        with instrumentation.phase("index"):
+            json_files = index_json_directory(path_to_directory)
+        self.all_prayers_dict = LazyRecordDict(json_files, lambda json_file: self._build_prayer(decode_json_file(json_file)))
+        self.all_prayers = LazyRecordList(self.all_prayers_dict)
+
+    def _index_prayers_from_file(self, path_to_json_file: Path) -> None:
+        """Index the byte offset of each prayer in a single JSON file, and decode each prayer on first access.
+
+        :param path_to_json_file: The path to the `prayers-complete.json` file.
+        """
+        with instrumentation.phase("index"):
+            json_index = JsonFileIndex(path_to_json_file)
+        self.all_prayers_dict = LazyRecordDict(json_index.locations, lambda location: self._build_prayer(json_index.decode_json(location)))
+        self.all_prayers = LazyRecordList(self.all_prayers_dict)
+
+    def _build_prayer(self, prayer_json: Dict) -> PrayerProperties:
+        """Convert the `prayer_json` into a :class:`PrayerProperties`.
 
         :param prayer_json: A dict from an open and loaded JSON file.
         :raises ValueError: Cannot populate prayer.
         """
-        # Load the prayer using the PrayerProperties class
         try:
-            prayer_def = PrayerProperties.from_json(prayer_json)
+            return PrayerProperties.from_json(prayer_json)
         except TypeError as e:
             raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting") from e
 
+    def _load_prayer(self, prayer_json: Dict) -> None:
+        """Convert the `prayer_json` into a :class:`PrayerProperties` and store it.
+
+        :param prayer_json: A dict from an open and loaded JSON file.
+        :raises ValueError: Cannot populate prayer.
+        """
+        # Load the prayer using the PrayerProperties class
+        prayer_def = self._build_prayer(prayer_json)
+
         # Add prayer to list
         self.all_prayers.append(prayer_def)
         self.all_prayers_dict[prayer_def.id] = prayer_def
@@ -18,12 +18,13 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
-import json
 from pathlib import Path
 from dataclasses import asdict
 from dataclasses import dataclass
 from typing import Dict
 
+from osrsbox import json_codec
+
 
 @dataclass
 class PrayerProperties:
@@ -65,6 +66,6 @@ class PrayerProperties:
         out_file_path = Path(export_path / out_file_name)
         with open(out_file_path, "w") as out_file:
             if pretty:
-                json.dump(json_out, out_file, indent=4)
+                json_codec.dump(json_out, out_file, indent=4)
             else:
-                json.dump(json_out, out_file)
+                json_codec.dump(json_out, out_file)
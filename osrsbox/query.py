@@ -0,0 +1,436 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+A declarative query engine for the items and monsters databases.
+
+A query is a set of conditions, written as `field__lookup=value` keyword
+arguments, for example `db.query(slot="head", members=False, prayer__gt=2)`.
+The query planner picks the most selective condition that can be answered by
+an index (a hash index for string and boolean fields, or a sorted index for
+numeric fields), fetches the matching records from that index, and checks the
+remaining conditions against each candidate. Conditions that cannot use an
+index fall back to a full scan. Every index is built the first time a query
+needs it, and kept until the database is reloaded.
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+import bisect
+import operator
+from dataclasses import fields
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+from typing import get_type_hints
+
+# The kinds of index a field can use
+HASH_INDEX = "hash"
+SORTED_INDEX = "sorted"
+
+
+def _contains(value: Any, expected: Any) -> bool:
+    return value is not None and expected in value
+
+
+def _icontains(value: Any, expected: str) -> bool:
+    expected = expected.lower()
+    if isinstance(value, str):
+        return expected in value.lower()
+    if isinstance(value, (list, tuple)):
+        return any(isinstance(entry, str) and expected in entry.lower() for entry in value)
+    return False
+
+
+def _compare(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    def lookup(value: Any, expected: Any) -> bool:
+        return value is not None and compare(value, expected)
+    return lookup
+
+
+LOOKUPS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": _compare(operator.gt),
+    "gte": _compare(operator.ge),
+    "lt": _compare(operator.lt),
+    "lte": _compare(operator.le),
+    "in": lambda value, expected: value in expected,
+    "contains": _contains,
+    "icontains": _icontains,
+    "isnull": lambda value, expected: (value is None) == bool(expected),
+}
+
+
+class QueryField:
+    """A field that can be used in query conditions and ordering.
+
+    :param name: The field name used in queries.
+    :param getter: A function returning the field value of a record.
+    :param index_kind: The kind of index the field supports, or None.
+    """
+    def __init__(self, name: str, getter: Callable[[Any], Any], index_kind: Optional[str] = None):
+        self.name = name
+        self.getter = getter
+        self.index_kind = index_kind
+
+
+def _index_kind(annotation: Any) -> Optional[str]:
+    """Get the index kind for a type annotation, using the type inside an Optional."""
+    if getattr(annotation, "__origin__", None) is Union:
+        annotation = next(arg for arg in annotation.__args__ if arg is not type(None))
+    if annotation in (bool, str):
+        return HASH_INDEX
+    if annotation in (int, float):
+        return SORTED_INDEX
+    return None
+
+
+def _nested_getter(parent: str, name: str) -> Callable[[Any], Any]:
+    def getter(record: Any) -> Any:
+        child = getattr(record, parent)
+        return None if child is None else getattr(child, name)
+    return getter
+
+
+def fields_from_dataclass(cls: type, parent: Optional[str] = None) -> Dict[str, QueryField]:
+    """Create query fields for each field of a dataclass.
+
+    :param cls: The dataclass.
+    :param parent: The attribute holding the dataclass object, for a nested object
+        (for example, the `equipment` of an item), or None for the record itself.
+    :return: A dict of field name to QueryField.
+    """
+    type_hints = get_type_hints(cls)
+    query_fields = dict()
+    for field in fields(cls):
+        getter = operator.attrgetter(field.name) if parent is None else _nested_getter(parent, field.name)
+        query_fields[field.name] = QueryField(field.name, getter, _index_kind(type_hints[field.name]))
+    return query_fields
+
+
+class Condition:
+    """One `field__lookup=value` condition of a query."""
+    def __init__(self, field: QueryField, lookup: str, value: Any):
+        self.field = field
+        self.lookup = lookup
+        self.value = value
+        self._test = LOOKUPS[lookup]
+
+    def matches(self, record: Any) -> bool:
+        return self._test(self.field.getter(record), self.value)
+
+    def __repr__(self) -> str:
+        return f"{self.field.name} {self.lookup} {self.value!r}"
+
+
+class SortedIndex:
+    """Record positions sorted by a field value, for range lookups and ordered scans.
+
+    Records with a None value are not stored in the sorted keys, but are kept so that
+    an ordered scan can return them last.
+    """
+    def __init__(self, keys: List[Any], positions: List[int], null_positions: List[int]):
+        self.keys = keys
+        self.positions = positions
+        self.null_positions = null_positions
+
+    def range(self, lookup: str, value: Any) -> Tuple[int, int]:
+        """Get the slice of sorted positions matching a comparison lookup."""
+        if lookup == "eq":
+            return bisect.bisect_left(self.keys, value), bisect.bisect_right(self.keys, value)
+        if lookup == "gt":
+            return bisect.bisect_right(self.keys, value), len(self.keys)
+        if lookup == "gte":
+            return bisect.bisect_left(self.keys, value), len(self.keys)
+        if lookup == "lt":
+            return 0, bisect.bisect_left(self.keys, value)
+        return 0, bisect.bisect_right(self.keys, value)
+
+    def ordered(self, descending: bool) -> Iterator[int]:
+        """Iterate record positions in field order, ties in position order, and None values last."""
+        if not descending:
+            yield from self.positions
+        else:
+            end = len(self.keys)
+            while end:
+                start = bisect.bisect_left(self.keys, self.keys[end - 1], 0, end)
+                yield from self.positions[start:end]
+                end = start
+        yield from self.null_positions
+
+
+class QueryEngine:
+    """Run queries over a sequence of records, and keep the indexes used by the query planner.
+
+    :param records: The records to query, in ID order.
+    :param query_fields: The fields that can be queried, keyed by field name.
+    """
+    def __init__(self, records: Sequence, query_fields: Dict[str, QueryField]):
+        self.records = records
+        self.fields = query_fields
+        self._hash_indexes: Dict[str, Optional[Dict[Any, List[int]]]] = dict()
+        self._sorted_indexes: Dict[str, Optional[SortedIndex]] = dict()
+
+    def query(self, **conditions) -> "Query":
+        """Start a query, see :meth:`Query.filter` for the condition syntax.
+
+        :return: A Query object.
+        """
+        return Query(self).filter(**conditions)
+
+    def field(self, name: str) -> QueryField:
+        try:
+            return self.fields[name]
+        except KeyError:
+            raise ValueError(f"Error: Unknown query field: {name}. Exiting.")
+
+    def hash_index(self, name: str) -> Optional[Dict[Any, List[int]]]:
+        """Get the hash index of a field, mapping each value to the positions of matching records.
+
+        :param name: The field name.
+        :return: The index, or None if the field values cannot be hashed.
+        """
+        if name not in self._hash_indexes:
+            getter = self.field(name).getter
+            index: Optional[Dict[Any, List[int]]] = dict()
+            try:
+                for position, record in enumerate(self.records):
+                    index.setdefault(getter(record), list()).append(position)
+            except TypeError:
+                index = None
+            self._hash_indexes[name] = index
+        return self._hash_indexes[name]
+
+    def sorted_index(self, name: str) -> Optional[SortedIndex]:
+        """Get the sorted index of a field.
+
+        :param name: The field name.
+        :return: The index, or None if the field values cannot be sorted.
+        """
+        if name not in self._sorted_indexes:
+            getter = self.field(name).getter
+            values = list()
+            null_positions = list()
+            for position, record in enumerate(self.records):
+                value = getter(record)
+                if value is None:
+                    null_positions.append(position)
+                else:
+                    values.append((value, position))
+            try:
+                values.sort()
+                index: Optional[SortedIndex] = SortedIndex([value for value, _ in values],
+                                                           [position for _, position in values], null_positions)
+            except TypeError:
+                index = None
+            self._sorted_indexes[name] = index
+        return self._sorted_indexes[name]
+
+    def index_positions(self, condition: Condition) -> Optional[List[int]]:
+        """Get the positions of the records matching a condition, using an index.
+
+        :param condition: The condition.
+        :return: The matching record positions (unordered), or None if no index can answer the condition.
+        """
+        kind = condition.field.index_kind
+        name = condition.field.name
+        if kind == HASH_INDEX and condition.lookup in ("eq", "in"):
+            index = self.hash_index(name)
+            if index is None:
+                return None
+            values = [condition.value] if condition.lookup == "eq" else condition.value
+            try:
+                return [position for value in values for position in index.get(value, ())]
+            except TypeError:
+                return None
+        if kind == SORTED_INDEX and condition.lookup in ("eq", "gt", "gte", "lt", "lte"):
+            index = self.sorted_index(name)
+            if index is None:
+                return None
+            try:
+                start, end = index.range(condition.lookup, condition.value)
+            except TypeError:
+                return None
+            return index.positions[start:end]
+        return None
+
+
+class Query:
+    """A lazily evaluated query. Each method returns a new Query, and records are only
+    fetched when the query is iterated, or `all()`, `first()` or `count()` is called.
+
+    :param engine: The QueryEngine to run the query with.
+    """
+    def __init__(self, engine: QueryEngine, conditions: Tuple[Condition, ...] = (),
+                 ordering: Tuple[Tuple[QueryField, bool], ...] = (), limit_count: Optional[int] = None):
+        self._engine = engine
+        self._conditions = conditions
+        self._ordering = ordering
+        self._limit = limit_count
+
+    def filter(self, **conditions) -> "Query":
+        """Add conditions to the query. A record must match every condition.
+
+        Each keyword is a field name, optionally followed by a double underscore and a
+        lookup: eq (the default), ne, gt, gte, lt, lte, in, contains, icontains or isnull.
+        For example: `query.filter(slot="head", prayer__gt=2, name__icontains="helm")`.
+
+        :return: A new Query object.
+        :raises ValueError: Unknown field name.
+        """
+        parsed = list()
+        for key, value in conditions.items():
+            name, _, lookup = key.rpartition("__")
+            if not name or lookup not in LOOKUPS:
+                name, lookup = key, "eq"
+            if lookup == "in":
+                value = list(value)
+            parsed.append(Condition(self._engine.field(name), lookup, value))
+        return Query(self._engine, self._conditions + tuple(parsed), self._ordering, self._limit)
+
+    def order_by(self, *field_names: str) -> "Query":
+        """Order the results by one or more fields, prefix a field name with "-" for descending order.
+
+        Records with a None value are always ordered last. Ties keep ID order.
+
+        :return: A new Query object.
+        :raises ValueError: Unknown field name.
+        """
+        ordering = tuple((self._engine.field(name.lstrip("-")), name.startswith("-")) for name in field_names)
+        return Query(self._engine, self._conditions, ordering, self._limit)
+
+    def limit(self, count: int) -> "Query":
+        """Limit the number of results.
+
+        :param count: The maximum number of records to return.
+        :return: A new Query object.
+        """
+        return Query(self._engine, self._conditions, self._ordering, count)
+
+    def _plan(self) -> Tuple[str, Optional[Condition], Optional[List[int]]]:
+        """Choose how to fetch the candidate records.
+
+        :return: The access path name, the condition answered by an index (if any),
+            and the candidate positions from the index (if any).
+        """
+        best_condition = None
+        best_positions = None
+        for condition in self._conditions:
+            positions = self._engine.index_positions(condition)
+            if positions is not None and (best_positions is None or len(positions) < len(best_positions)):
+                best_condition, best_positions = condition, positions
+
+        if best_condition is not None:
+            return "index", best_condition, best_positions
+        if len(self._ordering) == 1 and self._limit is not None:
+            field, _ = self._ordering[0]
+            if field.index_kind == SORTED_INDEX and self._engine.sorted_index(field.name) is not None:
+                return "ordered", None, None
+        return "scan", None, None
+
+    def explain(self) -> str:
+        """Describe how the query will be run.
+
+        :return: A multi-line description of the query plan.
+        """
+        access, index_condition, positions = self._plan()
+        if access == "index":
+            lines = [f"access: {index_condition.field.index_kind} index on {index_condition.field.name} "
+                     f"({index_condition!r}), {len(positions)} candidates"]
+        elif access == "ordered":
+            field, descending = self._ordering[0]
+            lines = [f"access: ordered scan of sorted index on {field.name} "
+                     f"({'descending' if descending else 'ascending'}), stops after {self._limit} matches"]
+        else:
+            lines = [f"access: full scan of {len(self._engine.records)} records"]
+
+        residual = [condition for condition in self._conditions if condition is not index_condition]
+        if residual:
+            lines.append("filter: " + ", ".join(repr(condition) for condition in residual))
+        if self._ordering and access != "ordered":
+            lines.append("order by: " + ", ".join(("-" if descending else "") + field.name
+                                                  for field, descending in self._ordering))
+        if self._limit is not None:
+            lines.append(f"limit: {self._limit}")
+        return "\n".join(lines)
+
+    def _run(self) -> List[Any]:
+        records = self._engine.records
+        access, index_condition, positions = self._plan()
+        residual = [condition for condition in self._conditions if condition is not index_condition]
+
+        if access == "ordered":
+            field, descending = self._ordering[0]
+            results = list()
+            for position in self._engine.sorted_index(field.name).ordered(descending):
+                record = records[position]
+                if all(condition.matches(record) for condition in residual):
+                    results.append(record)
+                    if len(results) == self._limit:
+                        break
+            return results
+
+        if access == "index":
+            candidates: Iterable[Any] = (records[position] for position in sorted(set(positions)))
+        else:
+            candidates = records
+        results = [record for record in candidates if all(condition.matches(record) for condition in residual)]
+
+        # Stable sorts, from the last ordering field to the first, with None values last
+        for field, descending in reversed(self._ordering):
+            getter = field.getter
+            if descending:
+                results.sort(key=lambda record: (getter(record) is not None, getter(record)), reverse=True)
+            else:
+                results.sort(key=lambda record: (getter(record) is None, getter(record)))
+
+        if self._limit is not None:
+            results = results[:self._limit]
+        return results
+
+    def all(self) -> List[Any]:
+        """Run the query.
+
+        :return: A list of matching records.
+        """
+        return self._run()
+
+    def first(self) -> Optional[Any]:
+        """Run the query, and get the first result.
+
+        :return: The first matching record, or None if no records match.
+        """
+        results = self.limit(1)._run() if self._limit is None else self._run()
+        return results[0] if results else None
+
+    def count(self) -> int:
+        """Run the query, and count the results.
+
+        :return: The number of matching records.
+        """
+        return len(self._run())
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._run())
@@ -0,0 +1,267 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+A read-only database layout that is shared between processes, using shared
+memory (multiprocessing.shared_memory) or a memory-mapped file.
+
+One process publishes the records of a database (for example, a web server
+before it starts its workers), and the other processes attach to the published
+database by name. Attached processes do not copy the data: each record is
+decoded from the shared buffer when it is accessed, and each process keeps the
+ID index and a bounded number of recently used records (see the `cache_size`
+of `AllItems.attach_shared_database`).
+
+Layout (every section starts on an 8 byte boundary):
+
+    header        HEADER struct (magic, version, record count, section offsets)
+    ids           int32 ID number of each record, sorted
+    offsets       uint64 start of each record in the records section, then the end of the last record
+    records       compact UTF-8 JSON of each record
+
+Shared memory requires Python 3.8 or above, a memory-mapped file can be used on
+any supported Python version.
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+import json
+import mmap
+import struct
+import threading
+from array import array
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Union
+
+from osrsbox import json_codec
+
+SHARED_DATABASE_MAGIC = b"OSRSBXS\x00"
+SHARED_DATABASE_VERSION = 1
+
+# magic, version, record count, then the ids, offsets and records section offsets, and total size
+HEADER = struct.Struct("<8sHxxIQQQQ")
+
+# The start and end offset of one record
+OFFSETS = struct.Struct("<QQ")
+
+# Serialises attaching, so the resource tracker registration hook is restored in order
+_ATTACH_LOCK = threading.Lock()
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class _Layout:
+    """The encoded sections of a shared database, before they are written to a buffer.
+
+    :param records_json: The records to store, as dicts with an `id` property.
+    """
+    def __init__(self, records_json: Iterable[Dict]):
+        encoded = sorted((record["id"], json.dumps(record, separators=(",", ":")).encode("utf-8"))
+                         for record in records_json)
+        self.ids = array("i", [id_number for id_number, _ in encoded])
+        self.records: List[bytes] = [record for _, record in encoded]
+
+        self.offsets = array("Q", [0])
+        for record in self.records:
+            self.offsets.append(self.offsets[-1] + len(record))
+
+        self.ids_offset = _align(HEADER.size)
+        self.offsets_offset = _align(self.ids_offset + len(self.ids) * self.ids.itemsize)
+        self.records_offset = _align(self.offsets_offset + len(self.offsets) * self.offsets.itemsize)
+        self.size = self.records_offset + self.offsets[-1]
+
+    def write(self, buffer: Any) -> None:
+        """Write the layout to a writable buffer of at least :attr:`size` bytes."""
+        HEADER.pack_into(buffer, 0, SHARED_DATABASE_MAGIC, SHARED_DATABASE_VERSION, len(self.ids),
+                         self.ids_offset, self.offsets_offset, self.records_offset, self.size)
+        ids = self.ids.tobytes()
+        buffer[self.ids_offset:self.ids_offset + len(ids)] = ids
+        offsets = self.offsets.tobytes()
+        buffer[self.offsets_offset:self.offsets_offset + len(offsets)] = offsets
+        position = self.records_offset
+        for record in self.records:
+            buffer[position:position + len(record)] = record
+            position += len(record)
+
+
+def _shared_memory_module() -> Any:
+    """Import the multiprocessing.shared_memory module.
+
+    :raises ValueError: Shared memory is not supported by this Python version.
+    """
+    try:
+        from multiprocessing import shared_memory
+    except ImportError as e:
+        raise ValueError("Error: Shared memory requires Python 3.8 or above, use a shared database file. Exiting.") from e
+    return shared_memory
+
+
+def _attach_shared_memory(name: str) -> Any:
+    """Attach to a shared memory block, without removing it when this process exits.
+
+    :param name: The name of the shared memory block.
+    :return: The SharedMemory object.
+    :raises ValueError: Shared memory is not supported by this Python version.
+    """
+    shared_memory = _shared_memory_module()
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    # Before Python 3.13, every process that opens a shared memory block registers it with the
+    # resource tracker, which removes the block when the process exits. Skip the registration
+    # of this block only, so only the publisher removes it. Unregistering the block after
+    # attaching is not used, as worker processes share the resource tracker of the publisher,
+    # so it would remove the registration of the publisher.
+    from multiprocessing import resource_tracker
+    block_name = name.lstrip("/")
+    with _ATTACH_LOCK:
+        register = resource_tracker.register
+
+        def register_except_block(resource_name: str, resource_type: str) -> None:
+            if resource_type != "shared_memory" or resource_name.lstrip("/") != block_name:
+                register(resource_name, resource_type)
+
+        resource_tracker.register = register_except_block
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedDatabase:
+    """Read-only access to a database published to shared memory, or a memory-mapped file.
+
+    Use :meth:`publish` or :meth:`write_file` to create a shared database, and
+    :meth:`attach` or :meth:`open_file` to open one. The records can be loaded
+    into :class:`AllItems` or :class:`AllMonsters` using the `shared_database`
+    parameter. Only the ID numbers are copied into this process, records are
+    read from the shared buffer when they are decoded.
+
+    :param buffer: The shared buffer, which holds the shared database layout.
+    :param owner: The object that owns the buffer (a SharedMemory or mmap object).
+    :param name: The name of the shared memory block, or None for a file.
+    :raises ValueError: The buffer is not a valid shared database.
+    """
+    def __init__(self, buffer: Any, owner: Any, name: Optional[str] = None):
+        # The buffer is the owner's own memoryview (SharedMemory.buf) or the mmap itself. No other
+        # memoryview of it is kept, as the owner cannot be closed while one exists
+        self._buffer = buffer
+        self._owner = owner
+        self.name = name
+
+        (magic, version, record_count, ids_offset, self._offsets_offset,
+         self._records_offset, _) = HEADER.unpack_from(buffer, 0)
+        if magic != SHARED_DATABASE_MAGIC or version != SHARED_DATABASE_VERSION:
+            raise ValueError("Error: Unsupported shared database. Exiting.")
+
+        self.ids = array("i")
+        self.ids.frombytes(buffer[ids_offset:ids_offset + record_count * self.ids.itemsize])
+
+    @classmethod
+    def publish(cls, records_json: Iterable[Dict], name: Optional[str] = None) -> "SharedDatabase":
+        """Publish records to a new shared memory block.
+
+        The shared memory block is removed when :meth:`unlink` is called, or when
+        this process exits, so publish from a process that outlives the attached
+        processes (for example, the parent process of a pool of workers).
+
+        :param records_json: The records to publish, as dicts with an `id` property.
+        :param name: The name of the shared memory block, or None for a random name.
+        :return: The published shared database, use the `name` attribute to attach to it.
+        :raises ValueError: Shared memory is not supported by this Python version.
+        """
+        shared_memory = _shared_memory_module()
+        layout = _Layout(records_json)
+        block = shared_memory.SharedMemory(name=name, create=True, size=max(layout.size, 1))
+        layout.write(block.buf)
+        return cls(block.buf, block, block.name)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedDatabase":
+        """Attach to a shared database published by another process.
+
+        :param name: The name of the shared memory block.
+        :return: The shared database.
+        :raises ValueError: Shared memory is not supported, or the block is not a shared database.
+        """
+        block = _attach_shared_memory(name)
+        return cls(block.buf, block, name)
+
+    @staticmethod
+    def write_file(records_json: Iterable[Dict], path_to_file: Union[Path, str]) -> None:
+        """Save records to a shared database file, which can be opened using :meth:`open_file`.
+
+        :param records_json: The records to save, as dicts with an `id` property.
+        :param path_to_file: The path to save the shared database file to.
+        """
+        layout = _Layout(records_json)
+        buffer = bytearray(layout.size)
+        layout.write(buffer)
+        with open(path_to_file, "wb") as out_file:
+            out_file.write(buffer)
+
+    @classmethod
+    def open_file(cls, path_to_file: Union[Path, str]) -> "SharedDatabase":
+        """Open a shared database file using mmap, so the pages are shared by every process.
+
+        :param path_to_file: The path to the shared database file.
+        :return: The shared database.
+        :raises ValueError: The file is not a shared database.
+        """
+        with open(path_to_file, "rb") as input_file:
+            mapped = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, mapped)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def locations(self) -> Dict[int, int]:
+        """Get the record number for each ID number, in ID number order.
+
+        :return: A dict of ID number to record number.
+        """
+        return dict(zip(self.ids, range(len(self.ids))))
+
+    def decode_json(self, record_number: int) -> Dict:
+        """Decode one record into a dict.
+
+        :param record_number: The record number (not the ID number).
+        :return: The decoded record.
+        """
+        start, end = OFFSETS.unpack_from(self._buffer, self._offsets_offset + 8 * record_number)
+        return json_codec.loads(self._buffer[self._records_offset + start:self._records_offset + end])
+
+    def close(self) -> None:
+        """Detach from the shared database. The published data is not removed."""
+        self._owner.close()
+
+    def unlink(self) -> None:
+        """Remove a shared database from shared memory, this should be called once by the publisher.
+
+        Processes that are attached can keep using the database until they close it.
+        """
+        if self.name is not None:
+            self._owner.unlink()
@@ -0,0 +1,125 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Process-wide, memoized database handles used by the `load()` functions of the
+items, monsters and prayers APIs.
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any
+    from typing import Callable
+    from typing import Dict
+    from typing import Tuple
+    from typing import Union
+
+
+def _source_version(path: str) -> Tuple[int, int]:
+    """Get the modification time and size of a database file or directory.
+
+    A directory is versioned by its own modification time, which changes when a
+    file is added or removed, but not when an existing file is modified.
+
+    :raises ValueError: The database file or directory does not exist.
+    """
+    if not os.path.exists(path):
+        raise ValueError("Error: Valid input not found. Exiting.")
+    stat_result = os.stat(path)
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+class SharedHandle:
+    """A memoized database handle, shared by every caller in the process.
+
+    One database object is kept for each source path. The cached object is
+    returned until the modification time or size of the source changes, or the
+    handle is reloaded or invalidated. Loading is done while holding a lock for
+    the source path, so concurrent first calls from several threads only load
+    the database once.
+
+    This module avoids importing pathlib, so that importing an API package stays fast.
+    Source paths are normalised to absolute path strings.
+
+    :param factory: A function that loads the database from a source path.
+    :param default_path: A function that returns the default source path.
+    """
+    def __init__(self, factory: Callable[[str], Any], default_path: Callable[[], Union["Path", str]]):
+        self._factory = factory
+        self._default_path = default_path
+        self._lock = threading.Lock()
+        self._path_locks: Dict[str, threading.Lock] = dict()
+        self._handles: Dict[str, Tuple[Tuple[int, int], Any]] = dict()
+
+    def _resolve(self, path: Union[Path, str, None]) -> str:
+        if path is None:
+            path = self._default_path()
+        return os.path.realpath(os.fspath(path))
+
+    def _path_lock(self, path: str) -> threading.Lock:
+        with self._lock:
+            return self._path_locks.setdefault(path, threading.Lock())
+
+    def get(self, path: Union[Path, str, None] = None) -> Any:
+        """Get the shared database object for a source path, loading it if needed.
+
+        :param path: The database source path, or None for the default path.
+        :return: The database object.
+        """
+        path = self._resolve(path)
+        with self._path_lock(path):
+            version = _source_version(path)
+            cached = self._handles.get(path)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            database = self._factory(path)
+            self._handles[path] = (version, database)
+            return database
+
+    def reload(self, path: Union[Path, str, None] = None) -> Any:
+        """Load the database again, and replace the shared database object.
+
+        :param path: The database source path, or None for the default path.
+        :return: The new database object.
+        """
+        path = self._resolve(path)
+        with self._path_lock(path):
+            version = _source_version(path)
+            database = self._factory(path)
+            self._handles[path] = (version, database)
+            return database
+
+    def invalidate(self, path: Union[Path, str, None] = None) -> None:
+        """Drop a shared database object, so the next call to :meth:`get` loads it again.
+
+        :param path: The database source path, or None to drop every shared database object.
+        """
+        if path is None:
+            with self._lock:
+                self._handles.clear()
+            return
+        path = self._resolve(path)
+        with self._path_lock(path):
+            self._handles.pop(path, None)
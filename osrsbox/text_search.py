@@ -0,0 +1,248 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Text search indexes used by the item and monster name searches.
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+import heapq
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+# The length of the substrings stored in the inverted index
+NGRAM_LENGTH = 3
+
+
+def ngrams(text: str, length: int = NGRAM_LENGTH) -> Set[str]:
+    """Get every distinct substring of a fixed length in a string.
+
+    :param text: The string to split.
+    :param length: The substring length.
+    :return: A set of substrings.
+    """
+    return {text[i:i + length] for i in range(len(text) - length + 1)}
+
+
+class TrigramIndex:
+    """An inverted index of trigrams (three character substrings) for substring search.
+
+    Every document is one or more strings (for example, an item name and wiki name)
+    and is identified by its position in the input. Searching for a keyword
+    intersects the posting lists of the keyword trigrams, smallest first, and
+    then verifies each remaining candidate with a plain substring check. Keywords
+    shorter than a trigram are checked against every document.
+
+    All text is converted to lower case, so a search is case insensitive.
+
+    :param documents: The strings for each document, `None` strings are skipped.
+    """
+    def __init__(self, documents: Iterable[Iterable[Optional[str]]]):
+        self._documents: List[Tuple[str, ...]] = list()
+        self._postings: Dict[str, Set[int]] = dict()
+
+        for position, texts in enumerate(documents):
+            texts = tuple(text.lower() for text in texts if text)
+            self._documents.append(texts)
+            for text in texts:
+                for trigram in ngrams(text):
+                    self._postings.setdefault(trigram, set()).add(position)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def search(self, keyword: str) -> List[int]:
+        """Find every document where any string contains the keyword.
+
+        :param keyword: The keyword to search for.
+        :return: A list of matching document positions, in ascending order.
+        """
+        keyword = keyword.lower()
+
+        if len(keyword) < NGRAM_LENGTH:
+            candidates = range(len(self._documents))
+        else:
+            postings = list()
+            for trigram in ngrams(keyword):
+                posting = self._postings.get(trigram)
+                if not posting:
+                    return list()
+                postings.append(posting)
+
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates &= posting
+                if not candidates:
+                    return list()
+            candidates = sorted(candidates)
+
+        return [position for position in candidates
+                if any(keyword in text for text in self._documents[position])]
+
+
+def _match_vectors(pattern: str) -> Dict[str, int]:
+    """Get a bit vector for each character in a pattern, with bit i set where the character is at position i."""
+    vectors: Dict[str, int] = dict()
+    for i, character in enumerate(pattern):
+        vectors[character] = vectors.get(character, 0) | (1 << i)
+    return vectors
+
+
+def _bit_parallel_distance(vectors: Dict[str, int], pattern_length: int, text: str) -> int:
+    """Calculate edit distance using the bit-parallel algorithm by Myers (1999), as formulated by Hyyro (2001).
+
+    Each column of the dynamic programming matrix is stored as two bit vectors
+    of positive and negative vertical deltas, so a column is computed with a
+    handful of integer operations, instead of one operation per cell.
+
+    :param vectors: The pattern bit vectors from :func:`_match_vectors`.
+    :param pattern_length: The length of the pattern.
+    :param text: The string to compare the pattern against.
+    :return: The edit distance between the pattern and the text.
+    """
+    if not pattern_length:
+        return len(text)
+
+    mask = (1 << pattern_length) - 1
+    last_bit = 1 << (pattern_length - 1)
+    positive_vertical = mask
+    negative_vertical = 0
+    distance = pattern_length
+
+    for character in text:
+        match = vectors.get(character, 0)
+        vertical = match | negative_vertical
+        horizontal = (((match & positive_vertical) + positive_vertical) ^ positive_vertical) | match
+        positive_horizontal = negative_vertical | (~(horizontal | positive_vertical) & mask)
+        negative_horizontal = positive_vertical & horizontal
+        if positive_horizontal & last_bit:
+            distance += 1
+        elif negative_horizontal & last_bit:
+            distance -= 1
+        positive_horizontal = ((positive_horizontal << 1) | 1) & mask
+        negative_horizontal = (negative_horizontal << 1) & mask
+        positive_vertical = negative_horizontal | (~(vertical | positive_horizontal) & mask)
+        negative_vertical = positive_horizontal & vertical
+
+    return distance
+
+
+def levenshtein(first: str, second: str) -> int:
+    """Calculate the edit distance (insertions, deletions and substitutions) between two strings.
+
+    :param first: The first string.
+    :param second: The second string.
+    :return: The minimum number of single character edits to change one string into the other.
+    """
+    return _bit_parallel_distance(_match_vectors(first), len(first), second)
+
+
+class BKTree:
+    """A Burkhard-Keller tree of strings for nearest neighbour search by edit distance.
+
+    Each child of a node is stored under its edit distance to the node. Because
+    edit distance is a metric, a search for strings within a distance `r` of a
+    query only needs to visit children stored under distances `d - r` to `d + r`,
+    where `d` is the distance from the query to the node. This avoids computing
+    the edit distance between the query and most strings in the tree.
+
+    :param terms: The strings to store, duplicates are ignored.
+    """
+    def __init__(self, terms: Iterable[str]):
+        self._root: Optional[list] = None
+        self._size = 0
+        for term in terms:
+            self.add(term)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, term: str) -> None:
+        """Add a string to the tree.
+
+        :param term: The string to add.
+        """
+        if self._root is None:
+            self._root = [term, dict()]
+            self._size += 1
+            return
+
+        vectors = _match_vectors(term)
+        node = self._root
+        while True:
+            distance = _bit_parallel_distance(vectors, len(term), node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [term, dict()]
+                self._size += 1
+                return
+            node = child
+
+    def nearest(self, term: str, limit: int, max_distance: int) -> List[Tuple[int, str]]:
+        """Find the strings closest to a query string.
+
+        The search radius starts at `max_distance`, and shrinks to the distance of
+        the worst match found so far once `limit` matches have been found.
+
+        :param term: The query string.
+        :param limit: The maximum number of matches to return.
+        :param max_distance: The maximum edit distance of a match.
+        :return: A list of (distance, string) tuples, closest first, then alphabetical.
+        """
+        if self._root is None or limit < 1:
+            return list()
+
+        # Max heap (using negated values) of the best matches found so far
+        best: List[Tuple[int, _Reversed]] = list()
+        radius = max_distance
+        vectors = _match_vectors(term)
+        nodes = [self._root]
+        while nodes:
+            node_term, children = nodes.pop()
+            distance = _bit_parallel_distance(vectors, len(term), node_term)
+
+            if distance <= radius:
+                heapq.heappush(best, (-distance, _Reversed(node_term)))
+                if len(best) > limit:
+                    heapq.heappop(best)
+                if len(best) == limit:
+                    radius = -best[0][0]
+
+            for child_distance, child in children.items():
+                if distance - radius <= child_distance <= distance + radius:
+                    nodes.append(child)
+
+        return sorted((-distance, reversed_term.value) for distance, reversed_term in best)
+
+
+class _Reversed:
+    """Reverse the ordering of a string, so the max heap in :meth:`BKTree.nearest` keeps alphabetical ties."""
+    __slots__ = ("value",)
+
+    def __init__(self, value: str):
+        self.value = value
+
+    def __lt__(self, other: "_Reversed") -> bool:
+        return self.value > other.value
@@ -0,0 +1,271 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+A warm-start cache of loaded databases, stored in the user cache directory.
+
+Each cache file holds the built records (for example, ItemProperties objects)
+of one database source, and is named using a hash of the source path and a
+content hash of the source JSON file or folder. When the source changes the
+content hash no longer matches, so the cache is ignored and the database is
+loaded from JSON (and cached again), replacing the old cache file of the same
+source. Different sources of one database keep separate cache files. The hash also
+covers the osrsbox and Python versions, the cache format version and the
+record class fields, so an upgraded package never reads an old cache.
+
+Records are stored in a compact format: each dataclass object is converted to a
+tuple of a class number and its field values, and the rows are serialised
+using marshal. Loading calls each dataclass constructor with the stored values,
+which is faster than unpickling the object graph (pickle restores each slot
+one at a time), and marshal cannot create arbitrary objects.
+
+The cache directory is `$OSRSBOX_CACHE_DIR` if set, otherwise `osrsbox` in
+`$XDG_CACHE_HOME` (or `~/.cache`).
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+import hashlib
+import importlib
+import marshal
+import os
+import sys
+import tempfile
+from dataclasses import fields
+from dataclasses import is_dataclass
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from osrsbox import __version__
+
+CACHE_FORMAT_VERSION = 1
+CACHE_FILE_SUFFIX = ".cache"
+
+# The size of each block read when hashing a source file
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def cache_directory() -> Path:
+    """Get the directory used to store warm-start cache files.
+
+    :return: The path to the cache directory, which may not exist yet.
+    """
+    if os.environ.get("OSRSBOX_CACHE_DIR"):
+        return Path(os.environ["OSRSBOX_CACHE_DIR"])
+    if os.environ.get("XDG_CACHE_HOME"):
+        return Path(os.environ["XDG_CACHE_HOME"]) / "osrsbox"
+    return Path.home() / ".cache" / "osrsbox"
+
+
+def _hash_file(digest, path_to_file: Path) -> None:
+    with open(path_to_file, "rb") as input_file:
+        block = input_file.read(HASH_BLOCK_SIZE)
+        while block:
+            digest.update(block)
+            block = input_file.read(HASH_BLOCK_SIZE)
+
+
+def source_digest(path: Path, record_cls: type) -> str:
+    """Calculate the cache key for a database source.
+
+    :param path: The source JSON file, or folder of JSON files.
+    :param record_cls: The dataclass of the cached records.
+    :return: A hex digest of the source content, record class fields and package and Python versions.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{__version__}:{CACHE_FORMAT_VERSION}:{sys.version_info[:2]}:{marshal.version}:".encode("utf-8"))
+    digest.update(f"{record_cls.__module__}.{record_cls.__qualname__}:".encode("utf-8"))
+    digest.update(",".join(field.name for field in fields(record_cls)).encode("utf-8"))
+
+    if path.is_dir():
+        for path_to_file in sorted(path.glob("*.json")):
+            digest.update(path_to_file.name.encode("utf-8") + b"\x00")
+            _hash_file(digest, path_to_file)
+    else:
+        _hash_file(digest, path)
+
+    return digest.hexdigest()
+
+
+def source_prefix(database_name: str, path: Path) -> str:
+    """Get the cache file name prefix for a database source.
+
+    Every cache file of one source path shares the prefix, so a new cache file only
+    replaces the cache files of the same source, and not the cache files of another
+    source of the same database (for example, a JSON file and a folder of JSON files).
+
+    :param database_name: The database name, for example `items`.
+    :param path: The source JSON file, or folder of JSON files.
+    :return: The database name, and a hash of the resolved source path.
+    """
+    resolved_path = os.path.normcase(str(Path(path).resolve()))
+    return f"{database_name}-{hashlib.sha256(resolved_path.encode('utf-8')).hexdigest()[:16]}"
+
+
+def cache_file_path(database_name: str, path: Path, record_cls: type) -> Path:
+    """Get the cache file path for a database source.
+
+    :param database_name: The database name, for example `items`.
+    :param path: The source JSON file, or folder of JSON files.
+    :param record_cls: The dataclass of the cached records.
+    :return: The path to the cache file, which may not exist.
+    """
+    return cache_directory() / f"{source_prefix(database_name, path)}-{source_digest(path, record_cls)}{CACHE_FILE_SUFFIX}"
+
+
+def _holds_dataclass(value: Any) -> bool:
+    if isinstance(value, list):
+        return any(_holds_dataclass(entry) for entry in value)
+    return is_dataclass(value)
+
+
+class _Encoder:
+    """Convert dataclass objects (including nested objects, and lists of objects) to plain tuples.
+
+    Each object becomes a tuple of its class number and field values. The encoder
+    records which fields of each class held objects, so decoding only needs to
+    visit those fields.
+    """
+    def __init__(self):
+        self.classes: List[type] = list()
+        self._class_numbers: Dict[type, int] = dict()
+        self._field_names: List[List[str]] = list()
+        self._nested_fields: List[set] = list()
+
+    def encode(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self.encode(entry) for entry in value]
+        if not is_dataclass(value):
+            return value
+
+        cls = type(value)
+        class_number = self._class_numbers.get(cls)
+        if class_number is None:
+            class_number = self._class_numbers[cls] = len(self.classes)
+            self.classes.append(cls)
+            self._field_names.append([field.name for field in fields(cls)])
+            self._nested_fields.append(set())
+
+        row = [class_number]
+        for index, name in enumerate(self._field_names[class_number]):
+            field_value = getattr(value, name)
+            if _holds_dataclass(field_value):
+                self._nested_fields[class_number].add(index)
+                field_value = self.encode(field_value)
+            row.append(field_value)
+        return tuple(row)
+
+    def class_table(self) -> List[List]:
+        return [[cls.__module__, cls.__qualname__, field_names, sorted(nested_fields)]
+                for cls, field_names, nested_fields in zip(self.classes, self._field_names, self._nested_fields)]
+
+
+def _resolve_classes(class_table: List[List]) -> Optional[List[type]]:
+    """Import the classes in a cache file class table, or None if any class has changed."""
+    classes = list()
+    for module_name, qualname, field_names, _ in class_table:
+        cls = importlib.import_module(module_name)
+        for name in qualname.split("."):
+            cls = getattr(cls, name)
+        if [field.name for field in fields(cls)] != field_names:
+            return None
+        classes.append(cls)
+    return classes
+
+
+def _decode(value: Any, classes: List[type], nested_fields: List[List[int]]) -> Any:
+    if isinstance(value, list):
+        # Objects without nested objects (for example, monster drops) are built inline
+        return [classes[entry[0]](*entry[1:]) if not nested_fields[entry[0]] else
+                _decode(entry, classes, nested_fields) for entry in value]
+
+    class_number = value[0]
+    arguments = list(value[1:])
+    for index in nested_fields[class_number]:
+        if arguments[index] is not None:
+            arguments[index] = _decode(arguments[index], classes, nested_fields)
+    return classes[class_number](*arguments)
+
+
+def read_cache(path_to_cache_file: Path) -> Optional[List]:
+    """Load the records from a cache file.
+
+    :param path_to_cache_file: The path to the cache file.
+    :return: The list of records, or None if the cache file is missing or cannot be read.
+    """
+    try:
+        with open(path_to_cache_file, "rb") as cache_file:
+            data = cache_file.read()
+    except OSError:
+        # A missing cache file is a cache miss
+        return None
+
+    try:
+        format_version, class_table, rows = marshal.loads(data)
+        if format_version != CACHE_FORMAT_VERSION:
+            return None
+        classes = _resolve_classes(class_table)
+        if classes is None:
+            return None
+        nested_fields = [entry[3] for entry in class_table]
+        return [_decode(row, classes, nested_fields) for row in rows]
+    except Exception:
+        # A damaged cache file, or one written by another version, can fail in many ways
+        # while it is decoded. It is a cache miss, and is replaced by the next write
+        return None
+
+
+def write_cache(path_to_cache_file: Path, records: List) -> None:
+    """Save the records to a cache file, and remove stale cache files for the same source.
+
+    The file is written to a temporary file and then renamed, so a concurrent reader
+    never sees a partly written cache. Only cache files with the same source prefix
+    (see :func:`source_prefix`) are removed. Failing to write the cache (for example,
+    a read-only cache directory) is not an error.
+
+    :param path_to_cache_file: The path to the cache file, from :func:`cache_file_path`.
+    :param records: The list of dataclass records to save.
+    """
+    encoder = _Encoder()
+    rows = [encoder.encode(record) for record in records]
+    data = marshal.dumps((CACHE_FORMAT_VERSION, encoder.class_table(), rows))
+
+    try:
+        path_to_cache_file.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=path_to_cache_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as cache_file:
+                cache_file.write(data)
+            os.replace(temporary_path, path_to_cache_file)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    except OSError:
+        return
+
+    prefix = path_to_cache_file.name.rsplit("-", 1)[0]
+    for stale_cache_file in path_to_cache_file.parent.glob(f"{prefix}-*{CACHE_FILE_SUFFIX}"):
+        if stale_cache_file != path_to_cache_file:
+            try:
+                stale_cache_file.unlink()
+            except OSError:
+                # Another process may have removed the file first
+                pass
@@ -0,0 +1,392 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+A benchmark suite for the public items, monsters and prayers APIs.
+
+Each benchmark times one API path (for example, loading the items database,
+or looking up items by name) on the real databases. Inputs are sampled with a
+fixed seed, every benchmark is run once to warm up before it is timed, and the
+garbage collector is disabled while timing (as timeit does), so results are
+repeatable. Results are printed as a table, and can be saved as JSON.
+
+Regression mode compares the results against a baseline JSON file (saved by a
+previous run using --output), and exits with status 1 if any benchmark is slower
+than the baseline by more than the tolerance.
+
+Usage:
+python3 api_suite.py --repeats 5 --output benchmarks.json
+python3 api_suite.py --baseline benchmarks.json --tolerance 0.2
+python3 api_suite.py --filter items.lookup
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from osrsbox import __version__
+from osrsbox import items_api
+from osrsbox import monsters_api
+from osrsbox import prayers_api
+from osrsbox.items_api.all_items import AllItems
+from osrsbox.monsters_api.all_monsters import AllMonsters
+
+# The seed used to sample benchmark inputs
+SEED = 0
+
+# The number of items sampled for the lookup benchmarks
+LOOKUP_SAMPLE_SIZE = 1000
+
+# Typical search keywords, from short prefixes to full names
+SEARCH_KEYWORDS = ["dra", "drag", "dragon", "rune pl", "abyssal whip", "potion(4)", "zulrah", "of the"]
+
+# The statistic compared against the baseline in regression mode
+STATISTICS = ("min", "median", "mean")
+
+
+class Benchmark:
+    """One benchmark in the suite.
+
+    :param name: The benchmark name, the first part is the database (for example, `items.load.cold`).
+    :param setup: A function that prepares the benchmark (not timed), and returns the function to time.
+    :param number: The number of times the timed function is called in each run.
+    :param description: A short description of the API path.
+    """
+    def __init__(self, name: str, setup: Callable[[], Callable[[], object]], number: int, description: str):
+        self.name = name
+        self.setup = setup
+        self.number = number
+        self.description = description
+
+
+BENCHMARKS: List[Benchmark] = list()
+
+
+def benchmark(name: str, number: int = 1) -> Callable:
+    """Register a setup function as a benchmark, using the first line of its docstring as the description."""
+    def register(setup: Callable[[], Callable[[], object]]) -> Callable[[], Callable[[], object]]:
+        BENCHMARKS.append(Benchmark(name, setup, number, setup.__doc__.strip().splitlines()[0]))
+        return setup
+    return register
+
+
+def _sample(population: List, size: int) -> List:
+    return random.Random(SEED).sample(population, min(size, len(population)))
+
+
+# Items benchmarks
+
+@benchmark("items.load.cold")
+def items_load_cold() -> Callable[[], object]:
+    """items_api.load() after invalidate(), loading items-complete.json."""
+    def run():
+        items_api.invalidate()
+        return items_api.load()
+    return run
+
+
+@benchmark("items.load.warm", number=1000)
+def items_load_warm() -> Callable[[], object]:
+    """items_api.load() returning the shared database."""
+    items_api.load()
+    return items_api.load
+
+
+@benchmark("items.load.warm_cache")
+def items_load_warm_cache() -> Callable[[], object]:
+    """AllItems(use_cache=True) from a primed warm-start cache."""
+    AllItems(use_cache=True)
+    return lambda: AllItems(use_cache=True)
+
+
+@benchmark("items.lookup_by_item_id", number=10)
+def items_lookup_by_item_id() -> Callable[[], object]:
+    """lookup_by_item_id() for 1000 sampled item IDs."""
+    all_db_items = items_api.load()
+    item_ids = _sample([item.id for item in all_db_items], LOOKUP_SAMPLE_SIZE)
+    return lambda: [all_db_items.lookup_by_item_id(item_id) for item_id in item_ids]
+
+
+@benchmark("items.lookup_by_item_name", number=10)
+def items_lookup_by_item_name() -> Callable[[], object]:
+    """lookup_by_item_name() for 1000 sampled item names."""
+    all_db_items = items_api.load()
+    item_names = _sample([item.name for item in all_db_items], LOOKUP_SAMPLE_SIZE)
+    all_db_items.lookup_by_item_name(item_names[0])
+    return lambda: [all_db_items.lookup_by_item_name(item_name) for item_name in item_names]
+
+
+@benchmark("items.search_item_names", number=10)
+def items_search_item_names() -> Callable[[], object]:
+    """search_item_names() for each search keyword."""
+    all_db_items = items_api.load()
+    all_db_items.search_item_names(SEARCH_KEYWORDS[0])
+    return lambda: [all_db_items.search_item_names(keyword) for keyword in SEARCH_KEYWORDS]
+
+
+@benchmark("items.iterate")
+def items_iterate() -> Callable[[], object]:
+    """Loop over every item, reading the highalch property."""
+    all_db_items = items_api.load()
+    return lambda: sum(item.highalch or 0 for item in all_db_items)
+
+
+@benchmark("items.construct_json")
+def items_construct_json() -> Callable[[], object]:
+    """construct_json() for every item."""
+    all_db_items = items_api.load()
+    return lambda: [item.construct_json() for item in all_db_items]
+
+
+# Monsters benchmarks
+
+@benchmark("monsters.load.cold")
+def monsters_load_cold() -> Callable[[], object]:
+    """monsters_api.load() after invalidate(), loading monsters-complete.json."""
+    def run():
+        monsters_api.invalidate()
+        return monsters_api.load()
+    return run
+
+
+@benchmark("monsters.load.warm", number=1000)
+def monsters_load_warm() -> Callable[[], object]:
+    """monsters_api.load() returning the shared database."""
+    monsters_api.load()
+    return monsters_api.load
+
+
+@benchmark("monsters.load.warm_cache")
+def monsters_load_warm_cache() -> Callable[[], object]:
+    """AllMonsters(use_cache=True) from a primed warm-start cache."""
+    AllMonsters(use_cache=True)
+    return lambda: AllMonsters(use_cache=True)
+
+
+@benchmark("monsters.iterate")
+def monsters_iterate() -> Callable[[], object]:
+    """Loop over every monster, reading the combat_level property."""
+    all_db_monsters = monsters_api.load()
+    return lambda: sum(monster.combat_level for monster in all_db_monsters)
+
+
+@benchmark("monsters.construct_json")
+def monsters_construct_json() -> Callable[[], object]:
+    """construct_json() for every monster."""
+    all_db_monsters = monsters_api.load()
+    return lambda: [monster.construct_json() for monster in all_db_monsters]
+
+
+@benchmark("monsters.drops.search_name")
+def monsters_drops_search_name() -> Callable[[], object]:
+    """Scan every drop for a name keyword, as in search_monster_drops.py."""
+    all_db_monsters = monsters_api.load()
+    return lambda: [monster.id for monster in all_db_monsters
+                    for drop in monster.drops if "prayer potion" in drop.name.lower()]
+
+
+@benchmark("monsters.drops.rarest")
+def monsters_drops_rarest() -> Callable[[], object]:
+    """Scan every drop for the rarest drop rate, as in find_rarest_drops.py."""
+    all_db_monsters = monsters_api.load()
+    return lambda: min(drop.rarity for monster in all_db_monsters for drop in monster.drops if drop.rarity)
+
+
+@benchmark("monsters.slayer_assignments")
+def monsters_slayer_assignments() -> Callable[[], object]:
+    """Group slayer monsters by slayer master, as in print_slayer_tasks.py."""
+    all_db_monsters = monsters_api.load()
+
+    def run():
+        assignments = dict()
+        for monster in all_db_monsters:
+            if monster.slayer_monster:
+                for slayer_master in monster.slayer_masters:
+                    assignments.setdefault(slayer_master, set()).add(monster.name)
+        return assignments
+    return run
+
+
+# Prayers benchmarks
+
+@benchmark("prayers.load.cold", number=10)
+def prayers_load_cold() -> Callable[[], object]:
+    """prayers_api.load() after invalidate(), loading prayers-complete.json."""
+    def run():
+        prayers_api.invalidate()
+        return prayers_api.load()
+    return run
+
+
+@benchmark("prayers.iterate", number=1000)
+def prayers_iterate() -> Callable[[], object]:
+    """Loop over every prayer, reading the drain_per_minute property."""
+    all_db_prayers = prayers_api.load()
+    return lambda: sum(prayer.drain_per_minute for prayer in all_db_prayers)
+
+
+@benchmark("prayers.construct_json", number=100)
+def prayers_construct_json() -> Callable[[], object]:
+    """construct_json() for every prayer."""
+    all_db_prayers = prayers_api.load()
+    return lambda: [prayer.construct_json() for prayer in all_db_prayers]
+
+
+def run_benchmark(bench: Benchmark, repeats: int, disable_gc: bool) -> Dict:
+    """Run one benchmark, and get the time of each call (in seconds) for each run."""
+    function = bench.setup()
+    function()
+
+    runs = list()
+    for _ in range(repeats):
+        gc.collect()
+        if disable_gc:
+            gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(bench.number):
+                function()
+            runs.append((time.perf_counter() - start) / bench.number)
+        finally:
+            gc.enable()
+
+    return {
+        "description": bench.description,
+        "number": bench.number,
+        "repeats": repeats,
+        "runs": runs,
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "mean": statistics.mean(runs),
+        "stdev": statistics.stdev(runs) if len(runs) > 1 else 0.0,
+    }
+
+
+def metadata(repeats: int, disable_gc: bool) -> Dict:
+    return {
+        "osrsbox_version": __version__,
+        "python_version": platform.python_version(),
+        "python_implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "repeats": repeats,
+        "disable_gc": disable_gc,
+    }
+
+
+def format_time(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.3f} us"
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], statistic: str, tolerance: float) -> List[str]:
+    """Compare results against a baseline, and print a table of the ratio of each benchmark.
+
+    :return: The names of the benchmarks slower than the baseline by more than the tolerance.
+    """
+    regressions = list()
+    print(f"{'Benchmark':<32} {'Baseline':>12} {'Current':>12} {'Ratio':>7}  Status")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<32} {'-':>12} {format_time(result[statistic]):>12} {'-':>7}  new")
+            continue
+        ratio = result[statistic] / baseline[name][statistic]
+        if ratio > 1 + tolerance:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - tolerance:
+            status = "faster"
+        else:
+            status = "ok"
+        print(f"{name:<32} {format_time(baseline[name][statistic]):>12} {format_time(result[statistic]):>12} "
+              f"{ratio:>6.2f}x  {status}")
+    return regressions
+
+
+def main(repeats: int, name_filter: Optional[str], output: Optional[Path], baseline: Optional[Path],
+         tolerance: float, statistic: str, disable_gc: bool) -> int:
+    selected = [bench for bench in BENCHMARKS if not name_filter or name_filter in bench.name]
+    if not selected:
+        raise ValueError(f"Error: No benchmarks match the filter: {name_filter}. Exiting.")
+
+    results = dict()
+    print(f"{'Benchmark':<32} {'Min':>12} {'Median':>12} {'Stdev':>12}")
+    with tempfile.TemporaryDirectory() as cache_directory:
+        # The warm-start cache benchmarks use a temporary cache, so the user cache directory is not changed
+        os.environ["OSRSBOX_CACHE_DIR"] = cache_directory
+        for bench in selected:
+            result = run_benchmark(bench, repeats, disable_gc)
+            results[bench.name] = result
+            print(f"{bench.name:<32} {format_time(result['min']):>12} {format_time(result['median']):>12} "
+                  f"{format_time(result['stdev']):>12}")
+
+    if output:
+        with open(output, "w") as out_file:
+            json.dump({"metadata": metadata(repeats, disable_gc), "results": results}, out_file, indent=4)
+        print(f"\nResults saved to {output}")
+
+    if baseline:
+        with open(baseline) as input_file:
+            baseline_results = json.load(input_file)["results"]
+        print(f"\nComparing {statistic} times against {baseline} (tolerance {tolerance:.0%})")
+        regressions = compare(results, baseline_results, statistic, tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the items, monsters and prayers APIs.")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of timed runs of each benchmark.")
+    parser.add_argument("--filter", help="Only run benchmarks with names containing this text.")
+    parser.add_argument("--output", type=Path, help="Save the results to this JSON file.")
+    parser.add_argument("--baseline", type=Path, help="Compare the results against this JSON results file.")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown against the baseline, as a fraction (0.2 is 20%%).")
+    parser.add_argument("--statistic", choices=STATISTICS, default="median",
+                        help="The statistic compared against the baseline.")
+    parser.add_argument("--keep-gc", action="store_true", help="Keep the garbage collector enabled while timing.")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks, and exit.")
+    args = parser.parse_args()
+
+    if args.list:
+        for bench in BENCHMARKS:
+            print(f"{bench.name:<32} {bench.description}")
+        sys.exit(0)
+
+    sys.exit(main(args.repeats, args.filter, args.output, args.baseline, args.tolerance, args.statistic,
+                  not args.keep_gc))
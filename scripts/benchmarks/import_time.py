@@ -0,0 +1,101 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Benchmark the import time of the osrsbox package modules, using the
+`python -X importtime` option. Each module is imported in a new Python
+process, and the fastest run is reported, with the slowest imports it caused.
+
+Usage:
+python3 import_time.py --repeats 5 --top 5
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+MODULES = [
+    "osrsbox",
+    "osrsbox.items_api",
+    "osrsbox.monsters_api",
+    "osrsbox.prayers_api",
+    "osrsbox.items_api.all_items",
+    "osrsbox.monsters_api.all_monsters",
+    "osrsbox.prayers_api.all_prayers",
+]
+
+# The repository root, so the osrsbox package in this repository is imported
+REPOSITORY_PATH = Path(__file__).absolute().parent.parent.parent
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """Import a module in a new Python process, and get the cumulative import time of every module it imported.
+
+    :param module: The module name.
+    :return: A dict of module name to cumulative import time, in microseconds.
+    """
+    environment = dict(os.environ, PYTHONPATH=str(REPOSITORY_PATH))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            env=environment, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+
+    times = dict()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def benchmark(module: str, repeats: int) -> Tuple[int, List[Tuple[str, int]]]:
+    """Get the fastest import time of a module, and the imports of the fastest run.
+
+    :param module: The module name.
+    :param repeats: The number of times to import the module.
+    :return: The import time in microseconds, and a list of (module name, import time) tuples.
+    """
+    best = None
+    for _ in range(repeats):
+        times = import_times(module)
+        if best is None or times[module] < best[module]:
+            best = times
+    slowest = sorted(((name, time) for name, time in best.items() if name != module), key=lambda x: -x[1])
+    return best[module], slowest
+
+
+def main(repeats: int, top: int):
+    for module in MODULES:
+        total, slowest = benchmark(module, repeats)
+        print(f"{module}: {total / 1000:.1f} ms")
+        for name, time in slowest[:top]:
+            print(f"    {name:<45} {time / 1000:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark osrsbox module import times.")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of times each module is imported.")
+    parser.add_argument("--top", type=int, default=5, help="Number of the slowest nested imports to show.")
+    args = parser.parse_args()
+
+    main(args.repeats, args.top)
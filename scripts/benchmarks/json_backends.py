@@ -0,0 +1,102 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Benchmark decoding the osrsbox-db data files using each installed JSON backend
+of osrsbox.json_codec, and encoding them using json_codec.dump against json.dump.
+Each backend is checked to decode the same objects as the standard library, and
+json_codec.dump is checked to write the same bytes as json.dump.
+
+Usage:
+python3 json_backends.py --repeats 3
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+import argparse
+import io
+import json
+import time
+from pathlib import Path
+from typing import Callable
+
+import config
+from osrsbox import json_codec
+
+DATA_FILES = (
+    Path(config.DOCS_PATH / "items-complete.json"),
+    Path(config.DOCS_PATH / "monsters-complete.json"),
+    Path(config.DOCS_PATH / "prayers-complete.json"),
+    Path(config.DOCS_PATH / "items-search.json"),
+    Path(config.DATA_MONSTERS_PATH / "monsters-cache-data.json"),
+)
+
+
+def best_time(function: Callable, repeats: int) -> float:
+    """Get the fastest run time, in seconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeats: int):
+    backends = json_codec.available_backends()
+    print(f"Installed backends: {', '.join(backends)}")
+
+    print(f"{'File':<28} {'Size (MB)':>9} " + " ".join(f"{name + ' (s)':>13}" for name in backends))
+    for path_to_file in DATA_FILES:
+        if not path_to_file.is_file():
+            continue
+        data = path_to_file.read_bytes()
+        expected = json.loads(data)
+
+        timings = list()
+        for name in backends:
+            json_codec.set_backend(name)
+            if json_codec.loads(data) != expected:
+                raise ValueError(f"Error: {name} decoded {path_to_file.name} differently. Exiting.")
+            timings.append(best_time(lambda: json_codec.loads(data), repeats))
+        print(f"{path_to_file.name:<28} {len(data) / 1e6:>9.1f} " + " ".join(f"{timing:>13.3f}" for timing in timings))
+
+    print()
+    print(f"{'File':<28} {'json.dump (s)':>13} {'json_codec.dump (s)':>19}")
+    for path_to_file in DATA_FILES:
+        if not path_to_file.is_file():
+            continue
+        data = json.loads(path_to_file.read_bytes())
+        for indent in (None, 4):
+            json_out = io.StringIO()
+            json.dump(data, json_out, indent=indent)
+            codec_out = io.StringIO()
+            json_codec.dump(data, codec_out, indent=indent)
+            if json_out.getvalue() != codec_out.getvalue():
+                raise ValueError(f"Error: json_codec.dump output differs for {path_to_file.name}. Exiting.")
+
+        json_time = best_time(lambda: json.dump(data, io.StringIO()), repeats)
+        codec_time = best_time(lambda: json_codec.dump(data, io.StringIO()), repeats)
+        print(f"{path_to_file.name:<28} {json_time:>13.3f} {codec_time:>19.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the JSON backends on the osrsbox-db data files.")
+    parser.add_argument("--repeats", type=int, default=3, help="Number of times each decode or encode is repeated.")
+    args = parser.parse_args()
+
+    main(args.repeats)
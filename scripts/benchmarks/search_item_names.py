@@ -0,0 +1,104 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Benchmark AllItems.search_item_names, comparing the trigram index against
+the original full scan. The benchmark runs on the real item database, and on
+a synthetic database of generated item names (1 million by default).
+
+Usage:
+python3 search_item_names.py --synthetic-count 1000000
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+import argparse
+import random
+import time
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from osrsbox import items_api
+from osrsbox.text_search import TrigramIndex
+
+# Typical autocomplete keywords, from short prefixes to full names
+KEYWORDS = ["dra", "drag", "dragon", "rune pl", "abyssal whip", "potion(4)", "zulrah", "of the"]
+
+
+def full_scan(documents: List[Tuple[str, Optional[str]]], keyword: str) -> List[int]:
+    """The original search_item_names algorithm, over (name, wiki_name) tuples."""
+    results = list()
+    for position, (name, wiki_name) in enumerate(documents):
+        if keyword.lower() in name.lower():
+            results.append(position)
+        elif wiki_name:
+            if keyword.lower() in wiki_name.lower():
+                results.append(position)
+    return results
+
+
+def synthetic_documents(documents: List[Tuple[str, Optional[str]]], count: int) -> List[Tuple[str, Optional[str]]]:
+    """Generate item names by joining words from real item names."""
+    random.seed(0)
+    words = sorted({word for name, _ in documents for word in name.split()})
+    generated = list()
+    for _ in range(count):
+        name = " ".join(random.choice(words) for _ in range(random.randint(1, 4)))
+        generated.append((name, name if random.random() < 0.5 else None))
+    return generated
+
+
+def benchmark(label: str, documents: List[Tuple[str, Optional[str]]], repeats: int):
+    start = time.perf_counter()
+    index = TrigramIndex(documents)
+    build_time = time.perf_counter() - start
+
+    print(f"{label}: {len(documents)} items, index built in {build_time:.3f}s")
+    print(f"{'Keyword':<15} {'Matches':>8} {'Scan (ms)':>10} {'Index (ms)':>11} {'Speed-up':>9}")
+    for keyword in KEYWORDS:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            expected = full_scan(documents, keyword)
+        scan_time = (time.perf_counter() - start) / repeats
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            found = index.search(keyword)
+        index_time = (time.perf_counter() - start) / repeats
+
+        assert found == expected, f"Index results differ from full scan for: {keyword}"
+        print(f"{keyword:<15} {len(found):>8} {scan_time * 1000:>10.2f} {index_time * 1000:>11.3f} "
+              f"{scan_time / index_time:>8.1f}x")
+    print()
+
+
+def main(synthetic_count: int, repeats: int):
+    all_db_items = items_api.load()
+    documents = [(item.name, item.wiki_name) for item in all_db_items]
+
+    benchmark("Item database", documents, repeats)
+    benchmark("Synthetic database", synthetic_documents(documents, synthetic_count), max(1, repeats // 10))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark item name search.")
+    parser.add_argument("--synthetic-count", type=int, default=1000000, help="Number of synthetic items.")
+    parser.add_argument("--repeats", type=int, default=10, help="Number of times each search is repeated.")
+    args = parser.parse_args()
+
+    main(args.synthetic_count, args.repeats)
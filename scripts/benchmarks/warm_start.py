@@ -0,0 +1,67 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Benchmark loading the items, monsters and prayers databases from JSON (a cold
+start), against loading them from the warm-start cache. A temporary cache
+directory is used, so the user cache directory is not changed.
+
+Usage:
+python3 warm_start.py --repeats 5
+
+Copyright (c) 2021, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable
+
+from osrsbox.items_api.all_items import AllItems
+from osrsbox.monsters_api.all_monsters import AllMonsters
+from osrsbox.prayers_api.all_prayers import AllPrayers
+
+
+def time_load(load: Callable, repeats: int) -> float:
+    """Get the fastest load time, in seconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        load()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeats: int):
+    with tempfile.TemporaryDirectory() as cache_directory:
+        os.environ["OSRSBOX_CACHE_DIR"] = cache_directory
+
+        print(f"{'Database':<10} {'Cold (s)':>9} {'Cache write (s)':>16} {'Warm (s)':>9} {'Speed-up':>9}")
+        for name, database_cls in (("items", AllItems), ("monsters", AllMonsters), ("prayers", AllPrayers)):
+            cold_time = time_load(lambda: database_cls(), repeats)
+            write_time = time_load(lambda: database_cls(use_cache=True), 1)
+            warm_time = time_load(lambda: database_cls(use_cache=True), repeats)
+            print(f"{name:<10} {cold_time:>9.3f} {write_time:>16.3f} {warm_time:>9.3f} {cold_time / warm_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark cold and warm-start database loading.")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of times each load is repeated.")
+    args = parser.parse_args()
+
+    main(args.repeats)
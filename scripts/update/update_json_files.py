@@ -21,11 +21,10 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
-import json
-import collections
 from pathlib import Path
 
 import config
+from osrsbox import json_codec
 from osrsbox import items_api
 from osrsbox import monsters_api
 from osrsbox import prayers_api
@@ -46,12 +45,26 @@ def generate_items_complete():
     # Save all items to docs/items_complete.json
     out_fi = Path(config.DOCS_PATH / "items-complete.json")
     with open(out_fi, "w") as f:
-        json.dump(items, f)
+        json_codec.dump(items, f)
 
     # Save all items to osrsbox/docs/items_complete.json
     out_fi = Path(config.PACKAGE_PATH / "docs" / "items-complete.json")
     with open(out_fi, "w") as f:
-        json.dump(items, f)
+        json_codec.dump(items, f)
+
+
+def generate_items_snapshot():
+    """Generate the `docs/items-complete.bin` snapshot from `docs/items-complete.json`."""
+    path_to_items_complete = Path(config.DOCS_PATH / "items-complete.json")
+    out_fi = Path(config.DOCS_PATH / "items-complete.bin")
+    items_api.item_snapshot.write_items_snapshot(path_to_items_complete, out_fi)
+
+
+def generate_items_icons_pack():
+    """Generate the `docs/items-icons.bin` packed icon file from `docs/items-icons`."""
+    path_to_items_icons = Path(config.DOCS_PATH / "items-icons")
+    out_fi = Path(config.DOCS_PATH / "items-icons.bin")
+    items_api.item_icons.write_packed_icons(path_to_items_icons, out_fi)
 
 
 def generate_item_slot_files():
@@ -59,22 +72,15 @@ def generate_item_slot_files():
     # Read in the item database content
     all_db_items = items_api.load()
 
-    items = collections.defaultdict(list)
-
-    # Fetch every equipable item with an item slot value
-    for item in all_db_items:
-        if item.equipable_by_player:
-            items[item.equipment.slot].append(item)
-
-    # Process each item found, and add to an individual file for each equipment slot
-    for slot in items:
+    # Process every equipable item, and add to an individual file for each equipment slot
+    for slot in all_db_items.equipment_slots():
         json_out = {}
-        for item in items[slot]:
-            json_out_temp = item.construct_json()
-            json_out[item.id] = json_out_temp
+        for item_id in all_db_items.item_ids_by_slot(slot):
+            json_out_temp = all_db_items[item_id].construct_json()
+            json_out[item_id] = json_out_temp
         out_fi = Path(config.DOCS_PATH / "items-json-slot" / f"items-{slot}.json")
         with open(out_fi, "w") as f:
-            json.dump(json_out, f)
+            json_codec.dump(json_out, f)
 
 
 def generate_monsters_complete():
@@ -92,12 +98,12 @@ def generate_monsters_complete():
     # Save all monsters to docs/monsters-complete.json
     out_fi = Path(config.DOCS_PATH / "monsters-complete.json")
     with open(out_fi, "w") as f:
-        json.dump(monsters, f)
+        json_codec.dump(monsters, f)
 
     # Save all monsters to osrsbox/docs/monsters-complete.json
     out_fi = Path(config.PACKAGE_PATH / "docs" / "monsters-complete.json")
     with open(out_fi, "w") as f:
-        json.dump(monsters, f)
+        json_codec.dump(monsters, f)
 
 
 def generate_prayers_complete():
@@ -115,12 +121,12 @@ def generate_prayers_complete():
     # Save all prayers to docs/prayers-complete.json
     out_fi = Path(config.DOCS_PATH / "prayers-complete.json")
     with open(out_fi, "w") as f:
-        json.dump(prayers, f)
+        json_codec.dump(prayers, f)
 
     # Save all prayers to osrsbox/docs/prayers-complete.json
     out_fi = Path(config.PACKAGE_PATH / "docs" / "prayers-complete.json")
     with open(out_fi, "w") as f:
-        json.dump(prayers, f)
+        json_codec.dump(prayers, f)
 
 
 def generate_items_search_file():
@@ -153,13 +159,17 @@ def generate_items_search_file():
     # Save search file to docs/items_complete.json
     out_fi = Path(config.DOCS_PATH / "items-search.json")
     with open(out_fi, "w") as f:
-        json.dump(items_search, f, indent=4)
+        json_codec.dump(items_search, f, indent=4)
 
 
 def main():
     """The main function for generating the static JSON files."""
     print("Generating items-complete.json file...")
     generate_items_complete()
+    print("Generating items-complete.bin snapshot file...")
+    generate_items_snapshot()
+    print("Generating items-icons.bin packed icon file...")
+    generate_items_icons_pack()
     print("Generating items-json-slot JSON files...")
     generate_item_slot_files()
     print("Generating monsters-complete.json file...")
@@ -21,10 +21,24 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
+import json
 import os
+import subprocess
+import sys
 from pathlib import Path
 
+import pytest
+
+from osrsbox import instrumentation
+from osrsbox import items_api
+from osrsbox import json_codec
+from osrsbox import lazy_records
+from osrsbox import parallel_loading
 from osrsbox.items_api import all_items
+from osrsbox.items_api import item_icons
+from osrsbox.items_api import item_snapshot
+from osrsbox.lazy_records import iter_json_records
+from osrsbox.shared_database import SharedDatabase
 
 # The current number of items being loaded from the db
 NUMBER_OF_ITEMS = 24093
@@ -44,3 +58,462 @@ def test_all_items_load_items_complete(path_to_docs_dir: Path):
 
     all_db_items = all_items.AllItems(str(path_to_items_complete))
     assert len(all_db_items.all_items) == NUMBER_OF_ITEMS
+
+
+def test_all_items_load_items_snapshot(path_to_docs_dir: Path, tmp_path: Path):
+    path_to_items_complete = path_to_docs_dir / "items-complete.json"
+    path_to_snapshot = tmp_path / "items-complete.bin"
+    item_snapshot.write_items_snapshot(path_to_items_complete, path_to_snapshot)
+
+    all_db_items = all_items.AllItems(str(path_to_snapshot))
+    assert len(all_db_items) == NUMBER_OF_ITEMS
+    assert all_db_items.all_items_dict.decoded_count == 0
+
+    all_db_items_json = all_items.AllItems(str(path_to_items_complete))
+    for item_id in (0, 4151, 11832, all_db_items_json.all_items[-1].id):
+        assert all_db_items[item_id].construct_json() == all_db_items_json[item_id].construct_json()
+    assert [item.id for item in all_db_items] == [item.id for item in all_db_items_json]
+
+
+def test_all_items_load_lazy(path_to_docs_dir: Path):
+    for path in (path_to_docs_dir / "items-complete.json", path_to_docs_dir / "items-json"):
+        all_db_items_lazy = all_items.AllItems(str(path), lazy=True)
+        assert len(all_db_items_lazy) == NUMBER_OF_ITEMS
+        assert all_db_items_lazy.all_items_dict.decoded_count == 0
+
+        all_db_items = all_items.AllItems(str(path))
+        first_item = all_db_items.all_items[0]
+        assert all_db_items_lazy[first_item.id] == first_item
+        assert all_db_items_lazy.all_items_dict.decoded_count == 1
+        assert [item.id for item in all_db_items_lazy] == [item.id for item in all_db_items]
+
+
+def test_all_items_load_items_json_parallel(path_to_docs_dir: Path):
+    path_to_items_json_dir = path_to_docs_dir / "items-json"
+
+    all_db_items = all_items.AllItems(path_to_items_json_dir)
+    all_db_items_parallel = all_items.AllItems(path_to_items_json_dir, workers=4)
+    assert all_db_items_parallel.all_items == all_db_items.all_items
+    assert all_db_items_parallel.load_time > 0
+
+    all_db_items_threads = all_items.AllItems(path_to_items_json_dir, workers=2, use_processes=False)
+    assert all_db_items_threads.all_items == all_db_items.all_items
+
+    # Chunks are streamed in item ID order, so they can be built as they arrive
+    chunks = parallel_loading.load_json_directory(path_to_items_json_dir, workers=2, use_processes=False,
+                                                  chunk_size=1000)
+    first_chunk = next(chunks)
+    assert len(first_chunk) == 1000
+    item_ids = [item_json["id"] for item_json in first_chunk]
+    item_ids.extend(item_json["id"] for chunk in chunks for item_json in chunk)
+    assert item_ids == sorted(item_ids) == [item.id for item in all_db_items.all_items]
+
+
+def test_all_items_lookup_by_item_name(path_to_docs_dir: Path):
+    all_db_items = all_items.AllItems(path_to_docs_dir / "items-complete.json")
+
+    item = all_db_items.lookup_by_item_name("ABYSSAL whip")
+    assert item.id == 4151
+
+    variants = all_db_items.lookup_all_by_name("abyssal whip")
+    assert variants[0] is item
+    assert [variant.id for variant in variants] == sorted(variant.id for variant in variants)
+    assert {variant.id for variant in variants} >= {4151, 4152, 14032}
+
+    assert all_db_items.lookup_by_item_name("abyssal whip", use_wiki_name=True).id == 4151
+
+    with pytest.raises(ValueError):
+        all_db_items.lookup_by_item_name("not an item name")
+
+
+def test_all_items_search_item_names(path_to_docs_dir: Path):
+    all_db_items = all_items.AllItems(path_to_docs_dir / "items-complete.json")
+
+    for keyword in ("", "wh", "WHIP", "rune pl", "potion(4)", "not an item name"):
+        expected = [item for item in all_db_items
+                    if keyword.lower() in item.name.lower()
+                    or (item.wiki_name and keyword.lower() in item.wiki_name.lower())]
+        assert all_db_items.search_item_names(keyword) == expected
+
+
+def test_all_items_fuzzy_search_item_names(path_to_docs_dir: Path):
+    all_db_items = all_items.AllItems(path_to_docs_dir / "items-complete.json")
+
+    items = all_db_items.fuzzy_search_item_names("abbysal whip", limit=3)
+    assert items[0].id == 4151
+    assert len(items) <= 3
+
+    assert all_db_items.fuzzy_search_item_names("Abyssal whip")[0].id == 4151
+    assert all_db_items.fuzzy_search_item_names("xyzzyxyzzy", max_distance=1) == []
+
+
+def test_all_items_slotted_records(path_to_docs_dir: Path):
+    all_db_items = all_items.AllItems(path_to_docs_dir / "items-complete.json")
+
+    item = all_db_items[4151]
+    for obj in (item, item.equipment, item.weapon):
+        assert not hasattr(obj, "__dict__")
+
+    item_json = item.construct_json()
+    assert list(item_json) == list(item.__slots__)
+    assert item_json["equipment"]["slot"] == "weapon"
+
+
+def test_all_items_load_without_icons(path_to_docs_dir: Path, tmp_path: Path):
+    path_to_items_complete = path_to_docs_dir / "items-complete.json"
+    path_to_packed_icons = tmp_path / "items-icons.bin"
+    item_icons.write_packed_icons(path_to_docs_dir / "items-icons", path_to_packed_icons)
+
+    all_db_items = all_items.AllItems(path_to_items_complete)
+    all_db_items_directory_icons = all_items.AllItems(path_to_items_complete, load_icons=False)
+    all_db_items_packed_icons = all_items.AllItems(path_to_items_complete, load_icons=False,
+                                                   icon_store=path_to_packed_icons)
+    assert isinstance(all_db_items_directory_icons.icon_store, item_icons.DirectoryIconStore)
+    assert isinstance(all_db_items_packed_icons.icon_store, item_icons.PackedIconStore)
+
+    for item_id in (0, 4151, 11832):
+        item = all_db_items[item_id]
+        for all_db_items_no_icons in (all_db_items_directory_icons, all_db_items_packed_icons):
+            assert all_db_items_no_icons[item_id].icon == item.icon
+            assert all_db_items_no_icons[item_id].construct_json() == item.construct_json()
+
+    # The item JSON is not changed when the icon is dropped
+    item_json = all_db_items[4151].construct_json()
+    item_def = item_icons.LazyIconItemProperties.from_icon_store(item_json, all_db_items_packed_icons.icon_store)
+    assert item_json["icon"] == all_db_items[4151].icon
+    assert item_def.icon == all_db_items[4151].icon
+
+    # Items without icons are equal to the same items loaded with their icons
+    assert all_db_items_packed_icons.all_items == all_db_items.all_items
+    assert all_db_items[4151] == all_db_items_packed_icons[4151] and all_db_items_packed_icons[4151] == all_db_items[4151]
+    assert all_db_items_packed_icons[4151] != all_db_items[4152]
+    assert item_icons._ICON_SLOT.__get__(all_db_items_packed_icons[4151]) is None
+
+    with pytest.raises(TypeError):
+        item_icons.IconStore()
+
+
+def test_all_items_equipment_columns(path_to_docs_dir: Path):
+    pytest.importorskip("numpy")
+    all_db_items = all_items.AllItems(path_to_docs_dir / "items-complete.json")
+    columns = all_db_items.equipment_columns
+
+    equipable = [item for item in all_db_items if item.equipment is not None]
+    assert len(columns) == len(equipable)
+    assert all_db_items.equipment_columns is columns
+
+    expected = sorted(equipable, key=lambda item: (-item.equipment.prayer, item.id))
+    assert list(columns.sort("prayer")) == [item.id for item in expected]
+    assert list(columns.top_k("prayer", 10)) == [item.id for item in expected[:10]]
+
+    mask = columns.mask(slot="head", members=False, prayer=1)
+    expected = [item.id for item in equipable
+                if item.equipment.slot == "head" and not item.members and item.equipment.prayer >= 1]
+    assert list(columns.filter(mask)) == expected
+
+    weights = {"attack_slash": 1, "melee_strength": 2}
+    mask = columns.mask(slot=["weapon", "2h"])
+    best = columns.top_k(weights, 1, mask=mask)[0]
+    weapons = [item for item in equipable if item.equipment.slot in ("weapon", "2h")]
+    assert best == max(weapons, key=lambda item: (item.equipment.attack_slash + 2 * item.equipment.melee_strength,
+                                                  -item.id)).id
+    assert columns.slot_names([4151]) == ["weapon"]
+    assert columns.slot_names([]) == []
+    for item_id in (0, 4150, 2 ** 31):
+        with pytest.raises(KeyError):
+            columns.slot_names([4151, item_id])
+    with pytest.raises(ValueError, match="Unknown equipment slot"):
+        columns.mask(slot="tail")
+
+
+def test_all_items_query(path_to_docs_dir: Path):
+    all_db_items = all_items.AllItems(path_to_docs_dir / "items-complete.json")
+
+    query = all_db_items.query(slot="head", members=False, prayer__gt=2).order_by("-prayer").limit(10)
+    expected = sorted([item for item in all_db_items
+                       if item.equipment and item.equipment.slot == "head" and not item.members
+                       and item.equipment.prayer > 2], key=lambda item: -item.equipment.prayer)[:10]
+    assert query.all() == expected
+    assert "index" in query.explain()
+
+    query = all_db_items.query(members=True).order_by("-melee_strength", "id").limit(5)
+    expected = sorted([item for item in all_db_items if item.members],
+                      key=lambda item: (item.equipment is None, -(item.equipment.melee_strength if item.equipment else 0)))
+    assert query.all() == expected[:5]
+
+    query = all_db_items.query(name__icontains="whip").order_by("-attack_slash").limit(3)
+    assert query.explain().startswith("access: ordered scan")
+    assert query.first().id == 4151
+
+    query = all_db_items.query(weapon_type__in=["whip"], attack_speed__lt=5, weight__isnull=False)
+    assert query.count() == len([item for item in all_db_items if item.weapon and item.weapon.weapon_type == "whip"
+                                 and item.weapon.attack_speed < 5 and item.weight is not None])
+
+    with pytest.raises(ValueError):
+        all_db_items.query(not_a_field=1)
+
+
+def test_all_items_secondary_indexes(path_to_docs_dir: Path):
+    all_db_items = all_items.AllItems(path_to_docs_dir / "items-complete.json")
+
+    head_ids = all_db_items.item_ids_by_slot("head")
+    assert head_ids == tuple(item.id for item in all_db_items if item.equipment and item.equipment.slot == "head")
+    assert "2h" in all_db_items.equipment_slots()
+    assert all_db_items.item_ids_by_slot("not_a_slot") == ()
+    assert 4151 in all_db_items.item_ids_by_weapon_type("whip")
+
+    item = all_db_items[4151]
+    assert all_db_items.item_ids_by_linked_id(item.linked_id_noted, "linked_id_noted") == (4151,)
+    assert all_db_items.item_ids_by_linked_id(item.linked_id_placeholder, "linked_id_placeholder") == (4151,)
+    assert all_db_items.item_ids_by_linked_id(4151) == (item.linked_id_noted, item.linked_id_placeholder)
+    with pytest.raises(ValueError):
+        all_db_items.item_ids_by_linked_id(4151, "linked_id_other")
+
+    assert "hash index on linked_id_noted" in all_db_items.query(linked_id_noted=4152).explain()
+
+
+def test_all_items_gear_optimizer(path_to_docs_dir: Path):
+    pytest.importorskip("numpy")
+    all_db_items = all_items.AllItems(path_to_docs_dir / "items-complete.json")
+    optimizer = all_db_items.gear_optimizer
+    weights = {"attack_stab": 1, "melee_strength": 2}
+
+    # The best loadout matches a brute force search of the hand slots
+    def score(item_id):
+        return sum(getattr(all_db_items[item_id].equipment, bonus) * weight for bonus, weight in weights.items())
+
+    slots = ("weapon", "shield", "2h")
+    by_slot = {slot: [0] + list(all_db_items.item_ids_by_slot(slot)) for slot in slots}
+    best = max(max(score(weapon) if weapon else 0 for weapon in by_slot["weapon"])
+               + max(score(shield) if shield else 0 for shield in by_slot["shield"]),
+               max(score(two_handed) if two_handed else 0 for two_handed in by_slot["2h"]))
+    loadout, = optimizer.best_loadouts(weights, slots=slots)
+    assert loadout.score == best
+    assert "2h" not in loadout.items or not {"weapon", "shield"} & set(loadout.items)
+
+    skills = {"attack": 40, "strength": 40}
+    loadouts = optimizer.best_loadouts(weights, k=5, members=False, skills=skills, minimums={"prayer": 5})
+    assert len(loadouts) == 5
+    assert [loadout.score for loadout in loadouts] == sorted((loadout.score for loadout in loadouts), reverse=True)
+    assert len({tuple(sorted(loadout.items.items())) for loadout in loadouts}) == 5
+    for loadout in loadouts:
+        assert loadout.bonuses["prayer"] >= 5
+        assert loadout.score == sum(score(item_id) for item_id in loadout.items.values())
+        for item_id in loadout.items.values():
+            item = all_db_items[item_id]
+            assert not item.members
+            assert all(level <= skills.get(skill, 1) for skill, level in (item.equipment.requirements or {}).items())
+
+    # The k best loadouts match a brute force search, including loadouts that use a slot's second best item
+    weights = {"melee_strength": 1}
+    heads = [0] + [item_id for item_id in all_db_items.item_ids_by_slot("head") if score(item_id) > 0]
+    rings = [0] + [item_id for item_id in all_db_items.item_ids_by_slot("ring") if score(item_id) > 0]
+    totals = sorted(((score(head) if head else 0) + (score(ring) if ring else 0) for head in heads for ring in rings),
+                    reverse=True)
+    loadouts = optimizer.best_loadouts(weights, k=5, slots=("head", "ring"))
+    assert [loadout.score for loadout in loadouts] == totals[:5]
+    assert len({tuple(sorted(loadout.items.items())) for loadout in loadouts}) == 5
+
+    with pytest.raises(ValueError):
+        optimizer.best_loadouts({"speed": 1})
+
+
+def test_all_items_warm_cache(path_to_docs_dir: Path, tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("OSRSBOX_CACHE_DIR", str(tmp_path))
+    path_to_items_complete = path_to_docs_dir / "items-complete.json"
+
+    all_db_items = all_items.AllItems(path_to_items_complete)
+    all_items.AllItems(path_to_items_complete, use_cache=True)
+    all_db_items_cached = all_items.AllItems(path_to_items_complete, use_cache=True)
+
+    assert len(list(tmp_path.iterdir())) == 1
+    assert all_db_items_cached.all_items == all_db_items.all_items
+    assert isinstance(all_db_items_cached[4151].equipment, type(all_db_items[4151].equipment))
+    assert all_db_items_cached[4151].weapon == all_db_items[4151].weapon
+
+
+def test_iter_items(path_to_docs_dir: Path):
+    path_to_items_complete = path_to_docs_dir / "items-complete.json"
+    all_db_items = all_items.AllItems(path_to_items_complete)
+
+    streamed_items = sorted(items_api.iter_items(path_to_items_complete), key=lambda x: x.id)
+    assert streamed_items == all_db_items.all_items
+
+
+def test_iter_json_records_chunks(tmp_path: Path):
+    records = {"1": {"id": 1, "name": "Caf\u00e9 \"quoted\"", "value": 1234567},
+               "2": {"id": 2, "name": "\u2694 sword", "weight": 0.125, "bonuses": [1, -2, 30]},
+               "3": {"id": 3, "name": None, "members": True}}
+    path_to_json_file = tmp_path / "records.json"
+    with open(path_to_json_file, "w") as out_file:
+        json.dump(records, out_file, indent=4)
+
+    # Small chunks split keys, strings, escapes and numbers across reads
+    for chunk_size in (1, 2, 3, 7, 64):
+        assert list(iter_json_records(path_to_json_file, chunk_size=chunk_size)) == list(records.values())
+
+    path_to_json_file.write_text('{"1": {"id": 1}, "2": {"id"')
+    with pytest.raises(ValueError):
+        list(iter_json_records(path_to_json_file, chunk_size=4))
+
+
+def test_json_file_index_chunks(tmp_path: Path, monkeypatch):
+    records = {"1": {"id": 1, "name": "Caf\u00e9 {\"quoted\"} [", "path": "C:\\}"},
+               "2": {"id": 2, "name": "\u2694 sword", "stances": [{"style": "}]"}, {}]},
+               "3": {}}
+    path_to_json_file = tmp_path / "records.json"
+
+    # Small chunks split strings and escapes across scanned chunks
+    for chunk_size in (1, 2, 3, 7, 1 << 20):
+        monkeypatch.setattr(lazy_records, "INDEX_CHUNK_SIZE", chunk_size)
+        for ensure_ascii in (True, False):
+            with open(path_to_json_file, "w", encoding="utf-8") as out_file:
+                json.dump(records, out_file, indent=4, ensure_ascii=ensure_ascii)
+            decoded = list()
+            json_index = lazy_records.JsonFileIndex(path_to_json_file, record_callback=decoded.append)
+            assert {id_number: json_index.decode_json(location) for id_number, location
+                    in json_index.locations.items()} == {int(key): record for key, record in records.items()}
+            assert decoded == list(records.values())
+            json_index.close()
+
+    # A skipped value is not decoded for the record callback, and can be decoded on its own
+    records = {"1": {"id": 1, "name": "\"drops\": [", "drops": [{"drops": "]"}, 2]},
+               "2": {"id": 2, "stances": [{"drops": 1}], "drops": "a\\\"b\\"},
+               "3": {"drops": None, "id": 3},
+               "4": {"id": 4, "stances": {"drops": [1]}}}
+    for chunk_size in (1, 3, 1 << 20):
+        monkeypatch.setattr(lazy_records, "INDEX_CHUNK_SIZE", chunk_size)
+        for indent in (None, 4):
+            path_to_json_file.write_text(json.dumps(records, indent=indent))
+            decoded = list()
+            json_index = lazy_records.JsonFileIndex(path_to_json_file, record_callback=decoded.append, skip_key="drops")
+            assert decoded == [{**record, "drops": None} if "drops" in record else record for record in records.values()]
+            assert {id_number: json_index.decode_json(location) for id_number, location
+                    in json_index.skipped_locations.items()} == {1: records["1"]["drops"], 2: records["2"]["drops"], 3: None}
+            json_index.close()
+
+    for invalid_json in ('{"1": {"id": 1}, "2": {"id"', '{"1": {"id": "}"}', '{"1": 5}', '[{"id": 1}]'):
+        path_to_json_file.write_text(invalid_json)
+        with pytest.raises(ValueError):
+            lazy_records.JsonFileIndex(path_to_json_file)
+
+
+def test_json_codec(path_to_docs_dir: Path, tmp_path: Path):
+    data = {"1": {"id": 1, "name": "Caf\u00e9", "weight": 0.1, "large": 2 ** 70, "nan": float("nan")}}
+    for backend in json_codec.available_backends():
+        json_codec.set_backend(backend)
+        decoded = json_codec.loads(json.dumps(data))
+        assert decoded["1"]["large"] == 2 ** 70
+        assert json.dumps(decoded) == json.dumps(data)
+    json_codec.set_backend()
+
+    with pytest.raises(ValueError):
+        json_codec.set_backend("unknown")
+
+    # Every installed backend decodes floats exactly like the json module
+    for backend in json_codec.available_backends():
+        json_codec.set_backend(backend)
+        assert json.dumps(json_codec.loads(json_codec.FLOAT_CHECK_DOCUMENT)) == \
+            json.dumps(json.loads(json_codec.FLOAT_CHECK_DOCUMENT))
+    json_codec.set_backend()
+
+    # Exported files are byte-identical to the standard library output
+    all_db_items = all_items.AllItems(path_to_docs_dir / "items-complete.json")
+    for pretty in (True, False):
+        all_db_items[4151].export_json(pretty, tmp_path)
+        expected = json.dumps(all_db_items[4151].construct_json(), indent=4 if pretty else None)
+        assert (tmp_path / "4151.json").read_text() == expected
+
+
+def test_json_codec_backend_selection(monkeypatch):
+    imported = list()
+
+    def rounding_loads(data):
+        return json.loads(data, parse_float=lambda value: round(float(value), 5))
+
+    def import_backend(name):
+        imported.append(name)
+        if name == "json":
+            return json.loads
+        if name == "ujson":
+            return rounding_loads
+        raise ImportError(name)
+
+    monkeypatch.setattr(json_codec, "_import_backend", import_backend)
+    monkeypatch.delenv("OSRSBOX_JSON_BACKEND", raising=False)
+    try:
+        # Backends are imported in order until one decodes floats exactly
+        assert json_codec.set_backend() == "json"
+        assert imported == ["orjson", "simdjson", "ujson", "json"]
+        with pytest.raises(ValueError):
+            json_codec.set_backend("ujson")
+    finally:
+        monkeypatch.undo()
+        json_codec.set_backend()
+
+
+def test_all_items_shared_database(path_to_docs_dir: Path, tmp_path: Path):
+    all_db_items = all_items.AllItems(path_to_docs_dir / "items-complete.json")
+
+    # A shared database file works on every Python version
+    path_to_shared_file = tmp_path / "items.shared"
+    SharedDatabase.write_file((item.construct_json() for item in all_db_items), path_to_shared_file)
+    shared_file = SharedDatabase.open_file(path_to_shared_file)
+    all_db_items_file = all_items.AllItems(shared_database=shared_file)
+    assert len(all_db_items_file) == NUMBER_OF_ITEMS
+    assert all_db_items_file[4151] == all_db_items[4151]
+    assert all_db_items_file.all_items_dict.decoded_count == 1
+
+    # Only the most recently used items are kept, other items are decoded again when used
+    all_db_items_file.attach_shared_database(shared_file, cache_size=100)
+    assert list(all_db_items_file) == all_db_items.all_items
+    assert all_db_items_file.all_items_dict.decoded_count == 100
+    item = all_db_items_file[4151]
+    assert all_db_items_file[0] == all_db_items[0]
+    assert all_db_items_file[4151] is item
+    shared_file.close()
+
+    pytest.importorskip("multiprocessing.shared_memory")
+    shared = all_db_items.publish_shared_database()
+    try:
+        code = ("import sys; from osrsbox.items_api.all_items import AllItems; "
+                f"items = AllItems(shared_database={shared.name!r}); "
+                "assert len(items) == int(sys.argv[1]) and items[4151].name == 'Abyssal whip'")
+        subprocess.run([sys.executable, "-c", code, str(NUMBER_OF_ITEMS)], check=True)
+
+        all_db_items_shared = all_items.AllItems(shared_database=shared.name)
+        assert list(all_db_items_shared) == all_db_items.all_items
+        all_db_items_shared.shared_database.close()
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+def test_all_items_instrumentation(path_to_docs_dir: Path):
+    reports = list()
+    instrumentation.add_hook(reports.append, trace_memory=True)
+    try:
+        all_db_items = all_items.AllItems(path_to_docs_dir / "items-complete.json")
+        all_items.AllItems(path_to_docs_dir / "items-complete.json", lazy=True)
+    finally:
+        instrumentation.remove_hook(reports.append)
+    assert len(all_db_items) == NUMBER_OF_ITEMS
+
+    eager, lazy = reports
+    assert eager.operation == "AllItems.load_all_items"
+    assert list(eager.phase_durations()) == ["read", "decode", "build", "sort"]
+    assert eager.peak_memory >= max(phase.peak_memory for phase in eager.phases) > 0
+    assert [phase.name for phase in lazy.phases] == ["index"]
+    assert "AllItems.load_all_items" in eager.format()
+
+    # Nothing is reported once the hook is removed
+    all_items.AllItems(path_to_docs_dir / "items-complete.json", lazy=True)
+    assert len(reports) == 2
+
+
+def test_items_api_lazy_import():
+    code = ("import sys; from osrsbox import items_api; "
+            "assert 'osrsbox.items_api.all_items' not in sys.modules; "
+            "assert items_api.all_items.AllItems; "
+            "assert items_api.all_items.PATH_TO_ITEMS_COMPLETE_JSON.is_file()")
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -22,9 +22,17 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
 import os
+from fractions import Fraction
 from pathlib import Path
 
+import pytest
+
+from osrsbox import monsters_api
 from osrsbox.monsters_api import all_monsters
+from osrsbox.monsters_api import drop_store
+from osrsbox.monsters_api.drop_store import _DROPS_SLOT
+from osrsbox.monsters_api.monster_drop import MonsterDrop
+from osrsbox.monsters_api.monster_drop import parse_rarity
 
 # The current number of monsters being loaded from the db
 NUMBER_OF_MONSTERS = 2824
@@ -44,3 +52,244 @@ def test_all_monsters_load_monsters_complete(path_to_docs_dir: Path):
 
     all_db_monsters = all_monsters.AllMonsters(str(path_to_monsters_complete))
     assert len(all_db_monsters.all_monsters) == NUMBER_OF_MONSTERS
+
+
+def test_all_monsters_load_lazy(path_to_docs_dir: Path):
+    for path in (path_to_docs_dir / "monsters-complete.json", path_to_docs_dir / "monsters-json"):
+        all_db_monsters_lazy = all_monsters.AllMonsters(str(path), lazy=True)
+        assert len(all_db_monsters_lazy) == NUMBER_OF_MONSTERS
+        assert all_db_monsters_lazy.all_monsters_dict.decoded_count == 0
+
+        all_db_monsters = all_monsters.AllMonsters(str(path))
+        first_monster = all_db_monsters.all_monsters[0]
+        assert all_db_monsters_lazy[first_monster.id] == first_monster
+        assert all_db_monsters_lazy.all_monsters_dict.decoded_count == 1
+        assert [monster.id for monster in all_db_monsters_lazy] == [monster.id for monster in all_db_monsters]
+
+
+def test_all_monsters_load_lazy_drops(path_to_docs_dir: Path):
+    all_db_monsters = all_monsters.AllMonsters(path_to_docs_dir / "monsters-complete.json")
+    expected = [monster.construct_json() for monster in all_db_monsters]
+
+    for path in (path_to_docs_dir / "monsters-complete.json", path_to_docs_dir / "monsters-json"):
+        for lazy in (False, True):
+            all_db_monsters_lazy_drops = all_monsters.AllMonsters(path, lazy=lazy, lazy_drops=True)
+            assert isinstance(all_db_monsters_lazy_drops.drop_store, drop_store.DropStore)
+
+            # Drops are only decoded when they are first accessed, then kept
+            monster = next(monster for monster in all_db_monsters_lazy_drops if monster.id == 2)
+            assert _DROPS_SLOT.__get__(monster) is None
+            assert monster.drops == all_db_monsters[2].drops
+            assert _DROPS_SLOT.__get__(monster) is monster.drops
+            assert [monster.construct_json() for monster in all_db_monsters_lazy_drops] == expected
+
+    all_db_monsters_lazy_drops = all_monsters.AllMonsters(path_to_docs_dir / "monsters-complete.json", lazy_drops=True)
+    assert all_db_monsters_lazy_drops.lookup_drops_by_item_id(526) == all_db_monsters.lookup_drops_by_item_id(526)
+
+    # The drops are found in the file bytes, so only the drops of a monster are decoded on first access
+    json_index = all_db_monsters_lazy_drops.drop_store.json_index
+    assert len(json_index.skipped_locations) == NUMBER_OF_MONSTERS
+    assert json_index.decode_json(json_index.skipped_locations[2]) == [drop.construct_json() for drop in all_db_monsters[2].drops]
+
+    # Monsters with lazy drops are equal to the same monsters loaded with their drops
+    assert all_db_monsters_lazy_drops.all_monsters == all_db_monsters.all_monsters
+    assert all_db_monsters[2] == all_db_monsters_lazy_drops[2] and all_db_monsters_lazy_drops[2] == all_db_monsters[2]
+    assert all_db_monsters_lazy_drops[2] != all_db_monsters[3]
+
+    # The monster JSON is not changed when the drops are dropped
+    monster_json = all_db_monsters[2].construct_json()
+    monster = drop_store.LazyDropMonsterProperties.from_drop_store(monster_json, all_db_monsters_lazy_drops.drop_store)
+    assert monster_json["drops"] == [drop.construct_json() for drop in all_db_monsters[2].drops]
+    assert monster.drops == all_db_monsters[2].drops
+
+    with pytest.raises(TypeError):
+        drop_store.DropStore()
+
+
+def test_all_monsters_load_monsters_json_parallel(path_to_docs_dir: Path):
+    path_to_monsters_json_dir = path_to_docs_dir / "monsters-json"
+
+    all_db_monsters = all_monsters.AllMonsters(path_to_monsters_json_dir)
+    all_db_monsters_parallel = all_monsters.AllMonsters(path_to_monsters_json_dir, workers=4)
+    assert all_db_monsters_parallel.all_monsters == all_db_monsters.all_monsters
+    assert all_db_monsters_parallel.load_time > 0
+
+
+def test_all_monsters_fuzzy_search_monster_names(path_to_docs_dir: Path):
+    all_db_monsters = all_monsters.AllMonsters(path_to_docs_dir / "monsters-complete.json")
+
+    monsters = all_db_monsters.fuzzy_search_monster_names("abysal demon")
+    assert monsters[0].name == "Abyssal demon"
+    assert monsters[0].id == min(monster.id for monster in all_db_monsters if monster.name == "Abyssal demon")
+
+
+def test_all_monsters_slotted_records(path_to_docs_dir: Path):
+    all_db_monsters = all_monsters.AllMonsters(path_to_docs_dir / "monsters-complete.json")
+
+    monster = next(monster for monster in all_db_monsters if monster.drops)
+    assert not hasattr(monster, "__dict__")
+    assert not hasattr(monster.drops[0], "__dict__")
+    assert monster.construct_json()["drops"][0] == monster.drops[0].construct_json()
+
+
+def test_all_monsters_query(path_to_docs_dir: Path):
+    all_db_monsters = all_monsters.AllMonsters(path_to_docs_dir / "monsters-complete.json")
+
+    query = all_db_monsters.query(slayer_monster=True, combat_level__lte=50, attack_type__contains="melee")
+    expected = [monster for monster in all_db_monsters
+                if monster.slayer_monster and monster.combat_level <= 50 and "melee" in monster.attack_type]
+    assert query.all() == expected
+
+    query = query.order_by("-slayer_xp").limit(3)
+    assert query.all() == sorted(expected, key=lambda monster: -monster.slayer_xp)[:3]
+    assert "combat_level" in query.explain()
+
+
+def test_all_monsters_drop_index(path_to_docs_dir: Path):
+    all_db_monsters = all_monsters.AllMonsters(path_to_docs_dir / "monsters-complete.json")
+
+    # The index matches a scan of every drop
+    expected = [(monster.id, drop) for monster in all_db_monsters for drop in monster.drops if drop.id == 526]
+    drops = all_db_monsters.lookup_drops_by_item_id(526)
+    assert sorted(drops, key=lambda entry: entry[0]) == sorted(expected, key=lambda entry: entry[0])
+    rarities = [drop.rarity for _, drop in drops]
+    assert rarities == sorted(rarities, reverse=True)
+    rarest = all_db_monsters.lookup_drops_by_item_id(526, rarest_first=True)
+    assert [drop.rarity for _, drop in rarest] == sorted(rarities)
+
+    by_name = all_db_monsters.lookup_drops_by_item_name("BONES")
+    assert by_name and all(drop.name.casefold() == "bones" for _, drop in by_name)
+    assert all_db_monsters.lookup_drops_by_item_id(-1) == []
+    assert parse_rarity("1/128") == parse_rarity(1 / 128) == 1 / 128
+    assert parse_rarity("Always") == 1.0
+    assert parse_rarity("unknown") is None
+
+
+def test_monster_drop_numeric_columns(path_to_docs_dir: Path):
+    drop = MonsterDrop(id=995, name="Coins", members=False, quantity="5-10", noted=False, rarity="1/128", rolls=1)
+    assert drop.probability == 1 / 128
+    assert drop.rarity_fraction == Fraction(1, 128)
+    assert (drop.quantity_min, drop.quantity_max, drop.quantities) == (5, 10, None)
+    assert MonsterDrop(quantity="10,5", rarity=0.04).quantities == (5, 10)
+    assert MonsterDrop(rarity=0.04).rarity_fraction == Fraction(1, 25)
+    assert set(drop.construct_json()) == {"id", "name", "members", "quantity", "noted", "rarity", "rolls"}
+
+    pytest.importorskip("numpy")
+    all_db_monsters = all_monsters.AllMonsters(path_to_docs_dir / "monsters-complete.json")
+    drop_columns = all_db_monsters.drop_columns
+    monster = all_db_monsters[2]
+    columns = drop_columns.monster_drops(2)
+    assert list(columns["id"]) == [drop.id for drop in monster.drops]
+    assert list(columns["probability"]) == [drop.probability for drop in monster.drops]
+    assert list(columns["quantity_max"]) == [drop.quantity_max for drop in monster.drops]
+    assert len(drop_columns) == sum(len(monster.drops) for monster in all_db_monsters)
+
+    rarest_row = drop_columns.rarest(1)[0]
+    rarest_probability = min(drop.probability for monster in all_db_monsters for drop in monster.drops)
+    assert drop_columns["probability"][rarest_row] == rarest_probability
+
+
+def test_all_monsters_drop_simulator(path_to_docs_dir: Path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    from osrsbox.monsters_api import drop_simulator
+    all_db_monsters = all_monsters.AllMonsters(path_to_docs_dir / "monsters-complete.json")
+    simulator = all_db_monsters.drop_simulator
+
+    result = simulator.simulate(2, kills=100, trials=2000, seed=1)
+    assert result.totals.shape == (2000, len(result.item_ids))
+    assert np.array_equal(result.totals, simulator.simulate(2, kills=100, trials=2000, seed=1).totals)
+
+    # The mean of every item is close to its expected quantity
+    expected = simulator.drop_table(2).expected_quantities() * 100
+    standard_error = np.maximum(result.totals.std(axis=0), 1) / np.sqrt(result.trials)
+    assert np.all(np.abs(result.totals.mean(axis=0) - expected) < 6 * standard_error)
+
+    # Quantities stay within the range of each drop
+    coins = [drop for drop in all_db_monsters[2].drops if drop.id == 995]
+    counts = result.drop_counts[:, np.searchsorted(result.item_ids, 995)]
+    totals = result.item_totals(995)
+    assert np.all(totals >= counts * min(drop.quantity_min for drop in coins))
+    assert np.all(totals <= counts * max(drop.quantity_max for drop in coins))
+    values, trials = result.distribution(995)
+    assert trials.sum() == 2000 and np.all(np.diff(values) > 0)
+
+    # Samples are added up in chunks, including counts that span chunks, and counts of zero
+    monkeypatch.setattr(drop_simulator, "SAMPLE_CHUNK_SIZE", 7)
+    counts = np.array([0, 3, 0, 20, 1, 0, 9])
+    assert list(drop_simulator._sum_samples(counts, lambda size: np.full(size, 2))) == list(2 * counts)
+
+    assert simulator.simulate(2, kills=0).totals.sum() == 0
+    assert not simulator.simulate(2, kills=10).item_totals(-1).any()
+    with pytest.raises(ValueError):
+        simulator.simulate(2, kills=-1)
+
+
+def test_all_monsters_expected_value_per_kill(path_to_docs_dir: Path):
+    np = pytest.importorskip("numpy")
+    from osrsbox.items_api.all_items import AllItems
+    all_db_monsters = all_monsters.AllMonsters(path_to_docs_dir / "monsters-complete.json")
+    all_db_items = AllItems(path_to_docs_dir / "items-complete.json")
+
+    expected_values = all_db_monsters.expected_value_per_kill(all_db_items)
+    assert all_db_monsters.expected_value_per_kill(all_db_items) is expected_values
+    assert set(expected_values) == {monster.id for monster in all_db_monsters if monster.drops}
+
+    # Matches the expected value of each drop, added up one monster at a time
+    highalch = all_db_items.item_values("highalch")
+    assert highalch[4152] == highalch[4151] == all_db_items[4151].highalch
+    for monster_id in (2, 415, 2042):
+        total = sum(drop.probability * drop.rolls * (drop.quantity_min + drop.quantity_max) / 2
+                    * (all_db_items[drop.id].highalch or 0)
+                    for drop in all_db_monsters[monster_id].drops)
+        assert expected_values[monster_id] == pytest.approx(total)
+
+    # A dict of prices values only the listed items
+    coins_only = all_db_monsters.expected_value_per_kill({995: 1})
+    coins = [drop for drop in all_db_monsters[2].drops if drop.id == 995]
+    assert coins_only[2] == pytest.approx(sum(drop.probability * drop.quantity_min for drop in coins))
+
+    # Loading the items again gives a new value array, so the result is calculated again
+    all_db_items.load_all_items(path_to_docs_dir / "items-complete.json")
+    assert all_db_monsters.expected_value_per_kill(all_db_items) is not expected_values
+    assert np.all(all_db_monsters.drop_columns.expected_values(np.zeros(0)) == 0)
+
+
+def test_all_monsters_warm_cache(path_to_docs_dir: Path, tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("OSRSBOX_CACHE_DIR", str(tmp_path))
+    path_to_monsters_complete = path_to_docs_dir / "monsters-complete.json"
+
+    all_db_monsters = all_monsters.AllMonsters(path_to_monsters_complete)
+    all_monsters.AllMonsters(path_to_monsters_complete, use_cache=True)
+    all_db_monsters_cached = all_monsters.AllMonsters(path_to_monsters_complete, use_cache=True)
+
+    assert all_db_monsters_cached.all_monsters == all_db_monsters.all_monsters
+    assert all_db_monsters_cached[415].drops == all_db_monsters[415].drops
+
+
+def test_iter_monsters(path_to_docs_dir: Path):
+    path_to_monsters_complete = path_to_docs_dir / "monsters-complete.json"
+    all_db_monsters = all_monsters.AllMonsters(path_to_monsters_complete)
+
+    streamed_monsters = sorted(monsters_api.iter_monsters(path_to_monsters_complete), key=lambda x: x.id)
+    assert streamed_monsters == all_db_monsters.all_monsters
+
+
+def test_all_monsters_shared_database(path_to_docs_dir: Path):
+    pytest.importorskip("multiprocessing.shared_memory")
+    all_db_monsters = all_monsters.AllMonsters(path_to_docs_dir / "monsters-complete.json")
+
+    shared = all_db_monsters.publish_shared_database()
+    try:
+        all_db_monsters_shared = all_monsters.AllMonsters(shared_database=shared.name)
+        assert len(all_db_monsters_shared) == NUMBER_OF_MONSTERS
+        assert all_db_monsters_shared[415].drops == all_db_monsters[415].drops
+        assert list(all_db_monsters_shared) == all_db_monsters.all_monsters
+        assert all_db_monsters_shared.all_monsters_dict.decoded_count == 1024
+
+        all_db_monsters_shared.attach_shared_database(all_db_monsters_shared.shared_database, cache_size=None)
+        assert list(all_db_monsters_shared) == all_db_monsters.all_monsters
+        assert all_db_monsters_shared.all_monsters_dict.decoded_count == NUMBER_OF_MONSTERS
+        all_db_monsters_shared.shared_database.close()
+    finally:
+        shared.close()
+        shared.unlink()
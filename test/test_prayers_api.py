@@ -21,10 +21,19 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
+import dataclasses
+import marshal
 import os
+import shutil
+import threading
 from pathlib import Path
 
+import pytest
+
+from osrsbox import prayers_api
+from osrsbox import warm_cache
 from osrsbox.prayers_api import all_prayers
+from osrsbox.shared_handles import SharedHandle
 
 # The current number of prayers being loaded from the db
 NUMBER_OF_PRAYERS = 29
@@ -44,3 +53,113 @@ def test_all_prayers_load_prayers_complete(path_to_docs_dir: Path):
 
     all_db_prayers = all_prayers.AllPrayers(str(path_to_prayers_complete))
     assert len(all_db_prayers.all_prayers) == NUMBER_OF_PRAYERS
+
+
+def test_all_prayers_load_lazy(path_to_docs_dir: Path):
+    for path in (path_to_docs_dir / "prayers-complete.json", path_to_docs_dir / "prayers-json"):
+        all_db_prayers_lazy = all_prayers.AllPrayers(str(path), lazy=True)
+        assert len(all_db_prayers_lazy) == NUMBER_OF_PRAYERS
+        assert all_db_prayers_lazy.all_prayers_dict.decoded_count == 0
+
+        all_db_prayers = all_prayers.AllPrayers(str(path))
+        first_prayer = all_db_prayers.all_prayers[0]
+        assert all_db_prayers_lazy[first_prayer.id] == first_prayer
+        assert all_db_prayers_lazy.all_prayers_dict.decoded_count == 1
+        assert [prayer.id for prayer in all_db_prayers_lazy] == [prayer.id for prayer in all_db_prayers]
+
+
+def test_prayers_api_load_shared(path_to_docs_dir: Path, tmp_path: Path):
+    path_to_prayers_complete = tmp_path / "prayers-complete.json"
+    shutil.copy(path_to_docs_dir / "prayers-complete.json", path_to_prayers_complete)
+
+    all_db_prayers = prayers_api.load(path_to_prayers_complete)
+    assert prayers_api.load(str(path_to_prayers_complete)) is all_db_prayers
+    assert len(all_db_prayers) == NUMBER_OF_PRAYERS
+
+    reloaded = prayers_api.reload(path_to_prayers_complete)
+    assert reloaded is not all_db_prayers
+    assert prayers_api.load(path_to_prayers_complete) is reloaded
+
+    prayers_api.invalidate(path_to_prayers_complete)
+    assert prayers_api.load(path_to_prayers_complete) is not reloaded
+
+    # Changing the source file loads the database again
+    current = prayers_api.load(path_to_prayers_complete)
+    stat_result = os.stat(path_to_prayers_complete)
+    os.utime(path_to_prayers_complete, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10 ** 9))
+    assert prayers_api.load(path_to_prayers_complete) is not current
+    prayers_api.invalidate()
+
+    # A missing source raises the same error as loading the database directly
+    with pytest.raises(ValueError):
+        prayers_api.load(tmp_path / "missing.json")
+
+
+def test_shared_handle_concurrent_load(path_to_docs_dir: Path):
+    loads = list()
+
+    def factory(path: Path) -> all_prayers.AllPrayers:
+        loads.append(path)
+        return all_prayers.AllPrayers(path)
+
+    handle = SharedHandle(factory, lambda: path_to_docs_dir / "prayers-complete.json")
+    results = list()
+    threads = [threading.Thread(target=lambda: results.append(handle.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_all_prayers_warm_cache(path_to_docs_dir: Path, tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("OSRSBOX_CACHE_DIR", str(tmp_path / "cache"))
+    path_to_prayers_complete = tmp_path / "prayers-complete.json"
+    shutil.copy(path_to_docs_dir / "prayers-complete.json", path_to_prayers_complete)
+    expected = all_prayers.AllPrayers(path_to_prayers_complete).all_prayers
+
+    # The first load writes the cache, and the second load reads it
+    assert all_prayers.AllPrayers(path_to_prayers_complete, use_cache=True).all_prayers == expected
+    cache_files = list((tmp_path / "cache").iterdir())
+    assert len(cache_files) == 1
+    assert warm_cache.read_cache(cache_files[0]) == expected
+    assert all_prayers.AllPrayers(path_to_prayers_complete, use_cache=True).all_prayers == expected
+
+    # A damaged cache file falls back to the JSON data
+    cache_files[0].write_bytes(b"damaged")
+    assert all_prayers.AllPrayers(path_to_prayers_complete, use_cache=True).all_prayers == expected
+
+    # So does a cache file which fails while it is rebuilt (unknown module or class, bad class number, or bad row)
+    field_names = [field.name for field in dataclasses.fields(expected[0])]
+    class_table = [["osrsbox.prayers_api.prayer_properties", "PrayerProperties", field_names, []]]
+    for bad_class_table, rows in ((class_table, [(5,)]), (class_table, [(0,) * 20]),
+                                  ([["osrsbox.missing_module", "PrayerProperties", [], []]], []),
+                                  ([["osrsbox.prayers_api.prayer_properties", "MissingClass", [], []]], []),
+                                  ([["osrsbox.prayers_api.prayer_properties", "PrayerProperties", "id", []]], [])):
+        cache_files[0].write_bytes(marshal.dumps((warm_cache.CACHE_FORMAT_VERSION, bad_class_table, rows)))
+        assert warm_cache.read_cache(cache_files[0]) is None
+        assert all_prayers.AllPrayers(path_to_prayers_complete, use_cache=True).all_prayers == expected
+
+    # Changing the JSON data replaces the stale cache file
+    with open(path_to_prayers_complete, "a") as prayers_file:
+        prayers_file.write("\n")
+    assert all_prayers.AllPrayers(path_to_prayers_complete, use_cache=True).all_prayers == expected
+    assert [cache_file.name for cache_file in (tmp_path / "cache").iterdir()] != [cache_files[0].name]
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+    # Another source of the same database keeps its own cache file
+    cache_files = list((tmp_path / "cache").iterdir())
+    path_to_other_prayers_complete = tmp_path / "other" / "prayers-complete.json"
+    path_to_other_prayers_complete.parent.mkdir()
+    shutil.copy(path_to_prayers_complete, path_to_other_prayers_complete)
+    assert all_prayers.AllPrayers(path_to_other_prayers_complete, use_cache=True).all_prayers == expected
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+    # Changing the other source only replaces its own cache file
+    with open(path_to_other_prayers_complete, "a") as prayers_file:
+        prayers_file.write("\n")
+    assert all_prayers.AllPrayers(path_to_other_prayers_complete, use_cache=True).all_prayers == expected
+    assert cache_files[0].exists()
+    assert len(list((tmp_path / "cache").iterdir())) == 2